@@ -1,35 +1,248 @@
+import asyncio
+from collections.abc import Callable
+from dataclasses import replace
 from typing import Any
 
-from personal_assistant.client import GeminiVideoClient
+from personal_assistant.client import GeminiVideoClient, StreamedResponse
+from personal_assistant.clip import CLIP_NOTE, ClippedResponse, VideoClip
+from personal_assistant.response_cache import CachedResponse
+from personal_assistant.segmented import (
+    Segment,
+    SegmentCheckpoint,
+    SegmentedResponse,
+    plan_range,
+    plan_segments,
+    shift_timestamps,
+    summarize_segmented,
+    video_duration,
+)
+from personal_assistant.transcript import plan_windows, transcribe_chunked
+
+TASK_TYPES = ("summarize", "ask", "events", "transcribe")
+# Tasks that are typically repeated on one video, so its tokens are served from
+# a Gemini cached context instead of being re-sent with every prompt.
+CONTEXT_CACHED_TASKS = frozenset({"ask"})
 
 
 class VideoAgent:
     def __init__(self, client: GeminiVideoClient) -> None:
         self.client = client
 
+    def build_prompt(
+        self,
+        task_type: str,
+        question: str | None = None,
+        clip: VideoClip | None = None,
+    ) -> str:
+        """Returns the prompt for a task type ('summarize', 'ask', 'events', 'transcribe')."""
+        prompt = self._task_prompt(task_type, question)
+        if clip is not None and clip.has_range:
+            prompt += CLIP_NOTE
+        return prompt
+
+    def _task_prompt(self, task_type: str, question: str | None) -> str:
+        if task_type == "summarize":
+            return "Provide a concise but comprehensive summary of this video. Highlight the key events and their timestamps."
+        if task_type == "ask":
+            if not question:
+                raise ValueError("A question is required for the 'ask' task")
+            return (
+                f"Based on this video, please answer the following question: {question}"
+            )
+        if task_type == "events":
+            return "Identify and list all significant events or actions in this video with their corresponding timestamps. Format the output as a bulleted list."
+        if task_type == "transcribe":
+            return (
+                "Transcribe the audio from this video. "
+                "Identify different speakers and label them accordingly. "
+                "Format the output strictly as followed: '[timestamp] Speaker: <content>'. "
+                "For example: '[00:15] Speaker 1: Hello world.'"
+            )
+        raise ValueError(f"Unknown task type: {task_type}")
+
+    def clip_response(
+        self, response: Any, video_file: Any, clip: VideoClip | None
+    ) -> Any:
+        """Moves a clip answer's timestamps to full-video time and records its range."""
+        if clip is None:
+            return response
+        duration = None
+        if self.client.aio.local_clip(video_file) is None:
+            try:
+                duration = video_duration(video_file)
+            except ValueError:
+                pass
+        return ClippedResponse(
+            text=shift_timestamps(response.text or "", clip.start),
+            usage_metadata=response.usage_metadata,
+            time_to_first_token=getattr(response, "time_to_first_token", None),
+            cache_hit=getattr(response, "cache_hit", False),
+            analyzed_seconds=clip.analyzed_seconds(duration),
+            analyzed_fps=clip.fps,
+        )
+
+    def run_task(
+        self,
+        task_type: str,
+        video_file: Any,
+        question: str | None = None,
+        clip: VideoClip | None = None,
+    ) -> Any:
+        """Runs a task by name against an uploaded video, optionally a clip of it."""
+        prompt = self.build_prompt(task_type, question, clip)
+        response = self.client.analyze_video(
+            video_file,
+            prompt,
+            cache_context=task_type in CONTEXT_CACHED_TASKS,
+            clip=clip,
+        )
+        return self.clip_response(response, video_file, clip)
+
+    async def run_task_async(
+        self,
+        task_type: str,
+        video_file: Any,
+        question: str | None = None,
+        clip: VideoClip | None = None,
+    ) -> Any:
+        """Runs a task by name on the async client without blocking the event loop."""
+        prompt = self.build_prompt(task_type, question, clip)
+        response = await self.client.aio.analyze_video(
+            video_file,
+            prompt,
+            cache_context=task_type in CONTEXT_CACHED_TASKS,
+            clip=clip,
+        )
+        return self.clip_response(response, video_file, clip)
+
+    def stream_task(
+        self,
+        task_type: str,
+        video_file: Any,
+        question: str | None = None,
+        on_text: Callable[[str], None] | None = None,
+        clip: VideoClip | None = None,
+    ) -> StreamedResponse | CachedResponse | ClippedResponse:
+        """Runs a task by name, delivering text to `on_text` as it is generated.
+
+        Streamed chunks of a clip answer keep clip-relative timestamps; the
+        returned text is shifted to full-video time.
+        """
+        prompt = self.build_prompt(task_type, question, clip)
+        response = self.client.analyze_video_stream(
+            video_file,
+            prompt,
+            on_text=on_text,
+            cache_context=task_type in CONTEXT_CACHED_TASKS,
+            clip=clip,
+        )
+        return self.clip_response(response, video_file, clip)
+
+    async def stream_task_async(
+        self,
+        task_type: str,
+        video_file: Any,
+        question: str | None = None,
+        on_text: Callable[[str], None] | None = None,
+        clip: VideoClip | None = None,
+    ) -> StreamedResponse | CachedResponse | ClippedResponse:
+        """Async counterpart of `stream_task`."""
+        prompt = self.build_prompt(task_type, question, clip)
+        response = await self.client.aio.analyze_video_stream(
+            video_file,
+            prompt,
+            on_text=on_text,
+            cache_context=task_type in CONTEXT_CACHED_TASKS,
+            clip=clip,
+        )
+        return self.clip_response(response, video_file, clip)
+
+    async def summarize_segmented_async(
+        self,
+        video_file: Any,
+        segment_count: int,
+        concurrency: int = 4,
+        video_path: str | None = None,
+        on_segment_done: Callable[[Segment], None] | None = None,
+        clip: VideoClip | None = None,
+    ) -> SegmentedResponse:
+        """Summarizes time segments in parallel, then merges them into one summary.
+
+        Finished segments are checkpointed in the cache directory, so rerunning
+        after a failure only redoes the missing ones. With `clip`, the segments
+        cover only its range.
+        """
+        aio = self.client.aio
+        duration = await asyncio.to_thread(video_duration, video_file, video_path)
+        start, end = plan_range(duration, clip)
+        segments = [
+            replace(segment, start=segment.start + start, end=segment.end + start)
+            for segment in plan_segments(end - start, segment_count)
+        ]
+        fps = clip.fps if clip else None
+        content_key = aio.content_key(video_file)
+        checkpoint = (
+            SegmentCheckpoint.for_job(content_key, aio.model_id, segments, fps)
+            if content_key
+            else None
+        )
+        response = await summarize_segmented(
+            aio,
+            video_file,
+            segments,
+            concurrency=concurrency,
+            checkpoint=checkpoint,
+            on_segment_done=on_segment_done,
+            fps=fps,
+        )
+        if clip is not None:
+            response.analyzed_seconds = end - start
+            response.analyzed_fps = fps
+        return response
+
+    async def transcribe_chunked_async(
+        self,
+        video_file: Any,
+        chunk_seconds: float,
+        overlap_seconds: float = 20.0,
+        concurrency: int = 4,
+        video_path: str | None = None,
+        on_chunk_done: Callable[[Segment], None] | None = None,
+        clip: VideoClip | None = None,
+    ) -> SegmentedResponse:
+        """Transcribes overlapping windows in parallel and stitches one transcript."""
+        duration = await asyncio.to_thread(video_duration, video_file, video_path)
+        start, end = plan_range(duration, clip)
+        windows = [
+            replace(window, start=window.start + start, end=window.end + start)
+            for window in plan_windows(end - start, chunk_seconds, overlap_seconds)
+        ]
+        fps = clip.fps if clip else None
+        response = await transcribe_chunked(
+            self.client.aio,
+            video_file,
+            windows,
+            concurrency=concurrency,
+            on_chunk_done=on_chunk_done,
+            fps=fps,
+        )
+        if clip is not None:
+            response.analyzed_seconds = end - start
+            response.analyzed_fps = fps
+        return response
+
     def get_summary(self, video_file: Any) -> Any:
         """Generates a high-level summary of the video content."""
-        prompt = "Provide a concise but comprehensive summary of this video. Highlight the key events and their timestamps."
-        return self.client.analyze_video(video_file, prompt)
+        return self.run_task("summarize", video_file)
 
     def ask_question(self, video_file: Any, question: str) -> Any:
         """Answers a specific question about the video content."""
-        prompt = (
-            f"Based on this video, please answer the following question: {question}"
-        )
-        return self.client.analyze_video(video_file, prompt)
+        return self.run_task("ask", video_file, question)
 
     def detect_events(self, video_file: Any) -> Any:
         """Detects specific events or anomalies in the video."""
-        prompt = "Identify and list all significant events or actions in this video with their corresponding timestamps. Format the output as a bulleted list."
-        return self.client.analyze_video(video_file, prompt)
+        return self.run_task("events", video_file)
 
     def transcribe_and_diarize(self, video_file: Any) -> Any:
         """Generates a diarized transcript of the video."""
-        prompt = (
-            "Transcribe the audio from this video. "
-            "Identify different speakers and label them accordingly. "
-            "Format the output strictly as followed: '[timestamp] Speaker: <content>'. "
-            "For example: '[00:15] Speaker 1: Hello world.'"
-        )
-        return self.client.analyze_video(video_file, prompt)
+        return self.run_task("transcribe", video_file)
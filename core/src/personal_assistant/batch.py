@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import glob
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from personal_assistant.agent import VideoAgent
+from personal_assistant.clip import VideoClip
+from personal_assistant.config import resolve_output_path, resolve_task_output_path
+from personal_assistant.deadline import request_scope
+from personal_assistant.staging import VIDEO_EXTENSIONS
+from personal_assistant.usage import UsageTracker
+
+
+def collect_videos(source: str) -> list[str]:
+    """Expands a directory (non-recursive) or glob pattern into sorted video paths."""
+    if os.path.isdir(source):
+        candidates = [str(path) for path in Path(source).iterdir() if path.is_file()]
+    else:
+        candidates = glob.glob(source, recursive=True)
+    return sorted(
+        os.path.abspath(path)
+        for path in candidates
+        if Path(path).suffix.lower() in VIDEO_EXTENSIONS
+    )
+
+
+@dataclass
+class BatchItem:
+    video_path: str
+    task: str
+    output_path: str
+    question: str | None = None
+    clip: VideoClip | None = None
+
+    @property
+    def key(self) -> str:
+        key = f"{self.video_path}::{self.output_path}"
+        # A different range is different work, so it is not skipped as done.
+        return f"{key}::{self.clip.key}" if self.clip else key
+
+
+@dataclass
+class ManifestRecord:
+    key: str
+    video_path: str
+    task: str
+    output_path: str
+    status: str
+    error: str | None = None
+    elapsed: float = 0.0
+    prompt_token_count: int = 0
+    candidates_token_count: int = 0
+    estimated_cost: float = 0.0
+    # Answered from the response cache; saved_cost is the original call's.
+    cache_hit: bool = False
+    saved_cost: float = 0.0
+    # Transcode profile actually uploaded ('original' if the proxy was larger).
+    profile: str | None = None
+    uploaded_bytes: int | None = None
+    upload_mb_per_second: float | None = None
+    hedged_requests: int = 0
+    finished_at: str = field(default_factory=lambda: datetime.now(UTC).isoformat())
+
+
+class BatchManifest:
+    """Append-only JSONL log of batch outcomes; the last record per item wins.
+
+    Appending (rather than rewriting) keeps every completed item durable even
+    if the process is killed mid-batch.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[str, ManifestRecord]:
+        records: dict[str, ManifestRecord] = {}
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return records
+        for line in lines:
+            try:
+                record = ManifestRecord(**json.loads(line))
+            except (ValueError, TypeError):
+                # A torn final line from a crash; the item simply reruns.
+                continue
+            records[record.key] = record
+        return records
+
+    def append(self, record: ManifestRecord) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(asdict(record)) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def is_done(self, item: BatchItem, records: dict[str, ManifestRecord]) -> bool:
+        record = records.get(item.key)
+        return (
+            record is not None
+            and record.status == "done"
+            and os.path.exists(item.output_path)
+        )
+
+
+def _distinct_output_path(
+    output_dir: str, video_path: str, root: str, task: str | None
+) -> str:
+    # Keeps the video's folder below `root` and its extension in the name.
+    relative = Path(os.path.relpath(video_path, root))
+    name = f"{relative.name}.{task}.md" if task else f"{relative.name}.md"
+    return str(Path(output_dir) / relative.parent / name)
+
+
+def plan_batch(
+    videos: list[str],
+    tasks: list[str],
+    output_dir: str,
+    question: str | None = None,
+    clip: VideoClip | None = None,
+) -> list[BatchItem]:
+    """Plans one item per video and task, each with its own output file.
+
+    Videos that share a stem (`a.mp4` and `a.mov`, or `x/a.mp4` and
+    `y/a.mp4`) would write the same file, so their outputs keep the
+    extension and the folder below the videos' common parent instead.
+    """
+    if os.path.isfile(output_dir):
+        raise ValueError(f"Batch output '{output_dir}' is a file, not a directory")
+    items: list[BatchItem] = []
+    for video_path in videos:
+        for task in tasks:
+            if len(tasks) == 1:
+                output_path = resolve_output_path(output_dir, video_path)
+            else:
+                output_path = resolve_task_output_path(output_dir, video_path, task)
+            assert output_path is not None
+            items.append(
+                BatchItem(
+                    video_path=video_path,
+                    task=task,
+                    output_path=output_path,
+                    question=question if task == "ask" else None,
+                    clip=clip,
+                )
+            )
+
+    claims = Counter(item.output_path for item in items)
+    colliding = [item for item in items if claims[item.output_path] > 1]
+    if colliding:
+        root = os.path.commonpath([item.video_path for item in colliding])
+        if root in {item.video_path for item in colliding}:
+            root = os.path.dirname(root)
+        for item in colliding:
+            item.output_path = _distinct_output_path(
+                output_dir, item.video_path, root, item.task if len(tasks) > 1 else None
+            )
+    claims = Counter(item.output_path for item in items)
+    clashes = sorted(path for path, count in claims.items() if count > 1)
+    if clashes:
+        raise ValueError(
+            f"Several videos would write {clashes[0]}; pass a directory as the output"
+        )
+    return items
+
+
+@dataclass
+class BatchSummary:
+    done: int = 0
+    skipped: int = 0
+    failed: int = 0
+    estimated_cost: float = 0.0
+    cache_hits: int = 0
+    saved_cost: float = 0.0
+
+
+async def run_batch(
+    agent: VideoAgent,
+    items: list[BatchItem],
+    manifest: BatchManifest,
+    concurrency: int = 4,
+    upload_concurrency: int = 2,
+    on_item_done: Callable[[BatchItem, ManifestRecord | None], None] | None = None,
+    item_timeout: float | None = None,
+) -> BatchSummary:
+    """Runs batch items through bounded upload and generation pools.
+
+    Items already recorded as done (with their output on disk) are skipped, so
+    a rerun after a crash only retries failed or unfinished work. Each upload
+    and each generation gets its own `item_timeout` deadline once it leaves
+    the queue.
+    """
+    summary = BatchSummary()
+    records = manifest.load()
+    pending: dict[str, list[BatchItem]] = {}
+    for item in items:
+        if manifest.is_done(item, records):
+            summary.skipped += 1
+            if on_item_done:
+                on_item_done(item, None)
+            continue
+        pending.setdefault(item.video_path, []).append(item)
+
+    upload_slots = asyncio.Semaphore(upload_concurrency)
+    generate_slots = asyncio.Semaphore(concurrency)
+
+    def finish(item: BatchItem, record: ManifestRecord) -> None:
+        manifest.append(record)
+        if record.status == "done":
+            summary.done += 1
+            summary.estimated_cost += record.estimated_cost
+            summary.cache_hits += record.cache_hit
+            summary.saved_cost += record.saved_cost
+        else:
+            summary.failed += 1
+        if on_item_done:
+            on_item_done(item, record)
+
+    def failure(item: BatchItem, error: BaseException, elapsed: float = 0.0) -> None:
+        logger.error(f"Batch item failed ({item.task} {item.video_path}): {error}")
+        finish(
+            item,
+            ManifestRecord(
+                key=item.key,
+                video_path=item.video_path,
+                task=item.task,
+                output_path=item.output_path,
+                status="failed",
+                error=str(error),
+                elapsed=elapsed,
+            ),
+        )
+
+    async def run_item(item: BatchItem, video_file: Any) -> None:
+        async with generate_slots:
+            start_time = time.perf_counter()
+            try:
+                with request_scope(item_timeout) as scope:
+                    response = await agent.run_task_async(
+                        item.task, video_file, item.question, clip=item.clip
+                    )
+                path = Path(item.output_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(response.text, encoding="utf-8")
+            except Exception as exc:  # noqa: BLE001 - recorded, batch goes on
+                failure(item, exc, time.perf_counter() - start_time)
+                return
+        upload = agent.client.upload_report(video_file)
+        stats = UsageTracker.extract_usage(
+            response, agent.client.model_id, upload, scope
+        )
+        finish(
+            item,
+            ManifestRecord(
+                key=item.key,
+                video_path=item.video_path,
+                task=item.task,
+                output_path=item.output_path,
+                status="done",
+                elapsed=time.perf_counter() - start_time,
+                prompt_token_count=stats.prompt_token_count,
+                candidates_token_count=stats.candidates_token_count,
+                estimated_cost=stats.estimated_cost,
+                cache_hit=stats.cache_hit,
+                saved_cost=stats.saved_cost,
+                profile=upload.profile if upload else None,
+                uploaded_bytes=upload.uploaded_bytes if upload else None,
+                upload_mb_per_second=stats.upload_mb_per_second,
+                hedged_requests=stats.hedged_requests,
+            ),
+        )
+
+    async def run_video(video_path: str, video_items: list[BatchItem]) -> None:
+        async with upload_slots:
+            try:
+                with request_scope(item_timeout):
+                    video_file = await agent.client.aio.upload_video(video_path)
+            except Exception as exc:  # noqa: BLE001 - recorded, batch goes on
+                for item in video_items:
+                    failure(item, exc)
+                return
+        await asyncio.gather(*(run_item(item, video_file) for item in video_items))
+
+    await asyncio.gather(
+        *(
+            run_video(video_path, video_items)
+            for video_path, video_items in pending.items()
+        )
+    )
+    return summary
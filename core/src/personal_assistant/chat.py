@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import replace
+from typing import Any
+
+from google.genai import errors, types
+
+from personal_assistant.client import AsyncGeminiVideoClient, StreamedResponse
+from personal_assistant.clip import CLIP_NOTE, VideoClip
+from personal_assistant.progress import ProgressCallback
+from personal_assistant.ratelimit import is_throttled
+from personal_assistant.segmented import shift_timestamps
+
+
+class VideoChatSession:
+    """A multi-turn conversation about one uploaded video.
+
+    The video is uploaded once and, when context caching is available, kept in
+    a Gemini cached context, so each turn sends only the conversation text
+    rather than the whole video again. A session about a clip sends the clip
+    inline instead, since a cached context always holds the whole video.
+    """
+
+    def __init__(
+        self,
+        client: AsyncGeminiVideoClient,
+        video_file: Any,
+        cached_context: str | None = None,
+        clip: VideoClip | None = None,
+    ) -> None:
+        self.client = client
+        self.video_file = video_file
+        self.cached_context = cached_context
+        self.clip = clip
+        self.history: list[types.Content] = []
+
+    @classmethod
+    async def start(
+        cls,
+        client: AsyncGeminiVideoClient,
+        video_path: str,
+        console: Any | None = None,
+        clip: VideoClip | None = None,
+        on_progress: ProgressCallback | None = None,
+        video_file: Any | None = None,
+    ) -> VideoChatSession:
+        """Uploads the video and prepares its cached context before the first turn.
+
+        Pass `video_file` when the video is already uploaded, e.g. by a
+        speculative upload, to skip the upload.
+        """
+        if video_file is None:
+            video_file = await client.upload_video(
+                video_path, console=console, on_progress=on_progress
+            )
+        cached_context = (
+            await client.get_cached_context(video_file) if clip is None else None
+        )
+        return cls(client, video_file, cached_context, clip)
+
+    @property
+    def turns(self) -> int:
+        return len(self.history) // 2
+
+    def _contents(self, question: str) -> list[types.Content]:
+        contents = [
+            *self.history,
+            types.Content(role="user", parts=[types.Part.from_text(text=question)]),
+        ]
+        if self.cached_context is None:
+            # Without a cached context the video has to lead every request.
+            parts = [self._video_part()]
+            if self.clip is not None and self.clip.has_range:
+                parts.append(types.Part.from_text(text=CLIP_NOTE.strip()))
+            contents.insert(0, types.Content(role="user", parts=parts))
+        return contents
+
+    def _video_part(self) -> types.Part:
+        if self.clip is not None:
+            return self.client.video_part(self.video_file, self.clip)
+        return types.Part.from_uri(
+            file_uri=self.video_file.uri, mime_type=self.video_file.mime_type
+        )
+
+    async def ask(
+        self, question: str, on_text: Callable[[str], None] | None = None
+    ) -> StreamedResponse:
+        """Sends one follow-up turn and records it in the history.
+
+        For a clip, the returned text has its timestamps shifted to full-video
+        time; streamed chunks and the history keep clip-relative ones.
+        """
+        emitted = False
+
+        def forward(text: str) -> None:
+            nonlocal emitted
+            emitted = True
+            if on_text:
+                on_text(text)
+
+        while True:
+            try:
+                result = await self.client.stream_contents(
+                    self._contents(question),
+                    self.client.config_for(self.cached_context),
+                    on_text=forward,
+                )
+            except errors.APIError as exc:
+                if self.cached_context is None or emitted or is_throttled(exc):
+                    raise
+                await self.client.forget_cached_context(self.video_file, exc)
+                self.cached_context = None
+                continue
+            break
+
+        self.history.append(
+            types.Content(role="user", parts=[types.Part.from_text(text=question)])
+        )
+        self.history.append(
+            types.Content(role="model", parts=[types.Part.from_text(text=result.text)])
+        )
+        if self.clip is not None and self.clip.start:
+            return replace(result, text=shift_timestamps(result.text, self.clip.start))
+        return result
+
+    def reset(self) -> None:
+        """Forgets the conversation but keeps the upload and cached context."""
+        self.history.clear()
+
+    async def close(self, release_context: bool = False) -> None:
+        """Ends the session, optionally deleting the cached context right away."""
+        self.history.clear()
+        if release_context:
+            await self.client.release_cached_context(self.video_file)
@@ -1,15 +1,58 @@
+import asyncio
+import io
+import json
 import os
-import re
-import shutil
-import tempfile
+import threading
 import time
+import weakref
+from collections.abc import Callable, Coroutine
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from dotenv import load_dotenv
 from google import genai
+from google.genai import errors, types
 from loguru import logger
 
+from personal_assistant.clip import VideoClip
+from personal_assistant.context_cache import ContextCacheStore
+from personal_assistant.deadline import bounded, check_deadline
+from personal_assistant.fingerprint import FileFingerprint, file_fingerprint
+from personal_assistant.hedging import Hedger
+from personal_assistant.polling import FileStatePoller, PollSchedule, state_name
+from personal_assistant.progress import (
+    ProgressCallback,
+    ProgressMeter,
+    ProgressReader,
+    combine_callbacks,
+    rich_upload_progress,
+)
+from personal_assistant.ratelimit import (
+    RateLimiter,
+    RetryPolicy,
+    estimate_tokens,
+    is_throttled,
+    media_seconds,
+    retry_within_deadline,
+)
+from personal_assistant.registry import client_registry
+from personal_assistant.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    response_cache_key,
+)
+from personal_assistant.resumable import ResumableUploader
+from personal_assistant.singleflight import SingleFlight, flights
+from personal_assistant.staging import (
+    guess_mime_type,
+    open_upload_stream,
+    safe_display_name,
+)
+from personal_assistant.transcode import TranscodeProfile, transcode_video
+from personal_assistant.upload_cache import UploadCache
+
 
 def _find_env_path() -> Path | None:
     start = Path(__file__).resolve().parent
@@ -26,56 +69,423 @@ if env_path:
 load_dotenv(override=False)
 
 
-class GeminiVideoClient:
+T = TypeVar("T")
+
+
+@dataclass
+class StreamedResponse:
+    """Accumulated result of a streamed generation, shaped like a response."""
+
+    text: str = ""
+    usage_metadata: Any = None
+    time_to_first_token: float | None = None
+
+    def add_chunk(self, chunk: Any, elapsed: float) -> str:
+        """Folds one stream chunk in and returns its text."""
+        chunk_text = getattr(chunk, "text", None) or ""
+        if chunk_text and self.time_to_first_token is None:
+            self.time_to_first_token = elapsed
+        self.text += chunk_text
+        # Usage metadata is cumulative; the last chunk carries the final counts.
+        usage_metadata = getattr(chunk, "usage_metadata", None)
+        if usage_metadata is not None:
+            self.usage_metadata = usage_metadata
+        return chunk_text
+
+
+@dataclass
+class UploadReport:
+    """What an upload actually sent, compared to the original file."""
+
+    source_bytes: int
+    uploaded_bytes: int
+    upload_seconds: float = 0.0
+    profile: str | None = None
+    reused: bool = False
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.source_bytes - self.uploaded_bytes)
+
+    @property
+    def bytes_per_second(self) -> float | None:
+        """Measured upload throughput; None for reused uploads."""
+        if self.reused or not self.uploaded_bytes or self.upload_seconds <= 0:
+            return None
+        return self.uploaded_bytes / self.upload_seconds
+
+    @property
+    def estimated_seconds_saved(self) -> float | None:
+        """Upload time the saved bytes would have taken at the measured rate."""
+        rate = self.bytes_per_second
+        if rate is None:
+            return None
+        return self.bytes_saved / rate
+
+
+def _prompt_tokens(response: Any) -> int | None:
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "prompt_token_count", None)
+
+
+class AsyncGeminiVideoClient:
+    """Gemini video client built on the SDK's asyncio (`client.aio`) surface."""
+
     def __init__(
-        self, api_key: str | None = None, model_id: str = "gemini-3-flash-preview"
+        self,
+        api_key: str | None = None,
+        model_id: str = "gemini-3-flash-preview",
+        upload_cache: UploadCache | None = None,
+        poll_schedule: PollSchedule | None = None,
+        response_cache: ResponseCache | None = None,
+        refresh_responses: bool = False,
+        generation_config: types.GenerateContentConfigDict | None = None,
+        context_cache: ContextCacheStore | None = None,
+        transcode_profile: TranscodeProfile | None = None,
+        resumable_uploader: ResumableUploader | None = None,
+        genai_client: genai.Client | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        attempt_timeout: float | None = None,
+        hedger: Hedger | None = None,
+        single_flight: SingleFlight | None = None,
     ) -> None:
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
             raise ValueError(
                 "GOOGLE_API_KEY not found in environment or passed as argument"
             )
+        self.api_key = api_key
 
-        self.client = genai.Client(api_key=self.api_key)
+        # Shared per API key, so every client reuses one warm connection pool.
+        self.client = genai_client or client_registry.genai_client(self.api_key)
         self.model_id = model_id
+        self.upload_cache = upload_cache
+        self.poll_schedule = poll_schedule or PollSchedule()
+        self.response_cache = response_cache
+        # When set, cached answers are ignored but fresh ones are still stored.
+        self.refresh_responses = refresh_responses
+        self.generation_config = generation_config
+        self.context_cache = context_cache
+        self._context_locks: dict[str, asyncio.Lock] = {}
+        # Videos the API refused to cache (e.g. below the minimum token count).
+        self._uncacheable_contexts: set[str] = set()
+        # Re-encode videos to a compact proxy before upload when set.
+        self.transcode_profile = transcode_profile
+        # Chunked, resumable uploads for files of at least its `min_bytes`.
+        self.resumable_uploader = resumable_uploader
+        # Client-side RPM/TPM budgets for generation; None admits every call.
+        self.rate_limiter = rate_limiter
+        # Backoff for throttled and timed-out generations, limiter or not.
+        self.retry_policy = retry_policy or RetryPolicy()
+        # A generation attempt with no response (or new stream chunk) for this
+        # many seconds is abandoned and, within the job's deadline, retried.
+        self.attempt_timeout = attempt_timeout
+        # Duplicates slow non-streaming generations; None disables hedging.
+        self.hedger = hedger
+        # Process-wide, so identical uploads and prompts from any client that
+        # overlap in time share one remote call.
+        self.flights = single_flight or flights
+        # Duration of each uploaded file, keyed by URI, for token estimates.
+        self._media_seconds: dict[str, float] = {}
+        # Content fingerprint of each uploaded file, keyed by remote file name.
+        self._content_keys: dict[str, str] = {}
+        self._upload_reports: dict[str, UploadReport] = {}
+        # Time range each locally cut upload was cut to, keyed by remote file name.
+        self._local_clips: dict[str, VideoClip] = {}
+        self._pollers: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, FileStatePoller
+        ] = weakref.WeakKeyDictionary()
 
-    def upload_video(self, video_path: str, console: Any | None = None) -> Any:
-        """Uploads a video to Gemini's Files API."""
-        # Sanitize filename for display_name to avoid encoding issues in API headers
-        # Some API headers or SDK internals may not handle Unicode display names correctly.
-        display_name = re.sub(r"[^\x00-\x7F]+", "_", os.path.basename(video_path))
+    def get_poller(self) -> FileStatePoller:
+        """Returns the poller shared by every upload on the running event loop."""
+        loop = asyncio.get_running_loop()
+        poller = self._pollers.get(loop)
+        if poller is None:
+            poller = FileStatePoller(self.client.aio.files, self.poll_schedule)
+            self._pollers[loop] = poller
+        return poller
 
-        # Create a temporary file with a safe ASCII name
-        # We use a suffix to preserve the file extension for MIME type detection
-        suffix = os.path.splitext(video_path)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            safe_path = tmp_file.name
+    async def _get_cached_upload(self, cache_key: str) -> Any | None:
+        """Returns the cached remote file for a fingerprint if it is still ACTIVE."""
+        assert self.upload_cache is not None
+        # The cache is a JSON file; keep its I/O off the event loop.
+        entry = await asyncio.to_thread(self.upload_cache.get, cache_key)
+        if entry is None:
+            return None
+        try:
+            video_file = await self.client.aio.files.get(name=entry.name)
+        except errors.APIError as exc:
+            logger.info(f"Cached upload {entry.name} is no longer available: {exc}")
+            await asyncio.to_thread(self.upload_cache.remove, cache_key)
+            return None
+        if state_name(video_file) != "ACTIVE":
+            await asyncio.to_thread(self.upload_cache.remove, cache_key)
+            return None
+        logger.info(f"Reusing cached upload: {video_file.uri}")
+        return video_file
 
+    async def _cache_upload(self, cache_key: str, video_file: Any) -> None:
+        assert self.upload_cache is not None
+        evictions = await asyncio.to_thread(
+            self.upload_cache.put, cache_key, video_file
+        )
+        for evicted in evictions:
+            logger.info(f"Evicting cached upload {evicted.name} (cache size limit)")
+            try:
+                await self.client.aio.files.delete(name=evicted.name)
+            except errors.APIError as exc:
+                logger.warning(f"Failed to delete evicted upload {evicted.name}: {exc}")
+
+    async def upload_video(
+        self,
+        video_path: str,
+        console: Any | None = None,
+        profile: TranscodeProfile | None = None,
+        clip: VideoClip | None = None,
+        on_progress: ProgressCallback | None = None,
+        transcode: bool = True,
+        speculative: bool = False,
+    ) -> Any:
+        """Uploads a video to Gemini's Files API, reusing a cached upload if possible.
+
+        `profile` overrides the client's transcode profile for this upload, e.g.
+        to send only the audio track for transcription. Clip offsets only apply
+        to video, so an audio-only upload is cut to `clip`'s range locally.
+        Pass `transcode=False` for media that is already prepared, such as
+        silence-trimmed audio, to send the file as is.
+        `on_progress` receives byte-level progress while the file is sent; with
+        a `console`, a determinate Rich bar is shown as well.
+        A `speculative` caller may give the file back with `discard_upload`.
+        """
+        if not transcode:
+            profile = None
+        elif profile is None:
+            profile = self.transcode_profile
+        local_clip = (
+            VideoClip(clip.start, clip.end)
+            if clip is not None and clip.has_range and profile and profile.audio_only
+            else None
+        )
+        content_key = None
+        if profile is not None or any(
+            cache is not None
+            for cache in (self.upload_cache, self.response_cache, self.context_cache)
+        ):
+            fingerprint = await self._fingerprint(video_path)
+            content_key = fingerprint.key
+            if profile is not None:
+                # A proxy is different content from the original it came from.
+                content_key = f"{content_key}|{profile.key}"
+            if local_clip is not None:
+                content_key = f"{content_key}|{local_clip.key}"
+
+        # Callers uploading the same content at once share one upload.
+        flight_key = (
+            "upload",
+            self.api_key,
+            content_key or self._path_key(video_path, profile, local_clip),
+        )
+        video_file, report = await self.flights.do(
+            flight_key,
+            lambda emit: self._upload(
+                video_path, content_key, profile, local_clip, console, emit
+            ),
+            listener=on_progress,
+            history=1,
+        )
+        self._upload_reports[video_file.name] = report
+        # Holds live with the flights, so they count callers on every client
+        # that shares this upload.
+        if speculative:
+            self.flights.holds.hold(self._hold_key(video_file.name))
+        else:
+            self.flights.holds.keep(self._hold_key(video_file.name))
+        self._remember_media(video_file)
+        if local_clip is not None:
+            self._local_clips[video_file.name] = local_clip
+        if content_key is not None:
+            self._content_keys[video_file.name] = content_key
+        return video_file
+
+    def _hold_key(self, name: str) -> tuple[str, str, str]:
+        return ("upload", self.api_key, name)
+
+    def keep_upload(self, video_file: Any) -> None:
+        """Marks a speculative upload as used, so it is never deleted as unused."""
+        self.flights.holds.keep(self._hold_key(video_file.name))
+
+    async def discard_upload(self, video_file: Any) -> None:
+        """Gives back a speculative upload its caller never used.
+
+        Once no speculative caller on any client sharing the upload holds it,
+        a file this client uploaded is deleted remotely and dropped from the
+        upload cache. A file reused from the cache, or also handed to a
+        non-speculative caller, is kept.
+        """
+        name = video_file.name
+        if not self.flights.holds.release(self._hold_key(name)):
+            return
+        report = self._upload_reports.pop(name, None)
+        if report is not None and report.reused:
+            return
+        content_key = self._content_keys.pop(name, None)
+        if content_key is not None and self.upload_cache is not None:
+            await asyncio.to_thread(self.upload_cache.remove, content_key)
+        self._local_clips.pop(name, None)
+        await self._delete_remote(name)
+
+    async def _delete_remote(self, name: str) -> None:
+        logger.info(f"Deleting unused upload {name}")
         try:
-            # Copy the original content to the safe path
-            logger.info(f"Copying video to temporary safe path: {safe_path}")
-            shutil.copy2(video_path, safe_path)
+            await self.client.aio.files.delete(name=name)
+        except errors.APIError as exc:
+            logger.warning(f"Failed to delete upload {name}: {exc}")
+
+    async def _fingerprint(self, video_path: str) -> FileFingerprint:
+        stat = os.stat(video_path)
+        return await self.flights.do(
+            (
+                "fingerprint",
+                os.path.realpath(video_path),
+                stat.st_size,
+                stat.st_mtime_ns,
+            ),
+            lambda emit: asyncio.to_thread(file_fingerprint, video_path),
+        )
+
+    @staticmethod
+    def _path_key(
+        video_path: str, profile: TranscodeProfile | None, local_clip: VideoClip | None
+    ) -> tuple[Any, ...]:
+        stat = os.stat(video_path)
+        return (
+            os.path.realpath(video_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            profile.key if profile else None,
+            local_clip.key if local_clip else None,
+        )
 
-            logger.info(f"Uploading video from safe path: {safe_path}")
-            # Upload using the safe path, but keep the sanitized display name
-            video_file = self.client.files.upload(
-                file=safe_path, config={"display_name": display_name}
+    async def _upload(
+        self,
+        video_path: str,
+        content_key: str | None,
+        profile: TranscodeProfile | None,
+        local_clip: VideoClip | None,
+        console: Any | None,
+        on_progress: ProgressCallback | None,
+    ) -> tuple[Any, UploadReport]:
+        if self.upload_cache is not None and content_key is not None:
+            cached_file = await self._get_cached_upload(content_key)
+            if cached_file is not None:
+                return cached_file, UploadReport(
+                    source_bytes=os.path.getsize(video_path),
+                    uploaded_bytes=0,
+                    profile=profile.name if profile else None,
+                    reused=True,
+                )
+
+        check_deadline()
+        upload_path = video_path
+        report = UploadReport(
+            source_bytes=os.path.getsize(video_path),
+            uploaded_bytes=os.path.getsize(video_path),
+        )
+        if profile is not None:
+            transcoded = await asyncio.to_thread(
+                transcode_video, video_path, profile, None, local_clip
+            )
+            upload_path = transcoded.path
+            report.uploaded_bytes = transcoded.output_bytes
+            report.profile = transcoded.profile
+
+        # Stream straight from the original file: the display name is sanitized
+        # for API headers and the MIME type is explicit, so no ASCII-named copy
+        # of the video is needed.
+        display_name = safe_display_name(video_path)
+        mime_type = guess_mime_type(upload_path)
+        upload_started = time.perf_counter()
+        with (
+            rich_upload_progress(console) if console is not None else nullcontext()
+        ) as show_progress:
+            # Uploads are not idempotent, so they are bounded by the job's
+            # deadline but never re-sent as a whole.
+            video_file = await bounded(
+                self._send(
+                    upload_path,
+                    mime_type,
+                    display_name,
+                    report.uploaded_bytes,
+                    combine_callbacks(on_progress, show_progress),
+                )
+            )
+        report.upload_seconds = time.perf_counter() - upload_started
+
+        try:
+            video_file = await bounded(
+                self.wait_for_processing(video_file, console=console)
+            )
+        except BaseException:
+            # Abandoned or failed before it was cached: nobody can reuse it.
+            await asyncio.shield(self._delete_remote(video_file.name))
+            raise
+        if content_key is not None and self.upload_cache is not None:
+            await self._cache_upload(content_key, video_file)
+
+        logger.info(f"Video uploaded successfully: {video_file.uri}")
+        return video_file, report
+
+    async def _send(
+        self,
+        upload_path: str,
+        mime_type: str,
+        display_name: str,
+        size_bytes: int,
+        on_progress: ProgressCallback | None,
+    ) -> Any:
+        uploader = self.resumable_uploader
+        if uploader is not None and size_bytes >= uploader.min_bytes:
+            logger.info(f"Uploading video in resumable chunks: {upload_path}")
+            name = await uploader.upload(
+                upload_path, mime_type, display_name, self.api_key, on_progress
             )
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(safe_path):
-                os.remove(safe_path)
+            return await self.client.aio.files.get(name=name)
+
+        with open_upload_stream(upload_path) as source:
+            logger.info(f"Uploading video: {upload_path}")
+            meter = None
+            stream: io.IOBase | str = source
+            if on_progress is not None and not isinstance(source, str):
+                meter = ProgressMeter(size_bytes, on_progress)
+                stream = ProgressReader(source, meter)
+            video_file = await self.client.aio.files.upload(
+                file=stream,
+                config={"display_name": display_name, "mime_type": mime_type},
+            )
+        if meter is not None:
+            meter.update(size_bytes)
+        return video_file
 
+    def _remember_media(self, video_file: Any) -> None:
+        seconds = media_seconds(video_file)
+        uri = getattr(video_file, "uri", None)
+        if seconds is not None and uri:
+            self._media_seconds[uri] = seconds
+
+    def upload_report(self, video_file: Any) -> UploadReport | None:
+        """Returns what this client sent for an uploaded file, if it uploaded it."""
+        return self._upload_reports.get(getattr(video_file, "name", None) or "")
+
+    async def wait_for_processing(
+        self, video_file: Any, console: Any | None = None
+    ) -> Any:
+        """Polls an uploaded file until it leaves the PROCESSING state."""
         video_name = video_file.name
         if not video_name:
             raise ValueError("Uploaded video missing file name")
 
-        def get_state_name(file_obj: Any) -> str | None:
-            state = getattr(file_obj, "state", None)
-            return getattr(state, "name", None)
-
-        state_name = get_state_name(video_file)
-
+        poller = self.get_poller()
         if console:
             from rich.progress import (
                 BarColumn,
@@ -94,28 +504,558 @@ class GeminiVideoClient:
                 transient=True,
             ) as progress:
                 progress.add_task("[cyan]Gemini is processing video...", total=None)
-                while state_name == "PROCESSING":
-                    time.sleep(2)
-                    video_file = self.client.files.get(name=video_name)
-                    state_name = get_state_name(video_file)
+                video_file = await poller.wait(video_file)
         else:
-            while state_name == "PROCESSING":
-                logger.info("Waiting for video to be processed...")
-                time.sleep(2)
-                video_file = self.client.files.get(name=video_name)
-                state_name = get_state_name(video_file)
+            logger.info("Waiting for video to be processed...")
+            video_file = await poller.wait(video_file)
 
-        if state_name == "FAILED":
+        if state_name(video_file) == "FAILED":
             raise ValueError(f"Video processing failed: {video_file.name}")
-
-        logger.info(f"Video uploaded successfully: {video_file.uri}")
         return video_file
 
-    def analyze_video(self, video_file: Any, prompt: str) -> Any:
-        """Sends a prompt with video context to Gemini."""
+    def content_key(self, video_file: Any) -> str | None:
+        """Returns the local content fingerprint of a file uploaded by this client."""
+        return self._content_keys.get(getattr(video_file, "name", None) or "")
+
+    def local_clip(self, video_file: Any) -> VideoClip | None:
+        """Returns the range an upload was cut to locally, if it was."""
+        return self._local_clips.get(getattr(video_file, "name", None) or "")
+
+    def _response_key(
+        self, video_file: Any, prompt: str, clip: VideoClip | None = None
+    ) -> str | None:
+        if self.response_cache is None:
+            return None
+        content_key = self.content_key(video_file)
+        if content_key is None:
+            # Not uploaded through this client, so the content is unknown.
+            return None
+        if clip is not None:
+            content_key = f"{content_key}|{clip.key}"
+        return response_cache_key(
+            content_key, self.model_id, prompt, self.generation_config
+        )
+
+    async def _get_cached_response(self, key: str | None) -> CachedResponse | None:
+        if key is None or self.refresh_responses:
+            return None
+        assert self.response_cache is not None
+        cached = await asyncio.to_thread(self.response_cache.get, key)
+        if cached is not None:
+            logger.info("Using cached response")
+        return cached
+
+    async def _cache_response(self, key: str | None, response: Any) -> None:
+        if key is None:
+            return
+        assert self.response_cache is not None
+        await asyncio.to_thread(self.response_cache.put, key, self.model_id, response)
+
+    def _context_key(self, video_file: Any) -> str:
+        name = getattr(video_file, "name", None) or ""
+        return f"{self._content_keys.get(name, name)}|{self.model_id}"
+
+    async def get_cached_context(self, video_file: Any) -> str | None:
+        """Returns a cached-contents entry holding the video, creating it on first use.
+
+        Returns None when context caching is disabled or the API refuses it
+        (for example, a clip below the model's minimum cacheable size).
+        """
+        if self.context_cache is None:
+            return None
+        store = self.context_cache
+        key = self._context_key(video_file)
+        if key in self._uncacheable_contexts:
+            return None
+        ttl = f"{int(store.ttl.total_seconds())}s"
+        async with self._context_locks.setdefault(key, asyncio.Lock()):
+            entry = await asyncio.to_thread(store.get, key)
+            if entry is not None:
+                remaining = entry.remaining()
+                if remaining is None or remaining > store.ttl / 2:
+                    return entry.name
+                # Past half its TTL: extend it rather than paying to re-cache.
+                try:
+                    cached = await self.client.aio.caches.update(
+                        name=entry.name, config=types.UpdateCachedContentConfig(ttl=ttl)
+                    )
+                    await asyncio.to_thread(store.put, key, cached, self.model_id)
+                    return entry.name
+                except errors.APIError as exc:
+                    logger.info(f"Cached context {entry.name} is gone: {exc}")
+                    await asyncio.to_thread(store.remove, key)
+
+            try:
+                cached = await self.client.aio.caches.create(
+                    model=self.model_id,
+                    config=types.CreateCachedContentConfig(
+                        contents=[video_file],
+                        ttl=ttl,
+                        display_name=(getattr(video_file, "display_name", None) or "")[
+                            :128
+                        ]
+                        or None,
+                    ),
+                )
+            except errors.APIError as exc:
+                logger.warning(
+                    f"Context caching unavailable, sending video inline: {exc}"
+                )
+                if not is_throttled(exc):
+                    # Throttling is temporary; anything else will fail again.
+                    self._uncacheable_contexts.add(key)
+                return None
+            if not cached.name:
+                return None
+            await asyncio.to_thread(store.put, key, cached, self.model_id)
+            logger.info(f"Created cached context {cached.name} (ttl {ttl})")
+            return cached.name
+
+    async def release_cached_context(self, video_file: Any) -> None:
+        """Deletes the video's cached context now instead of waiting for its TTL."""
+        if self.context_cache is None:
+            return
+        entry = await asyncio.to_thread(
+            self.context_cache.remove, self._context_key(video_file)
+        )
+        if entry is None:
+            return
+        try:
+            await self.client.aio.caches.delete(name=entry.name)
+        except errors.APIError as exc:
+            logger.warning(f"Failed to delete cached context {entry.name}: {exc}")
+
+    def config_for(
+        self, cached_context: str | None
+    ) -> types.GenerateContentConfigDict | None:
+        """Returns the generation config, pointing at a cached context if given."""
+        if cached_context is None:
+            return self.generation_config
+        config: types.GenerateContentConfigDict = {
+            **(self.generation_config or {}),
+            "cached_content": cached_context,
+        }
+        return config
+
+    def video_part(self, video_file: Any, clip: VideoClip | None = None) -> Any:
+        """Returns the video for a request, limited to `clip` if given."""
+        if clip is None:
+            return video_file
+        local_clip = self.local_clip(video_file)
+        if local_clip is not None and local_clip.range_key != clip.range_key:
+            raise ValueError(
+                f"{video_file.name} was cut to {local_clip.range_key} before upload"
+            )
+        if (getattr(video_file, "mime_type", None) or "").startswith("audio/"):
+            # Audio takes no video metadata; its range was cut before upload.
+            return video_file
+        return clip.part(video_file, offsets=local_clip is None)
+
+    def _request(
+        self,
+        video_file: Any,
+        prompt: str,
+        cached_context: str | None,
+        clip: VideoClip | None = None,
+    ) -> tuple[list[Any], types.GenerateContentConfigDict | None]:
+        """Returns the contents and config for a prompt, with or without a cache."""
+        if cached_context is None:
+            return [self.video_part(video_file, clip), prompt], self.config_for(None)
+        return [prompt], self.config_for(cached_context)
+
+    async def forget_cached_context(self, video_file: Any, exc: Exception) -> None:
+        """Drops a cached context that failed so later prompts send the video inline."""
+        logger.warning(f"Cached context failed, sending video inline: {exc}")
+        if self.context_cache is not None:
+            await asyncio.to_thread(
+                self.context_cache.remove, self._context_key(video_file)
+            )
+
+    async def analyze_video(
+        self,
+        video_file: Any,
+        prompt: str,
+        cache_context: bool = False,
+        clip: VideoClip | None = None,
+    ) -> Any:
+        """Sends a prompt with video context to Gemini, reusing a cached answer.
+
+        With `cache_context`, the video is served from a Gemini cached-contents
+        entry so repeated prompts bill it at the discounted cached rate. With
+        `clip`, only that range is analyzed, at its sampling rate; a cached
+        context always holds the whole video, so it is not used then.
+        Identical concurrent requests share one call.
+        """
+        return await self.flights.do(
+            self._analysis_key("analyze", video_file, prompt, cache_context, clip),
+            lambda emit: self._analyze_video(video_file, prompt, cache_context, clip),
+        )
+
+    def _analysis_key(
+        self,
+        kind: str,
+        video_file: Any,
+        prompt: str,
+        cache_context: bool,
+        clip: VideoClip | None,
+    ) -> tuple[Any, ...]:
+        return (
+            kind,
+            self.api_key,
+            self.model_id,
+            self.content_key(video_file) or getattr(video_file, "name", None),
+            prompt,
+            clip.key if clip else None,
+            cache_context,
+            self.refresh_responses,
+            json.dumps(self.generation_config, sort_keys=True, default=str),
+        )
+
+    async def _analyze_video(
+        self,
+        video_file: Any,
+        prompt: str,
+        cache_context: bool,
+        clip: VideoClip | None,
+    ) -> Any:
+        key = self._response_key(video_file, prompt, clip)
+        cached = await self._get_cached_response(key)
+        if cached is not None:
+            return cached
+
         logger.info(f"Analyzing video with prompt: {prompt}")
-        response = self.client.models.generate_content(
-            model=self.model_id,
-            contents=[video_file, prompt],
+        cached_context = (
+            await self.get_cached_context(video_file)
+            if cache_context and clip is None
+            else None
         )
+        contents, config = self._request(video_file, prompt, cached_context, clip)
+        try:
+            response = await self.generate_contents(contents, config)
+        except errors.APIError as exc:
+            if cached_context is None or is_throttled(exc):
+                raise
+            await self.forget_cached_context(video_file, exc)
+            contents, config = self._request(video_file, prompt, None, clip)
+            response = await self.generate_contents(contents, config)
+        await self._cache_response(key, response)
         return response
+
+    def estimate_tokens(self, contents: Any) -> int:
+        """Estimates a request's input tokens for the rate limiter."""
+        return estimate_tokens(contents, self._media_seconds.get)
+
+    async def generate_contents(
+        self,
+        contents: Any,
+        config: types.GenerateContentConfigDict | None = None,
+    ) -> Any:
+        """Runs one generation for prebuilt contents (e.g. clips or plain text).
+
+        Generation is idempotent, so a slow call may be hedged and a timed-out
+        one retried.
+        """
+        estimated = self.estimate_tokens(contents)
+
+        async def send() -> Any:
+            return await bounded(
+                self.client.aio.models.generate_content(
+                    model=self.model_id, contents=contents, config=config
+                ),
+                self.attempt_timeout,
+            )
+
+        def charge_hedge() -> None:
+            # The duplicate bypasses acquire(), but still spends quota.
+            if self.rate_limiter is not None:
+                self.rate_limiter.for_model(self.model_id).charge(estimated)
+
+        async def hedged() -> Any:
+            if self.hedger is None:
+                return await send()
+            return await self.hedger.run(
+                self.model_id, send, estimated, on_hedge=charge_hedge
+            )
+
+        async def attempt() -> Any:
+            if self.rate_limiter is None:
+                return await hedged()
+            return await self.rate_limiter.run(
+                self.model_id, estimated, hedged, prompt_tokens=_prompt_tokens
+            )
+
+        return await retry_within_deadline(attempt, self.retry_policy)
+
+    async def stream_contents(
+        self,
+        contents: Any,
+        config: types.GenerateContentConfigDict | None = None,
+        on_text: Callable[[str], None] | None = None,
+        started_at: float | None = None,
+    ) -> StreamedResponse:
+        """Streams a generation for prebuilt contents (e.g. a multi-turn history).
+
+        A throttled or stalled stream is only retried while it has produced no
+        text. Streams are never hedged: the caller already shows their output.
+        """
+        start_time = time.perf_counter() if started_at is None else started_at
+        result = StreamedResponse()
+
+        async def receive() -> StreamedResponse:
+            stream = await bounded(
+                self.client.aio.models.generate_content_stream(
+                    model=self.model_id, contents=contents, config=config
+                ),
+                self.attempt_timeout,
+            )
+            chunks = aiter(stream)
+            while True:
+                try:
+                    chunk = await bounded(anext(chunks), self.attempt_timeout)
+                except StopAsyncIteration:
+                    break
+                chunk_text = result.add_chunk(chunk, time.perf_counter() - start_time)
+                if chunk_text and on_text:
+                    on_text(chunk_text)
+            return result
+
+        async def attempt() -> StreamedResponse:
+            if self.rate_limiter is None:
+                return await receive()
+            return await self.rate_limiter.run(
+                self.model_id,
+                self.estimate_tokens(contents),
+                receive,
+                prompt_tokens=_prompt_tokens,
+            )
+
+        return await retry_within_deadline(
+            attempt, self.retry_policy, can_retry=lambda: not result.text
+        )
+
+    async def analyze_video_stream(
+        self,
+        video_file: Any,
+        prompt: str,
+        on_text: Callable[[str], None] | None = None,
+        cache_context: bool = False,
+        clip: VideoClip | None = None,
+    ) -> StreamedResponse | CachedResponse:
+        """Streams a prompt's answer, calling `on_text` with each new chunk of text.
+
+        A caller that joins an identical stream already in flight first gets
+        the text produced so far, then the remaining chunks.
+        """
+        return await self.flights.do(
+            self._analysis_key("stream", video_file, prompt, cache_context, clip),
+            lambda emit: self._analyze_video_stream(
+                video_file, prompt, emit, cache_context, clip
+            ),
+            listener=on_text,
+        )
+
+    async def _analyze_video_stream(
+        self,
+        video_file: Any,
+        prompt: str,
+        on_text: Callable[[str], None],
+        cache_context: bool,
+        clip: VideoClip | None,
+    ) -> StreamedResponse | CachedResponse:
+        start_time = time.perf_counter()
+        key = self._response_key(video_file, prompt, clip)
+        cached = await self._get_cached_response(key)
+        if cached is not None:
+            on_text(cached.text)
+            cached.time_to_first_token = time.perf_counter() - start_time
+            return cached
+
+        logger.info(f"Streaming analysis with prompt: {prompt}")
+        cached_context = (
+            await self.get_cached_context(video_file)
+            if cache_context and clip is None
+            else None
+        )
+        emitted = False
+
+        def forward(text: str) -> None:
+            nonlocal emitted
+            emitted = True
+            on_text(text)
+
+        while True:
+            contents, config = self._request(video_file, prompt, cached_context, clip)
+            try:
+                result = await self.stream_contents(
+                    contents, config, on_text=forward, started_at=start_time
+                )
+            except errors.APIError as exc:
+                # Only fall back while nothing has been shown to the caller.
+                if cached_context is None or emitted or is_throttled(exc):
+                    raise
+                await self.forget_cached_context(video_file, exc)
+                cached_context = None
+                continue
+            break
+        await self._cache_response(key, result)
+        return result
+
+
+class _BackgroundLoop:
+    """One long-lived event loop in a daemon thread for the blocking facade.
+
+    The SDK's async transport binds its connection pool to the loop that first
+    uses it, so every blocking call is funneled through the same loop rather
+    than a fresh `asyncio.run` per call.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="gemini-client-loop", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return future.result()
+
+
+_background_loop = _BackgroundLoop()
+
+
+class GeminiVideoClient:
+    """Blocking facade over `AsyncGeminiVideoClient` for the CLI and scripts."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model_id: str = "gemini-3-flash-preview",
+        upload_cache: UploadCache | None = None,
+        poll_schedule: PollSchedule | None = None,
+        response_cache: ResponseCache | None = None,
+        refresh_responses: bool = False,
+        generation_config: types.GenerateContentConfigDict | None = None,
+        context_cache: ContextCacheStore | None = None,
+        transcode_profile: TranscodeProfile | None = None,
+        resumable_uploader: ResumableUploader | None = None,
+        genai_client: genai.Client | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        attempt_timeout: float | None = None,
+        hedger: Hedger | None = None,
+        single_flight: SingleFlight | None = None,
+    ) -> None:
+        self.aio = AsyncGeminiVideoClient(
+            api_key=api_key,
+            model_id=model_id,
+            upload_cache=upload_cache,
+            poll_schedule=poll_schedule,
+            response_cache=response_cache,
+            refresh_responses=refresh_responses,
+            generation_config=generation_config,
+            context_cache=context_cache,
+            transcode_profile=transcode_profile,
+            resumable_uploader=resumable_uploader,
+            genai_client=genai_client,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            attempt_timeout=attempt_timeout,
+            hedger=hedger,
+            single_flight=single_flight,
+        )
+
+    @property
+    def client(self) -> genai.Client:
+        return self.aio.client
+
+    @property
+    def model_id(self) -> str:
+        return self.aio.model_id
+
+    @model_id.setter
+    def model_id(self, value: str) -> None:
+        self.aio.model_id = value
+
+    @property
+    def upload_cache(self) -> UploadCache | None:
+        return self.aio.upload_cache
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        return self.aio.response_cache
+
+    def upload_report(self, video_file: Any) -> UploadReport | None:
+        return self.aio.upload_report(video_file)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Runs a coroutine that uses `self.aio` on the client's event loop."""
+        return _background_loop.run(coro)
+
+    def upload_video(
+        self,
+        video_path: str,
+        console: Any | None = None,
+        profile: TranscodeProfile | None = None,
+        clip: VideoClip | None = None,
+        on_progress: ProgressCallback | None = None,
+        transcode: bool = True,
+    ) -> Any:
+        """Uploads a video to Gemini's Files API, reusing a cached upload if possible."""
+        return _background_loop.run(
+            self.aio.upload_video(
+                video_path,
+                console=console,
+                profile=profile,
+                clip=clip,
+                on_progress=on_progress,
+                transcode=transcode,
+            )
+        )
+
+    def wait_for_processing(self, video_file: Any, console: Any | None = None) -> Any:
+        """Polls an uploaded file until it leaves the PROCESSING state."""
+        return _background_loop.run(
+            self.aio.wait_for_processing(video_file, console=console)
+        )
+
+    def analyze_video(
+        self,
+        video_file: Any,
+        prompt: str,
+        cache_context: bool = False,
+        clip: VideoClip | None = None,
+    ) -> Any:
+        """Sends a prompt with video context to Gemini, reusing a cached answer."""
+        return _background_loop.run(
+            self.aio.analyze_video(
+                video_file, prompt, cache_context=cache_context, clip=clip
+            )
+        )
+
+    def analyze_video_stream(
+        self,
+        video_file: Any,
+        prompt: str,
+        on_text: Callable[[str], None] | None = None,
+        cache_context: bool = False,
+        clip: VideoClip | None = None,
+    ) -> StreamedResponse | CachedResponse:
+        """Streams a prompt's answer; `on_text` runs on the client's loop thread."""
+        return _background_loop.run(
+            self.aio.analyze_video_stream(
+                video_file,
+                prompt,
+                on_text=on_text,
+                cache_context=cache_context,
+                clip=clip,
+            )
+        )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from google.genai import types
+
+# seconds, mm:ss or h:mm:ss, each optionally with a fraction.
+_TIME = re.compile(r"^(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d+)?)$")
+
+CLIP_NOTE = (
+    "\n\nOnly part of the recording is provided; it starts at 00:00. "
+    "Measure all timestamps from the start of the provided clip."
+)
+
+
+def parse_time(value: str) -> float:
+    """Parses '2400', '40:00' or '1:05:30' (optionally with a fraction) to seconds."""
+    match = _TIME.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid time: {value!r}; use seconds, mm:ss or h:mm:ss")
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds)
+
+
+@dataclass(frozen=True)
+class VideoClip:
+    """A time range and sampling rate to analyze instead of the whole video."""
+
+    start: float = 0.0
+    end: float | None = None
+    fps: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.start < 0:
+            raise ValueError("Clip start must not be negative")
+        if self.end is not None and self.end <= self.start:
+            raise ValueError("Clip end must be after its start")
+        if self.fps is not None and not 0 < self.fps <= 24:
+            raise ValueError("fps must be greater than 0 and at most 24")
+
+    @classmethod
+    def from_options(
+        cls,
+        start: str | None = None,
+        end: str | None = None,
+        fps: float | None = None,
+    ) -> VideoClip | None:
+        """Builds a clip from CLI/UI values, or returns None when none are set."""
+        if not start and not end and fps is None:
+            return None
+        return cls(
+            start=parse_time(start) if start else 0.0,
+            end=parse_time(end) if end else None,
+            fps=fps,
+        )
+
+    @property
+    def has_range(self) -> bool:
+        return bool(self.start) or self.end is not None
+
+    @property
+    def range_key(self) -> str:
+        end = "" if self.end is None else f"{self.end:g}"
+        return f"{self.start:g}-{end}s"
+
+    @property
+    def key(self) -> str:
+        """Identifies the clip in cache keys."""
+        fps = "" if self.fps is None else f"{self.fps:g}"
+        return f"clip={self.range_key}@{fps}fps"
+
+    def analyzed_seconds(self, duration: float | None) -> float | None:
+        """Returns the length of the range, given the full duration if known."""
+        end = self.end if duration is None else min(self.end or duration, duration)
+        if end is None:
+            return None
+        return max(0.0, end - self.start)
+
+    def video_metadata(self, offsets: bool = True) -> types.VideoMetadata:
+        return types.VideoMetadata(
+            start_offset=f"{self.start:.3f}s" if offsets and self.start else None,
+            end_offset=f"{self.end:.3f}s" if offsets and self.end is not None else None,
+            fps=self.fps,
+        )
+
+    def part(self, video_file: Any, offsets: bool = True) -> types.Part:
+        """Returns the video as a part limited to this clip.
+
+        Pass `offsets=False` for uploads already cut to the range locally.
+        """
+        return types.Part(
+            file_data=types.FileData(
+                file_uri=video_file.uri, mime_type=video_file.mime_type
+            ),
+            video_metadata=self.video_metadata(offsets),
+        )
+
+
+@dataclass
+class ClippedResponse:
+    """An answer about a clip, with timestamps moved to full-recording time."""
+
+    text: str
+    usage_metadata: Any = None
+    time_to_first_token: float | None = None
+    cache_hit: bool = False
+    analyzed_seconds: float | None = None
+    analyzed_fps: float | None = None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Any, TypeVar
 
@@ -50,6 +51,16 @@ def resolve_arg(
     return default_value
 
 
+def default_cache_dir() -> Path:
+    """Returns the local cache directory, honoring PERSONAL_ASSISTANT_CACHE_DIR."""
+    override = os.getenv("PERSONAL_ASSISTANT_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    xdg_cache = os.getenv("XDG_CACHE_HOME")
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "personal_assistant"
+
+
 def resolve_output_path(output_arg: str | None, video_path: str) -> str | None:
     """
     Resolves the final output path.
@@ -67,3 +78,17 @@ def resolve_output_path(output_arg: str | None, video_path: str) -> str | None:
         return str(out_path / f"{video_stem}.md")
 
     return str(out_path)
+
+
+def resolve_task_output_path(
+    output_arg: str | None, video_path: str, suffix: str
+) -> str | None:
+    """
+    Resolves a per-task output path for multi-task runs.
+    Directories yield '<video stem>.<suffix>.md'; files get '.<suffix>' before the extension.
+    """
+    base = resolve_output_path(output_arg, video_path)
+    if not base:
+        return None
+    path = Path(base)
+    return str(path.with_name(f"{path.stem}.{suffix}{path.suffix or '.md'}"))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from personal_assistant.config import default_cache_dir
+
+
+@dataclass
+class CachedContext:
+    name: str
+    model_id: str
+    expire_time: str | None = None
+
+    def expires_at(self) -> datetime | None:
+        if not self.expire_time:
+            return None
+        return datetime.fromisoformat(self.expire_time)
+
+    def remaining(self, now: datetime | None = None) -> timedelta | None:
+        expires_at = self.expires_at()
+        if expires_at is None:
+            return None
+        return expires_at - (now or datetime.now(UTC))
+
+
+class ContextCacheStore:
+    """Persistent map from video content and model to Gemini cached contents.
+
+    Persisting the map lets separate CLI runs (and every UI view) reuse one
+    cached context per video until its TTL lapses.
+    """
+
+    DEFAULT_TTL = timedelta(hours=1)
+    # Entries this close to expiry are treated as gone.
+    EXPIRY_MARGIN = timedelta(minutes=2)
+
+    def __init__(
+        self, path: str | Path | None = None, ttl: timedelta = DEFAULT_TTL
+    ) -> None:
+        self.path = Path(path) if path else default_cache_dir() / "contexts.json"
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> ContextCacheStore | None:
+        settings = config.get("context_cache") or {}
+        if not settings.get("enabled", True):
+            return None
+        ttl_minutes = settings.get("ttl_minutes")
+        ttl = timedelta(minutes=ttl_minutes) if ttl_minutes else cls.DEFAULT_TTL
+        return cls(path=settings.get("path"), ttl=ttl)
+
+    def _load(self) -> dict[str, CachedContext]:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable context cache {self.path}: {exc}")
+            return {}
+        entries: dict[str, CachedContext] = {}
+        for key, value in raw.items():
+            try:
+                entries[key] = CachedContext(**value)
+            except TypeError:
+                continue
+        return entries
+
+    def _save(self, entries: dict[str, CachedContext]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        payload = {key: asdict(entry) for key, entry in entries.items()}
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> CachedContext | None:
+        """Returns the live entry for a key, dropping it if it has expired."""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            remaining = entry.remaining()
+            if remaining is not None and remaining <= self.EXPIRY_MARGIN:
+                del entries[key]
+                self._save(entries)
+                return None
+            return entry
+
+    def put(self, key: str, cached_content: Any, model_id: str) -> CachedContext:
+        expire_time = getattr(cached_content, "expire_time", None)
+        entry = CachedContext(
+            name=cached_content.name,
+            model_id=model_id,
+            expire_time=expire_time.isoformat() if expire_time else None,
+        )
+        with self._lock:
+            entries = self._load()
+            entries[key] = entry
+            self._save(entries)
+        return entry
+
+    def remove(self, key: str) -> CachedContext | None:
+        with self._lock:
+            entries = self._load()
+            entry = entries.pop(key, None)
+            if entry is not None:
+                self._save(entries)
+            return entry
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """The job's deadline passed before the work finished."""
+
+
+class AttemptTimeout(TimeoutError):
+    """One request attempt ran past its own timeout; the call may be retried."""
+
+
+@dataclass
+class RequestScope:
+    """Deadline and hedging tally shared by every request of one CLI/UI job."""
+
+    # time.monotonic() value after which work is abandoned; None for no limit.
+    deadline: float | None = None
+    hedges_fired: int = 0
+    hedges_won: int = 0
+    # Estimated input tokens of the duplicate requests, billed on top of the run.
+    hedge_prompt_tokens: int = 0
+
+    def remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+
+_current: ContextVar[RequestScope | None] = ContextVar("request_scope", default=None)
+
+
+def current_scope() -> RequestScope | None:
+    return _current.get()
+
+
+def timeout_from_config(config: dict[str, Any]) -> float | None:
+    settings = config.get("requests") or {}
+    timeout = settings.get("timeout_seconds")
+    return float(timeout) if timeout else None
+
+
+@contextmanager
+def request_scope(timeout: float | None = None) -> Iterator[RequestScope]:
+    """Runs the enclosed work under a deadline of `timeout` seconds.
+
+    The scope follows the work into tasks and the client's background loop.
+    A nested scope can shorten the deadline but never extend it, and its
+    hedges also count toward the enclosing scope.
+    """
+    parent = _current.get()
+    deadline = time.monotonic() + timeout if timeout else None
+    if parent is not None and parent.deadline is not None:
+        deadline = (
+            parent.deadline if deadline is None else min(deadline, parent.deadline)
+        )
+    scope = RequestScope(deadline)
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+        if parent is not None:
+            parent.hedges_fired += scope.hedges_fired
+            parent.hedges_won += scope.hedges_won
+            parent.hedge_prompt_tokens += scope.hedge_prompt_tokens
+
+
+def remaining() -> float | None:
+    """Seconds left before the current job's deadline, None without one."""
+    scope = _current.get()
+    return scope.remaining() if scope is not None else None
+
+
+def check_deadline(needed: float = 0.0) -> None:
+    """Raises DeadlineExceeded unless `needed` more seconds fit in the deadline."""
+    left = remaining()
+    if left is not None and left <= needed:
+        raise DeadlineExceeded(
+            f"Deadline exceeded ({max(0.0, left):.1f}s left, {needed:.1f}s needed)"
+        )
+
+
+async def bounded(awaitable: Awaitable[T], timeout: float | None = None) -> T:  # noqa: UP047
+    """Awaits with the tighter of an attempt `timeout` and the job's deadline."""
+    left = remaining()
+    limits = [limit for limit in (timeout, left) if limit is not None]
+    if not limits:
+        return await awaitable
+    if left is not None and left <= 0:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Deadline exceeded before the request was sent")
+    limit = min(limits)
+    try:
+        return await asyncio.wait_for(awaitable, limit)
+    except TimeoutError as exc:
+        if left is not None and left <= limit:
+            raise DeadlineExceeded(
+                f"Deadline exceeded after {limit:.1f}s waiting for the request"
+            ) from exc
+        raise AttemptTimeout(f"Request attempt exceeded {limit:.1f}s") from exc
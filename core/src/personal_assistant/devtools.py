@@ -29,6 +29,7 @@ def run_checks() -> None:
         ["uv", "run", "ruff", "check", "src"],
         ["uv", "run", "ruff", "format", "--check", "src"],
         ["uv", "run", "mypy", "src"],
+        ["uv", "run", "pytest", "-q"],
         ["uv", "pip", "check"],
         ["uv", "run", "python", "-m", "compileall", "-q", "src"],
     ]
@@ -42,6 +43,7 @@ def run_workspace_checks() -> None:
         ["uv", "run", "ruff", "check", "core/src", "ui/src"],
         ["uv", "run", "ruff", "format", "--check", "core/src", "ui/src"],
         ["uv", "run", "mypy", "core/src"],
+        ["uv", "run", "pytest", "-q", "core/tests"],
         ["uv", "pip", "check"],
         ["uv", "run", "python", "-m", "compileall", "-q", "core/src", "ui/src"],
     ]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    sha256: str
+    size_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.sha256}:{self.size_bytes}"
+
+
+_memo: dict[tuple[str, int, int], FileFingerprint] = {}
+_memo_lock = threading.Lock()
+
+
+def file_fingerprint(path: str | Path) -> FileFingerprint:
+    """Hashes a file's content, memoized per path, size and mtime."""
+    resolved = os.path.realpath(path)
+    stat = os.stat(resolved)
+    memo_key = (resolved, stat.st_size, stat.st_mtime_ns)
+    with _memo_lock:
+        cached = _memo.get(memo_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(resolved, "rb") as handle:
+        while chunk := handle.read(_CHUNK_SIZE):
+            digest.update(chunk)
+
+    fingerprint = FileFingerprint(sha256=digest.hexdigest(), size_bytes=stat.st_size)
+    with _memo_lock:
+        _memo[memo_key] = fingerprint
+    return fingerprint
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from personal_assistant.deadline import current_scope, remaining
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to send a duplicate of a slow generation request."""
+
+    percentile: float = 95.0
+    # Never hedge earlier than this, however fast recent calls were.
+    min_delay: float = 10.0
+    # Used until `min_samples` latencies have been observed for the model.
+    initial_delay: float = 120.0
+    min_samples: int = 10
+    window: int = 200
+
+
+class LatencyTracker:
+    """Rolling latencies of completed requests, per model."""
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model_id: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(model_id, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def percentile(
+        self, model_id: str, percentile: float, min_samples: int = 1
+    ) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(model_id, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        rank = math.ceil(percentile / 100 * len(samples)) - 1
+        return samples[min(len(samples) - 1, max(0, rank))]
+
+
+class Hedger:
+    """Sends a duplicate of a request that outlives the model's p95 latency.
+
+    Whichever copy succeeds first wins and the other is cancelled. Only use it
+    for idempotent calls; each hedge is billed like a second request.
+    """
+
+    def __init__(
+        self, policy: HedgePolicy | None = None, tracker: LatencyTracker | None = None
+    ) -> None:
+        self.policy = policy or HedgePolicy()
+        self.tracker = tracker or LatencyTracker(self.policy.window)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> Hedger | None:
+        settings = (config.get("requests") or {}).get("hedging") or {}
+        if not settings.get("enabled", False):
+            return None
+        policy = HedgePolicy(
+            percentile=float(settings.get("percentile", 95.0)),
+            min_delay=float(settings.get("min_delay_seconds", 10.0)),
+            initial_delay=float(settings.get("initial_delay_seconds", 120.0)),
+            min_samples=int(settings.get("min_samples", 10)),
+        )
+        return cls(policy)
+
+    def delay_for(self, model_id: str) -> float:
+        observed = self.tracker.percentile(
+            model_id, self.policy.percentile, self.policy.min_samples
+        )
+        if observed is None:
+            return self.policy.initial_delay
+        return max(self.policy.min_delay, observed)
+
+    async def _timed(self, model_id: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        result = await attempt()
+        self.tracker.record(model_id, time.perf_counter() - started)
+        return result
+
+    async def run(
+        self,
+        model_id: str,
+        attempt: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        on_hedge: Callable[[], None] | None = None,
+    ) -> T:
+        """Runs `attempt`, starting a second copy if the first is slow."""
+        delay = self.delay_for(model_id)
+        left = remaining()
+        if left is not None and left <= delay:
+            # The deadline ends before a hedge could fire.
+            return await self._timed(model_id, attempt)
+
+        primary = asyncio.ensure_future(self._timed(model_id, attempt))
+        pending: set[asyncio.Future[T]] = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            logger.info(f"Request slower than {delay:.1f}s; sending a hedge")
+            scope = current_scope()
+            if scope is not None:
+                scope.hedges_fired += 1
+                scope.hedge_prompt_tokens += estimated_tokens
+            if on_hedge is not None:
+                on_hedge()
+            hedge = asyncio.ensure_future(self._timed(model_id, attempt))
+            pending.add(hedge)
+            failure: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        if task is hedge and scope is not None:
+                            scope.hedges_won += 1
+                        return task.result()
+                    failure = failure or exc
+            assert failure is not None
+            raise failure
+        finally:
+            for task in pending:
+                task.cancel()
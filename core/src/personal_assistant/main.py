@@ -1,31 +1,336 @@
+import asyncio
+import json
+import os
 import time
+from collections.abc import Callable, Coroutine
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import typer
 from loguru import logger
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 
-from personal_assistant.agent import VideoAgent
-from personal_assistant.client import GeminiVideoClient
-from personal_assistant.config import load_config, resolve_arg, resolve_output_path
+from personal_assistant.agent import TASK_TYPES, VideoAgent
+from personal_assistant.batch import (
+    BatchManifest,
+    collect_videos,
+    plan_batch,
+    run_batch,
+)
+from personal_assistant.chat import VideoChatSession
+from personal_assistant.client import GeminiVideoClient, UploadReport
+from personal_assistant.clip import VideoClip
+from personal_assistant.config import (
+    load_config,
+    resolve_arg,
+    resolve_output_path,
+    resolve_task_output_path,
+)
+from personal_assistant.context_cache import ContextCacheStore
+from personal_assistant.deadline import (
+    RequestScope,
+    request_scope,
+    timeout_from_config,
+)
+from personal_assistant.hedging import Hedger
+from personal_assistant.polling import PollSchedule
+from personal_assistant.ratelimit import RateLimiter, RetryPolicy
+from personal_assistant.registry import client_registry
+from personal_assistant.response_cache import ResponseCache
+from personal_assistant.resumable import ResumableUploader
+from personal_assistant.segmented import format_timestamp, shift_timestamps
+from personal_assistant.silence import (
+    SilenceSettings,
+    TrimResult,
+    remap_response,
+    trim_silence,
+)
+from personal_assistant.transcode import get_profile, transcription_profile
+from personal_assistant.upload_cache import UploadCache
 from personal_assistant.usage import UsageTracker
 
+T = TypeVar("T")
+
 app = typer.Typer(help="Video Understanding Agent CLI")
 console = Console()
 
+# Panel title and border style for each task's output.
+TASK_DISPLAY = {
+    "summarize": ("Video Summary", "blue"),
+    "ask": ("Answer", "green"),
+    "events": ("Detected Events", "magenta"),
+    "transcribe": ("Diarized Transcript", "cyan"),
+}
+
+
+# Config sections the video client reads. Other settings (inputs, outputs,
+# task options, UI preferences) do not split the pooled client.
+CLIENT_CONFIG_SECTIONS = (
+    "upload_cache",
+    "polling",
+    "response_cache",
+    "generation_config",
+    "context_cache",
+    "resumable_upload",
+    "rate_limits",
+)
+
 
-def get_agent(model_id: str) -> VideoAgent:
+def get_agent(
+    model_id: str,
+    config: dict[str, Any] | None = None,
+    use_cache: bool = True,
+    refresh: bool = False,
+    transcode: str | None = None,
+) -> VideoAgent:
     # Map friendly names to actual API IDs
     if model_id == "gemini-3-pro":
         model_id = "gemini-3-pro-preview"
     elif model_id == "gemini-3-flash":
         model_id = "gemini-3-flash-preview"
 
-    client = GeminiVideoClient(model_id=model_id)
-    return VideoAgent(client)
+    config = config or {}
+    transcode = transcode or (config.get("transcode") or {}).get("profile")
+
+    def build() -> GeminiVideoClient:
+        return GeminiVideoClient(
+            model_id=model_id,
+            upload_cache=UploadCache.from_config(config),
+            poll_schedule=PollSchedule.from_config(config),
+            response_cache=ResponseCache.from_config(config) if use_cache else None,
+            refresh_responses=refresh,
+            generation_config=config.get("generation_config"),
+            context_cache=ContextCacheStore.from_config(config),
+            transcode_profile=get_profile(transcode) if transcode else None,
+            resumable_uploader=ResumableUploader.from_config(config),
+            genai_client=(
+                client_registry.genai_client(api_key, http_options) if api_key else None
+            ),
+            rate_limiter=rate_limiter,
+            retry_policy=RetryPolicy.from_config(config),
+            attempt_timeout=request_settings.get("attempt_timeout_seconds"),
+            hedger=hedger,
+        )
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    http_options = config.get("http_options")
+    # Quotas are per project, so all clients for a key draw on one budget.
+    rate_limiter = client_registry.get_or_create(
+        ("rate_limits", api_key, json.dumps(config.get("rate_limits"), default=str)),
+        lambda: RateLimiter.from_config(config),
+    )
+    request_settings = config.get("requests") or {}
+    # Latency history behind the hedge delay is shared across agents too.
+    hedger = client_registry.get_or_create(
+        ("hedging", api_key, json.dumps(request_settings.get("hedging"), default=str)),
+        lambda: Hedger.from_config(config),
+    )
+    # Agents with the same key, model and client settings share one client
+    # (and its upload bookkeeping); every model and setting shares the key's
+    # transport.
+    client_settings = {
+        section: config.get(section) for section in CLIENT_CONFIG_SECTIONS
+    }
+    key = (
+        api_key,
+        json.dumps(http_options, sort_keys=True, default=str),
+        model_id,
+        use_cache,
+        refresh,
+        transcode,
+        json.dumps(client_settings, sort_keys=True, default=str),
+        request_settings.get("attempt_timeout_seconds"),
+        rate_limiter,
+        hedger,
+    )
+    return VideoAgent(client_registry.get_or_create(key, build))
+
+
+def job_scope(
+    config: dict[str, Any], timeout: float | None
+) -> AbstractContextManager[RequestScope]:
+    """Opens the request scope (deadline) for one command or chat turn."""
+    return request_scope(
+        timeout if timeout is not None else timeout_from_config(config)
+    )
+
+
+def render_stream(  # noqa: UP047
+    title: str,
+    style: str,
+    produce: Callable[[Callable[[str], None]], T],
+    transform: Callable[[str], str] | None = None,
+) -> T:
+    """Calls `produce` with a text callback that grows a live Rich panel.
+
+    `transform`, when given, rewrites the accumulated text before each render.
+    """
+    chunks: list[str] = []
+    with Live(
+        Panel("", title=title, border_style=style),
+        console=console,
+        refresh_per_second=8,
+        vertical_overflow="visible",
+    ) as live:
+
+        def on_text(text: str) -> None:
+            chunks.append(text)
+            shown = "".join(chunks)
+            if transform:
+                shown = transform(shown)
+            live.update(Panel(shown, title=title, border_style=style))
+
+        return produce(on_text)
+
+
+def resolve_clip(
+    config: dict[str, Any], start: str | None, end: str | None, fps: float | None
+) -> VideoClip | None:
+    """Builds the clip to analyze from CLI options or config, exiting on bad input."""
+    try:
+        return VideoClip.from_options(
+            resolve_arg("start", start, config.get("start")),
+            resolve_arg("end", end, config.get("end")),
+            resolve_arg("fps", fps, config.get("fps")),
+        )
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+
+def clip_transform(clip: VideoClip | None) -> Callable[[str], str] | None:
+    """Shifts streamed clip timestamps to full-video time for display."""
+    if clip is None or not clip.start:
+        return None
+    return lambda text: shift_timestamps(text, clip.start)
+
+
+def generate_response(
+    agent: VideoAgent,
+    task_type: str,
+    video_file: Any,
+    title: str,
+    style: str,
+    question: str | None = None,
+    stream: bool = True,
+    transform: Callable[[str], str] | None = None,
+    clip: VideoClip | None = None,
+) -> Any:
+    """Runs a task, rendering the answer incrementally in a live panel when streaming."""
+    if not stream:
+        with console.status("[bold green]Generating response..."):
+            return agent.run_task(task_type, video_file, question, clip=clip)
+
+    return render_stream(
+        title,
+        style,
+        lambda on_text: agent.stream_task(
+            task_type, video_file, question, on_text=on_text, clip=clip
+        ),
+        transform or clip_transform(clip),
+    )
+
+
+def run_with_progress(  # noqa: UP047
+    agent: VideoAgent,
+    description: str,
+    total: int | None,
+    start: Callable[[Callable[[Any], None]], Coroutine[Any, Any, T]],
+) -> T:
+    """Runs a multi-request job, advancing a progress bar as each part finishes."""
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        progress_task = progress.add_task(f"[cyan]{description}", total=total)
+        return agent.client.run(start(lambda _: progress.advance(progress_task)))
+
+
+def run_segmented_summary(
+    agent: VideoAgent,
+    video_file: Any,
+    video_path: str,
+    segments: int,
+    concurrency: int,
+    clip: VideoClip | None = None,
+) -> Any:
+    """Runs a map-reduce summary with a progress bar over the segments."""
+    response = run_with_progress(
+        agent,
+        f"Summarizing {segments} segments...",
+        segments,
+        lambda on_done: agent.summarize_segmented_async(
+            video_file,
+            segments,
+            concurrency=concurrency,
+            video_path=video_path,
+            on_segment_done=on_done,
+            clip=clip,
+        ),
+    )
+    if response.resumed_segments:
+        console.print(
+            f"[dim]Resumed {response.resumed_segments} segment(s) from checkpoint[/dim]"
+        )
+    return response
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def report_upload(report: UploadReport | None) -> None:
+    """Prints upload throughput and what a transcoded or reused upload saved."""
+    if report is None:
+        return
+    if report.reused:
+        console.print(
+            f"[dim]Reused cached upload ({format_bytes(report.source_bytes)} not re-sent)[/dim]"
+        )
+        return
+    rate = report.bytes_per_second
+    throughput = (
+        f" in {report.upload_seconds:.1f}s ({rate / 1024**2:.1f} MB/s)"
+        if rate is not None
+        else ""
+    )
+    if not report.profile:
+        console.print(
+            f"[dim]Uploaded {format_bytes(report.uploaded_bytes)}{throughput}[/dim]"
+        )
+        return
+    line = (
+        f"Uploaded {format_bytes(report.uploaded_bytes)}{throughput} instead of "
+        f"{format_bytes(report.source_bytes)} (profile '{report.profile}', "
+        f"saved {format_bytes(report.bytes_saved)}"
+    )
+    seconds_saved = report.estimated_seconds_saved
+    if seconds_saved is not None:
+        line += f", ~{seconds_saved:.1f}s of upload time"
+    console.print(f"[dim]{line})[/dim]")
+
+
+def report_trim(trim: TrimResult) -> None:
+    """Prints how much dead air was cut before a transcription upload."""
+    offset_map = trim.offset_map
+    console.print(
+        f"[dim]Removed {offset_map.removed_fraction:.1%} silence "
+        f"({offset_map.removed_seconds:.0f}s of {offset_map.original_duration:.0f}s); "
+        "timestamps are mapped back to the original[/dim]"
+    )
 
 
 def display_response(
@@ -35,8 +340,12 @@ def display_response(
     style: str,
     elapsed_time: float,
     output_path: str | None = None,
+    show_panel: bool = True,
+    upload: UploadReport | None = None,
+    scope: RequestScope | None = None,
 ) -> None:
-    console.print(Panel(response.text, title=title, border_style=style))
+    if show_panel:
+        console.print(Panel(response.text, title=title, border_style=style))
 
     if output_path:
         try:
@@ -47,7 +356,7 @@ def display_response(
         except Exception as e:
             console.print(f"\n[bold red]Failed to save output: {e}[/bold red]")
 
-    stats = UsageTracker.extract_usage(response, client.model_id)
+    stats = UsageTracker.extract_usage(response, client.model_id, upload, scope)
 
     table = Table(
         title="Token Usage & Cost", show_header=True, header_style="bold magenta"
@@ -56,9 +365,38 @@ def display_response(
     table.add_column("Value", justify="right", style="green")
 
     table.add_row("Input Tokens", f"{stats.prompt_token_count:,}")
+    if stats.cached_token_count:
+        table.add_row("  of which Cached", f"{stats.cached_token_count:,}")
+        table.add_row("  Cached Input Cost", f"${stats.cached_cost:.4f}")
     table.add_row("Output Tokens", f"{stats.candidates_token_count:,}")
     table.add_row("Total Tokens", f"{stats.total_token_count:,}")
     table.add_row("Estimated Cost", f"${stats.estimated_cost:.4f}")
+    if stats.time_to_first_token is not None:
+        table.add_row("Time to First Token", f"{stats.time_to_first_token:.2f}s")
+    if client.response_cache is not None:
+        table.add_row(
+            "Response Cache",
+            f"hit (saved ${stats.saved_cost:.4f})" if stats.cache_hit else "miss",
+        )
+    if stats.analyzed_seconds is not None or stats.analyzed_fps is not None:
+        analyzed = (
+            "full video"
+            if stats.analyzed_seconds is None
+            else format_timestamp(stats.analyzed_seconds)
+        )
+        if stats.analyzed_fps is not None:
+            analyzed += f" @ {stats.analyzed_fps:g} fps"
+        table.add_row("Analyzed Duration", analyzed)
+    if stats.audio_removed_fraction:
+        table.add_row("Silence Removed", f"{stats.audio_removed_fraction:.1%}")
+    if stats.upload_mb_per_second is not None:
+        table.add_row("Upload Throughput", f"{stats.upload_mb_per_second:.1f} MB/s")
+    if stats.hedged_requests:
+        table.add_row(
+            "Hedged Requests",
+            f"{stats.hedged_requests} ({stats.hedges_won} won, "
+            f"${stats.hedge_cost:.4f})",
+        )
     table.add_row("Execution Time", f"{elapsed_time:.2f}s")
 
     console.print(table)
@@ -73,12 +411,49 @@ def summarize(
     output: str | None = typer.Option(
         None, "--output", "-o", help="Save output to a file"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the local response cache"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Ignore cached answers and store fresh ones"
+    ),
+    transcode: str | None = typer.Option(
+        None,
+        "--transcode",
+        help="Upload a compact ffmpeg proxy: compact, small or tiny",
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="Analyze from this time (seconds, mm:ss or h:mm:ss)"
+    ),
+    end: str | None = typer.Option(None, "--end", help="Analyze up to this time"),
+    fps: float | None = typer.Option(
+        None, "--fps", help="Frames sampled per second (Gemini default: 1)"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=1,
+        help="Give up after this many seconds (default: requests.timeout_seconds)",
+    ),
     config_path: str = typer.Option(
         "config.yaml", "--config", "-c", help="Path to config file"
     ),
+    stream: bool = typer.Option(
+        True, "--stream/--no-stream", help="Render the answer as it is generated"
+    ),
+    segments: int | None = typer.Option(
+        None,
+        "--segments",
+        min=1,
+        help="Summarize N time segments in parallel, then merge them",
+    ),
+    segment_concurrency: int | None = typer.Option(
+        None, "--segment-concurrency", min=1, help="Concurrent segment requests"
+    ),
 ):
     """Generate a summary of the video."""
     config = load_config(config_path)
+    clip = resolve_clip(config, start, end, fps)
 
     video_path = resolve_arg("video_path", video_path, config.get("video_path"))
     if not video_path:
@@ -90,13 +465,45 @@ def summarize(
     assert model is not None
     output = resolve_arg("output", output, config.get("output"))
     final_output = resolve_output_path(output, video_path)
+    segment_settings = config.get("segmented_summary") or {}
+    segments = resolve_arg("segments", segments, segment_settings.get("segments"))
+    segment_concurrency = resolve_arg(
+        "segment_concurrency",
+        segment_concurrency,
+        segment_settings.get("concurrency"),
+        4,
+    )
+    assert segment_concurrency is not None
+    segmented = bool(segments and segments > 1)
 
-    agent = get_agent(model)
-    with console.status("[bold green]Uploading video..."):
-        try:
+    agent = get_agent(
+        model,
+        config,
+        use_cache=not no_cache,
+        refresh=refresh,
+        transcode=transcode,
+    )
+    try:
+        with job_scope(config, timeout) as scope:
             start_time = time.perf_counter()
-            video_file = agent.client.upload_video(video_path, console=console)
-            response = agent.get_summary(video_file)
+            with console.status("[bold green]Uploading video..."):
+                video_file = agent.client.upload_video(video_path, console=console)
+            report_upload(agent.client.upload_report(video_file))
+            if segmented:
+                assert segments is not None
+                response = run_segmented_summary(
+                    agent, video_file, video_path, segments, segment_concurrency, clip
+                )
+            else:
+                response = generate_response(
+                    agent,
+                    "summarize",
+                    video_file,
+                    "Video Summary",
+                    "blue",
+                    stream=stream,
+                    clip=clip,
+                )
             elapsed_time = time.perf_counter() - start_time
             display_response(
                 response,
@@ -105,10 +512,13 @@ def summarize(
                 "blue",
                 elapsed_time,
                 final_output,
+                show_panel=segmented or not stream,
+                upload=agent.client.upload_report(video_file),
+                scope=scope,
             )
-        except Exception as e:
-            logger.error(f"Error during summarization: {e}")
-            console.print(f"[red]Error: {e}[/red]")
+    except Exception as e:
+        logger.error(f"Error during summarization: {e}")
+        console.print(f"[red]Error: {e}[/red]")
 
 
 @app.command()
@@ -119,12 +529,40 @@ def ask(
     output: str | None = typer.Option(
         None, "--output", "-o", help="Save output to a file"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the local response cache"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Ignore cached answers and store fresh ones"
+    ),
+    transcode: str | None = typer.Option(
+        None,
+        "--transcode",
+        help="Upload a compact ffmpeg proxy: compact, small or tiny",
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="Analyze from this time (seconds, mm:ss or h:mm:ss)"
+    ),
+    end: str | None = typer.Option(None, "--end", help="Analyze up to this time"),
+    fps: float | None = typer.Option(
+        None, "--fps", help="Frames sampled per second (Gemini default: 1)"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=1,
+        help="Give up after this many seconds (default: requests.timeout_seconds)",
+    ),
     config_path: str = typer.Option(
         "config.yaml", "--config", "-c", help="Path to config file"
     ),
+    stream: bool = typer.Option(
+        True, "--stream/--no-stream", help="Render the answer as it is generated"
+    ),
 ):
     """Ask a question about the video."""
     config = load_config(config_path)
+    clip = resolve_clip(config, start, end, fps)
 
     video_path = resolve_arg("video_path", video_path, config.get("video_path"))
     if not video_path:
@@ -144,19 +582,44 @@ def ask(
     output = resolve_arg("output", output, config.get("output"))
     final_output = resolve_output_path(output, video_path)
 
-    agent = get_agent(model)
-    with console.status("[bold green]Uploading video..."):
-        try:
+    agent = get_agent(
+        model,
+        config,
+        use_cache=not no_cache,
+        refresh=refresh,
+        transcode=transcode,
+    )
+    try:
+        with job_scope(config, timeout) as scope:
             start_time = time.perf_counter()
-            video_file = agent.client.upload_video(video_path, console=console)
-            response = agent.ask_question(video_file, question)
+            with console.status("[bold green]Uploading video..."):
+                video_file = agent.client.upload_video(video_path, console=console)
+            report_upload(agent.client.upload_report(video_file))
+            response = generate_response(
+                agent,
+                "ask",
+                video_file,
+                "Answer",
+                "green",
+                question=question,
+                stream=stream,
+                clip=clip,
+            )
             elapsed_time = time.perf_counter() - start_time
             display_response(
-                response, agent.client, "Answer", "green", elapsed_time, final_output
+                response,
+                agent.client,
+                "Answer",
+                "green",
+                elapsed_time,
+                final_output,
+                show_panel=not stream,
+                upload=agent.client.upload_report(video_file),
+                scope=scope,
             )
-        except Exception as e:
-            logger.error(f"Error during Q&A: {e}")
-            console.print(f"[red]Error: {e}[/red]")
+    except Exception as e:
+        logger.error(f"Error during Q&A: {e}")
+        console.print(f"[red]Error: {e}[/red]")
 
 
 @app.command()
@@ -166,12 +629,40 @@ def events(
     output: str | None = typer.Option(
         None, "--output", "-o", help="Save output to a file"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the local response cache"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Ignore cached answers and store fresh ones"
+    ),
+    transcode: str | None = typer.Option(
+        None,
+        "--transcode",
+        help="Upload a compact ffmpeg proxy: compact, small or tiny",
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="Analyze from this time (seconds, mm:ss or h:mm:ss)"
+    ),
+    end: str | None = typer.Option(None, "--end", help="Analyze up to this time"),
+    fps: float | None = typer.Option(
+        None, "--fps", help="Frames sampled per second (Gemini default: 1)"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=1,
+        help="Give up after this many seconds (default: requests.timeout_seconds)",
+    ),
     config_path: str = typer.Option(
         "config.yaml", "--config", "-c", help="Path to config file"
     ),
+    stream: bool = typer.Option(
+        True, "--stream/--no-stream", help="Render the answer as it is generated"
+    ),
 ):
     """Detect events in the video."""
     config = load_config(config_path)
+    clip = resolve_clip(config, start, end, fps)
 
     video_path = resolve_arg("video_path", video_path, config.get("video_path"))
     if not video_path:
@@ -184,12 +675,28 @@ def events(
     output = resolve_arg("output", output, config.get("output"))
     final_output = resolve_output_path(output, video_path)
 
-    agent = get_agent(model)
-    with console.status("[bold green]Uploading video..."):
-        try:
+    agent = get_agent(
+        model,
+        config,
+        use_cache=not no_cache,
+        refresh=refresh,
+        transcode=transcode,
+    )
+    try:
+        with job_scope(config, timeout) as scope:
             start_time = time.perf_counter()
-            video_file = agent.client.upload_video(video_path, console=console)
-            response = agent.detect_events(video_file)
+            with console.status("[bold green]Uploading video..."):
+                video_file = agent.client.upload_video(video_path, console=console)
+            report_upload(agent.client.upload_report(video_file))
+            response = generate_response(
+                agent,
+                "events",
+                video_file,
+                "Detected Events",
+                "magenta",
+                stream=stream,
+                clip=clip,
+            )
             elapsed_time = time.perf_counter() - start_time
             display_response(
                 response,
@@ -198,10 +705,13 @@ def events(
                 "magenta",
                 elapsed_time,
                 final_output,
+                show_panel=not stream,
+                upload=agent.client.upload_report(video_file),
+                scope=scope,
             )
-        except Exception as e:
-            logger.error(f"Error during event detection: {e}")
-            console.print(f"[red]Error: {e}[/red]")
+    except Exception as e:
+        logger.error(f"Error during event detection: {e}")
+        console.print(f"[red]Error: {e}[/red]")
 
 
 @app.command()
@@ -211,12 +721,62 @@ def transcribe(
     output: str | None = typer.Option(
         None, "--output", "-o", help="Save output to a file"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the local response cache"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Ignore cached answers and store fresh ones"
+    ),
+    transcode: str | None = typer.Option(
+        None,
+        "--transcode",
+        help="Upload a compact ffmpeg proxy: compact, small or tiny",
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="Analyze from this time (seconds, mm:ss or h:mm:ss)"
+    ),
+    end: str | None = typer.Option(None, "--end", help="Analyze up to this time"),
+    fps: float | None = typer.Option(
+        None, "--fps", help="Frames sampled per second (Gemini default: 1)"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=1,
+        help="Give up after this many seconds (default: requests.timeout_seconds)",
+    ),
     config_path: str = typer.Option(
         "config.yaml", "--config", "-c", help="Path to config file"
     ),
+    stream: bool = typer.Option(
+        True, "--stream/--no-stream", help="Render the answer as it is generated"
+    ),
+    chunk_minutes: float | None = typer.Option(
+        None,
+        "--chunk-minutes",
+        min=1,
+        help="Transcribe overlapping windows of this length in parallel",
+    ),
+    overlap_seconds: float | None = typer.Option(
+        None, "--overlap-seconds", min=0, help="Overlap between windows"
+    ),
+    workers: int | None = typer.Option(
+        None, "--workers", "-j", min=1, help="Concurrent window requests"
+    ),
+    with_video: bool = typer.Option(
+        False,
+        "--with-video",
+        help="Upload video frames too (e.g. to read on-screen speaker names)",
+    ),
+    silence_trim: bool | None = typer.Option(
+        None,
+        "--trim-silence/--no-trim-silence",
+        help="Cut dead air before upload and map timestamps back (needs ffmpeg)",
+    ),
 ):
     """Transcribe and diarize the video audio."""
     config = load_config(config_path)
+    clip = resolve_clip(config, start, end, fps)
 
     video_path = resolve_arg("video_path", video_path, config.get("video_path"))
     if not video_path:
@@ -228,13 +788,93 @@ def transcribe(
     assert model is not None
     output = resolve_arg("output", output, config.get("output"))
     final_output = resolve_output_path(output, video_path)
+    chunk_settings = config.get("chunked_transcription") or {}
+    chunk_minutes = resolve_arg(
+        "chunk_minutes", chunk_minutes, chunk_settings.get("chunk_minutes")
+    )
+    overlap_seconds = resolve_arg(
+        "overlap_seconds", overlap_seconds, chunk_settings.get("overlap_seconds"), 20.0
+    )
+    workers = resolve_arg("workers", workers, chunk_settings.get("concurrency"), 4)
+    assert overlap_seconds is not None and workers is not None
+    # Window clips rely on video clip offsets, so chunked runs keep the frames.
+    with_video = with_video or bool(chunk_minutes)
+    silence_trim = resolve_arg(
+        "silence_trim",
+        silence_trim,
+        (config.get("silence_trimming") or {}).get("enabled"),
+        False,
+    )
+    if silence_trim and with_video:
+        console.print(
+            "[red]Error: --trim-silence uploads audio only and cannot be combined "
+            "with --with-video or --chunk-minutes.[/red]"
+        )
+        raise typer.Exit(code=1)
+    if silence_trim and clip is not None:
+        console.print(
+            "[red]Error: --trim-silence cannot be combined with --start, --end "
+            "or --fps.[/red]"
+        )
+        raise typer.Exit(code=1)
 
-    agent = get_agent(model)
-    with console.status("[bold green]Uploading video..."):
-        try:
+    agent = get_agent(
+        model,
+        config,
+        use_cache=not no_cache,
+        refresh=refresh,
+        transcode=transcode,
+    )
+    try:
+        with job_scope(config, timeout) as scope:
             start_time = time.perf_counter()
-            video_file = agent.client.upload_video(video_path, console=console)
-            response = agent.transcribe_and_diarize(video_file)
+            trim = None
+            if silence_trim:
+                with console.status("[bold green]Trimming silence..."):
+                    trim = trim_silence(video_path, SilenceSettings.from_config(config))
+                report_trim(trim)
+            with console.status("[bold green]Uploading video..."):
+                # Trimmed audio is already encoded for upload; the video
+                # proxy profile must not be applied to it.
+                video_file = agent.client.upload_video(
+                    trim.path if trim else video_path,
+                    console=console,
+                    profile=None
+                    if trim
+                    else transcription_profile(with_video=with_video),
+                    transcode=not trim,
+                )
+            report_upload(agent.client.upload_report(video_file))
+            response: Any
+            if chunk_minutes:
+                chunk_seconds = chunk_minutes * 60
+                response = run_with_progress(
+                    agent,
+                    "Transcribing windows...",
+                    None,
+                    lambda on_done: agent.transcribe_chunked_async(
+                        video_file,
+                        chunk_seconds,
+                        overlap_seconds,
+                        concurrency=workers,
+                        video_path=video_path,
+                        on_chunk_done=on_done,
+                        clip=clip,
+                    ),
+                )
+            else:
+                response = generate_response(
+                    agent,
+                    "transcribe",
+                    video_file,
+                    "Diarized Transcript",
+                    "cyan",
+                    stream=stream,
+                    transform=trim.offset_map.remap_text if trim else None,
+                    clip=clip,
+                )
+                if trim:
+                    response = remap_response(response, trim.offset_map)
             elapsed_time = time.perf_counter() - start_time
             display_response(
                 response,
@@ -243,10 +883,424 @@ def transcribe(
                 "cyan",
                 elapsed_time,
                 final_output,
+                show_panel=bool(chunk_minutes) or not stream,
+                upload=agent.client.upload_report(video_file),
+                scope=scope,
             )
-        except Exception as e:
-            logger.error(f"Error during transcription: {e}")
+    except Exception as e:
+        logger.error(f"Error during transcription: {e}")
+        console.print(f"[red]Error: {e}[/red]")
+
+
+@app.command()
+def chat(
+    video_path: str | None = typer.Argument(None, help="Path to the video file"),
+    model: str | None = typer.Option(None, help="Gemini model ID"),
+    transcode: str | None = typer.Option(
+        None,
+        "--transcode",
+        help="Upload a compact ffmpeg proxy: compact, small or tiny",
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="Analyze from this time (seconds, mm:ss or h:mm:ss)"
+    ),
+    end: str | None = typer.Option(None, "--end", help="Analyze up to this time"),
+    fps: float | None = typer.Option(
+        None, "--fps", help="Frames sampled per second (Gemini default: 1)"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=1,
+        help="Give up on a turn after this many seconds "
+        "(default: requests.timeout_seconds)",
+    ),
+    config_path: str = typer.Option(
+        "config.yaml", "--config", "-c", help="Path to config file"
+    ),
+):
+    """Chat about a video interactively; the video is uploaded only once."""
+    config = load_config(config_path)
+    clip = resolve_clip(config, start, end, fps)
+
+    video_path = resolve_arg("video_path", video_path, config.get("video_path"))
+    if not video_path:
+        console.print("[red]Error: Missing argument 'video_path'.[/red]")
+        raise typer.Exit(code=1)
+    assert video_path is not None
+
+    model = resolve_arg("model", model, config.get("model"), "gemini-3-flash")
+    assert model is not None
+
+    agent = get_agent(model, config, transcode=transcode)
+    try:
+        with (
+            job_scope(config, timeout),
+            console.status("[bold green]Uploading video..."),
+        ):
+            session = agent.client.run(
+                VideoChatSession.start(
+                    agent.client.aio, video_path, console=console, clip=clip
+                )
+            )
+        report_upload(agent.client.upload_report(session.video_file))
+    except Exception as e:
+        logger.error(f"Error starting chat: {e}")
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+    console.print(
+        "[bold]Ask questions about the video. "
+        "Type 'exit' or press Ctrl+D to quit.[/bold]"
+    )
+    total_cost = 0.0
+    while True:
+        try:
+            question = console.input("\n[bold green]You:[/bold green] ").strip()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if not question:
+            continue
+        if question.lower() in ("exit", "quit"):
+            break
+
+        def ask_turn(on_text: Callable[[str], None], question: str = question) -> Any:
+            return agent.client.run(session.ask(question, on_text=on_text))
+
+        try:
+            start_time = time.perf_counter()
+            # Each turn gets its own deadline.
+            with job_scope(config, timeout) as scope:
+                response = render_stream(
+                    f"Answer {session.turns + 1}",
+                    "green",
+                    ask_turn,
+                    clip_transform(clip),
+                )
+            elapsed_time = time.perf_counter() - start_time
+        except Exception as e:  # noqa: BLE001 - a failed turn keeps the chat open
+            logger.error(f"Error during chat: {e}")
             console.print(f"[red]Error: {e}[/red]")
+            continue
+
+        stats = UsageTracker.extract_usage(response, agent.client.model_id, scope=scope)
+        total_cost += stats.estimated_cost
+        first_token = (
+            f"first token {stats.time_to_first_token:.2f}s, "
+            if stats.time_to_first_token is not None
+            else ""
+        )
+        console.print(
+            f"[dim]{elapsed_time:.2f}s ({first_token}"
+            f"{stats.prompt_token_count:,} in / {stats.candidates_token_count:,} out, "
+            f"{stats.cached_token_count:,} cached, ${stats.estimated_cost:.4f})[/dim]"
+        )
+
+    console.print(
+        f"\n[bold]{session.turns} turn(s), estimated cost ${total_cost:.4f}[/bold]"
+    )
+
+
+def parse_tasks(tasks: str) -> list[str]:
+    task_list = [task.strip().lower() for task in tasks.split(",") if task.strip()]
+    unknown = [task for task in task_list if task not in TASK_TYPES]
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown task(s): {', '.join(unknown)}. Choose from {', '.join(TASK_TYPES)}."
+        )
+    return list(dict.fromkeys(task_list))
+
+
+async def _run_timed(coro: Any) -> tuple[Any, float, RequestScope]:
+    start_time = time.perf_counter()
+    # Tallies this task's hedges; the job's deadline still applies.
+    with request_scope() as scope:
+        result = await coro
+    return result, time.perf_counter() - start_time, scope
+
+
+@app.command()
+def analyze(
+    video_path: str | None = typer.Argument(None, help="Path to the video file"),
+    tasks: str = typer.Option(
+        "summarize,events,transcribe",
+        "--tasks",
+        "-t",
+        help="Comma-separated tasks: summarize, events, transcribe, ask",
+    ),
+    questions: list[str] | None = typer.Option(  # noqa: B008
+        None, "--question", "-q", help="Question to ask (repeatable)"
+    ),
+    model: str | None = typer.Option(None, help="Gemini model ID"),
+    output: str | None = typer.Option(
+        None, "--output", "-o", help="Directory or file stem for per-task outputs"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the local response cache"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Ignore cached answers and store fresh ones"
+    ),
+    transcode: str | None = typer.Option(
+        None,
+        "--transcode",
+        help="Upload a compact ffmpeg proxy: compact, small or tiny",
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="Analyze from this time (seconds, mm:ss or h:mm:ss)"
+    ),
+    end: str | None = typer.Option(None, "--end", help="Analyze up to this time"),
+    fps: float | None = typer.Option(
+        None, "--fps", help="Frames sampled per second (Gemini default: 1)"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=1,
+        help="Give up after this many seconds (default: requests.timeout_seconds)",
+    ),
+    config_path: str = typer.Option(
+        "config.yaml", "--config", "-c", help="Path to config file"
+    ),
+):
+    """Upload once and run several tasks concurrently on the same video."""
+    config = load_config(config_path)
+    clip = resolve_clip(config, start, end, fps)
+
+    video_path = resolve_arg("video_path", video_path, config.get("video_path"))
+    if not video_path:
+        console.print("[red]Error: Missing argument 'video_path'.[/red]")
+        raise typer.Exit(code=1)
+    assert video_path is not None
+
+    task_list = parse_tasks(tasks)
+    question_list = list(questions or [])
+    if "ask" in task_list and not question_list and config.get("question"):
+        question_list = [config["question"]]
+    if question_list and "ask" not in task_list:
+        task_list.append("ask")
+    if "ask" in task_list and not question_list:
+        console.print("[red]Error: The 'ask' task needs at least one --question.[/red]")
+        raise typer.Exit(code=1)
+
+    # One job per output: each question is its own 'ask' job.
+    jobs: list[tuple[str, str | None, str]] = []
+    for task in task_list:
+        if task == "ask":
+            for index, text in enumerate(question_list, start=1):
+                suffix = "answer" if len(question_list) == 1 else f"answer-{index}"
+                jobs.append((task, text, suffix))
+        else:
+            jobs.append((task, None, task))
+
+    model = resolve_arg("model", model, config.get("model"), "gemini-3-flash")
+    assert model is not None
+    output = resolve_arg("output", output, config.get("output"))
+
+    agent = get_agent(
+        model,
+        config,
+        use_cache=not no_cache,
+        refresh=refresh,
+        transcode=transcode,
+    )
+    try:
+        with job_scope(config, timeout):
+            start_time = time.perf_counter()
+            with console.status("[bold green]Uploading video..."):
+                video_file = agent.client.upload_video(video_path, console=console)
+            report_upload(agent.client.upload_report(video_file))
+
+            async def fan_out() -> list[Any]:
+                return await asyncio.gather(
+                    *(
+                        _run_timed(
+                            agent.run_task_async(task, video_file, question, clip=clip)
+                        )
+                        for task, question, _ in jobs
+                    ),
+                    return_exceptions=True,
+                )
+
+            with console.status(f"[bold green]Running {len(jobs)} task(s)..."):
+                results = agent.client.run(fan_out())
+            total_time = time.perf_counter() - start_time
+    except Exception as e:  # noqa: BLE001 - shown to the user
+        logger.error(f"Error during analysis: {e}")
+        console.print(f"[red]Error: {e}[/red]")
+        return
+
+    for (task, question, suffix), result in zip(jobs, results, strict=True):
+        title, style = TASK_DISPLAY[task]
+        if question:
+            title = f"{title}: {question}"
+        if isinstance(result, BaseException):
+            logger.error(f"Error during {task}: {result}")
+            console.print(f"[red]{title} failed: {result}[/red]")
+            continue
+        response, elapsed_time, task_scope = result
+        display_response(
+            response,
+            agent.client,
+            title,
+            style,
+            elapsed_time,
+            resolve_task_output_path(output, video_path, suffix),
+            scope=task_scope,
+        )
+
+    console.print(
+        f"\n[bold]Total time for {len(jobs)} task(s): {total_time:.2f}s[/bold]"
+    )
+
+
+@app.command()
+def batch(
+    source: str = typer.Argument(..., help="Directory of videos or a glob pattern"),
+    tasks: str = typer.Option(
+        "summarize",
+        "--tasks",
+        "-t",
+        help="Comma-separated tasks: summarize, events, transcribe, ask",
+    ),
+    question: str | None = typer.Option(
+        None, "--question", "-q", help="Question for the 'ask' task"
+    ),
+    model: str | None = typer.Option(None, help="Gemini model ID"),
+    output: str | None = typer.Option(
+        None, "--output", "-o", help="Directory for results"
+    ),
+    concurrency: int = typer.Option(
+        4, "--concurrency", "-j", min=1, help="Concurrent generations"
+    ),
+    upload_concurrency: int = typer.Option(
+        2, "--upload-concurrency", min=1, help="Concurrent uploads"
+    ),
+    manifest_path: str | None = typer.Option(
+        None,
+        "--manifest",
+        help="Resumable manifest (default: <output>/batch_manifest.jsonl)",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the local response cache"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Ignore cached answers and store fresh ones"
+    ),
+    transcode: str | None = typer.Option(
+        None,
+        "--transcode",
+        help="Upload a compact ffmpeg proxy: compact, small or tiny",
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="Analyze from this time (seconds, mm:ss or h:mm:ss)"
+    ),
+    end: str | None = typer.Option(None, "--end", help="Analyze up to this time"),
+    fps: float | None = typer.Option(
+        None, "--fps", help="Frames sampled per second (Gemini default: 1)"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=1,
+        help="Deadline in seconds for each upload and each task "
+        "(default: requests.timeout_seconds)",
+    ),
+    config_path: str = typer.Option(
+        "config.yaml", "--config", "-c", help="Path to config file"
+    ),
+):
+    """Process many videos with bounded concurrency; reruns skip finished items."""
+    config = load_config(config_path)
+    clip = resolve_clip(config, start, end, fps)
+
+    task_list = parse_tasks(tasks)
+    question = resolve_arg("question", question, config.get("question"))
+    if "ask" in task_list and not question:
+        console.print("[red]Error: The 'ask' task needs --question.[/red]")
+        raise typer.Exit(code=1)
+
+    output = resolve_arg("output", output, config.get("output"))
+    if not output:
+        console.print("[red]Error: Batch runs need an --output directory.[/red]")
+        raise typer.Exit(code=1)
+    assert output is not None
+
+    videos = collect_videos(source)
+    if not videos:
+        console.print(f"[red]Error: No videos found for '{source}'.[/red]")
+        raise typer.Exit(code=1)
+
+    model = resolve_arg("model", model, config.get("model"), "gemini-3-flash")
+    assert model is not None
+
+    try:
+        items = plan_batch(videos, task_list, output, question, clip)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+    manifest = BatchManifest(manifest_path or Path(output) / "batch_manifest.jsonl")
+    agent = get_agent(
+        model,
+        config,
+        use_cache=not no_cache,
+        refresh=refresh,
+        transcode=transcode,
+    )
+
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+
+    start_time = time.perf_counter()
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+    ) as progress:
+        progress_task = progress.add_task(
+            f"[cyan]{len(videos)} video(s), {len(items)} item(s)", total=len(items)
+        )
+
+        def on_item_done(item: Any, record: Any) -> None:
+            if record is not None and record.status == "failed":
+                progress.console.print(
+                    f"[red]Failed: {item.task} {Path(item.video_path).name}: "
+                    f"{record.error}[/red]"
+                )
+            progress.advance(progress_task)
+
+        summary = agent.client.run(
+            run_batch(
+                agent,
+                items,
+                manifest,
+                concurrency=concurrency,
+                upload_concurrency=upload_concurrency,
+                on_item_done=on_item_done,
+                item_timeout=timeout
+                if timeout is not None
+                else timeout_from_config(config),
+            )
+        )
+    elapsed_time = time.perf_counter() - start_time
+
+    table = Table(title="Batch Summary", show_header=True, header_style="bold magenta")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    table.add_row("Completed", f"{summary.done:,}")
+    table.add_row("Skipped (already done)", f"{summary.skipped:,}")
+    table.add_row("Failed", f"{summary.failed:,}")
+    table.add_row("Estimated Cost", f"${summary.estimated_cost:.4f}")
+    if summary.cache_hits:
+        table.add_row(
+            "Response Cache Hits",
+            f"{summary.cache_hits:,} (saved ${summary.saved_cost:.4f})",
+        )
+    table.add_row("Execution Time", f"{elapsed_time:.2f}s")
+    table.add_row("Manifest", str(manifest.path))
+    console.print(table)
+    if summary.failed:
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
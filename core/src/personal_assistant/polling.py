@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+
+def state_name(file_obj: Any) -> str | None:
+    state = getattr(file_obj, "state", None)
+    return getattr(state, "name", None)
+
+
+@dataclass
+class PollSchedule:
+    """Delay schedule for PROCESSING checks: fast at first, then backing off."""
+
+    initial_delay: float = 0.5
+    max_delay: float = 15.0
+    multiplier: float = 1.6
+    jitter: float = 0.2
+    # Files larger than this start proportionally slower (capped at max_delay),
+    # since big videos never finish within the first few fast polls.
+    size_scale_bytes: int | None = 256 * 1024**2
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> PollSchedule:
+        settings = config.get("polling") or {}
+        known = cls.__dataclass_fields__.keys()
+        return cls(**{key: value for key, value in settings.items() if key in known})
+
+    def delays(self, size_bytes: int | None = None) -> Iterator[float]:
+        delay = self.initial_delay
+        if size_bytes and self.size_scale_bytes:
+            delay *= max(1.0, size_bytes / self.size_scale_bytes)
+        while True:
+            delay = min(delay, self.max_delay)
+            spread = delay * self.jitter
+            yield max(0.0, delay + random.uniform(-spread, spread))
+            delay *= self.multiplier
+
+
+@dataclass
+class _PendingFile:
+    name: str
+    delays: Iterator[float]
+    due: float
+    waiters: list[asyncio.Future[Any]] = field(default_factory=list)
+
+
+class FileStatePoller:
+    """Shared poller that tracks many PROCESSING files with one loop.
+
+    Each file keeps its own backoff schedule, but every refresh that comes due
+    within `coalesce_window` seconds is issued together: one paged
+    `files.list` when several files are due, individual `files.get` calls
+    otherwise. The poller is bound to the event loop that first awaits it.
+    """
+
+    def __init__(
+        self,
+        files_api: Any,
+        schedule: PollSchedule | None = None,
+        list_threshold: int = 3,
+        coalesce_window: float = 0.5,
+    ) -> None:
+        self.files_api = files_api
+        self.schedule = schedule or PollSchedule()
+        self.list_threshold = list_threshold
+        self.coalesce_window = coalesce_window
+        self._pending: dict[str, _PendingFile] = {}
+        self._wakeup = asyncio.Event()
+        self._runner: asyncio.Task[None] | None = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def wait(self, file_obj: Any) -> Any:
+        """Returns the file once it has left the PROCESSING state."""
+        if state_name(file_obj) != "PROCESSING":
+            return file_obj
+        name = file_obj.name
+        if not name:
+            raise ValueError("Uploaded video missing file name")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        pending = self._pending.get(name)
+        if pending is None:
+            delays = self.schedule.delays(getattr(file_obj, "size_bytes", None))
+            pending = _PendingFile(
+                name=name, delays=delays, due=time.monotonic() + next(delays)
+            )
+            self._pending[name] = pending
+        pending.waiters.append(future)
+
+        if self._runner is None or self._runner.done():
+            self._runner = loop.create_task(self._run())
+            self._runner.add_done_callback(self._runner_done)
+        self._wakeup.set()
+        return await future
+
+    async def _run(self) -> None:
+        while self._pending:
+            next_due = min(pending.due for pending in self._pending.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=max(0.0, next_due - time.monotonic())
+                )
+                # A new file arrived; recompute the earliest due time.
+                continue
+            except TimeoutError:
+                pass
+
+            now = time.monotonic()
+            for name, pending in list(self._pending.items()):
+                if all(waiter.done() for waiter in pending.waiters):
+                    # Every caller gave up (e.g. cancelled); stop polling it.
+                    del self._pending[name]
+            horizon = now + self.coalesce_window
+            due = [p for p in self._pending.values() if p.due <= horizon]
+            if not due:
+                continue
+            try:
+                refreshed = await self._refresh([pending.name for pending in due])
+            except Exception as exc:  # noqa: BLE001 - handed to the waiters
+                # Transport errors, timeouts and malformed responses fail only
+                # the files in this refresh; the loop keeps serving the rest.
+                for pending in due:
+                    self._resolve(pending.name, error=exc)
+                continue
+
+            now = time.monotonic()
+            for pending in due:
+                file_obj = refreshed.get(pending.name)
+                if file_obj is not None and state_name(file_obj) != "PROCESSING":
+                    self._resolve(pending.name, file_obj=file_obj)
+                else:
+                    pending.due = now + next(pending.delays)
+
+    def _runner_done(self, runner: asyncio.Task[None]) -> None:
+        # Should the loop itself die, fail every waiter instead of leaving it
+        # pending forever; the next wait() starts a new runner.
+        if self._runner is runner:
+            self._runner = None
+        if not self._pending:
+            return
+        if runner.cancelled():
+            error: BaseException = RuntimeError("File state poller was stopped")
+        else:
+            error = runner.exception() or RuntimeError(
+                "File state poller exited with files pending"
+            )
+        for name in list(self._pending):
+            self._resolve(name, error=error)
+
+    def _resolve(
+        self,
+        name: str,
+        file_obj: Any | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        pending = self._pending.pop(name, None)
+        if pending is None:
+            return
+        for waiter in pending.waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(file_obj)
+
+    async def _refresh(self, names: list[str]) -> dict[str, Any]:
+        if len(names) >= self.list_threshold:
+            logger.debug(f"Refreshing {len(names)} pending files with files.list")
+            found: dict[str, Any] = {}
+            wanted = set(names)
+            pager = await self.files_api.list(config={"page_size": 100})
+            async for file_obj in pager:
+                if file_obj.name in wanted:
+                    found[file_obj.name] = file_obj
+                    if len(found) == len(wanted):
+                        break
+            missing = [name for name in names if name not in found]
+        else:
+            found = {}
+            missing = names
+
+        if missing:
+            results = await asyncio.gather(
+                *(self.files_api.get(name=name) for name in missing)
+            )
+            found.update(zip(missing, results, strict=True))
+        return found
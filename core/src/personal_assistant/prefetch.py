@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any
+
+from loguru import logger
+
+from personal_assistant.client import AsyncGeminiVideoClient
+from personal_assistant.progress import ProgressCallback
+from personal_assistant.singleflight import Fanout
+from personal_assistant.transcode import TranscodeProfile
+
+
+class SpeculativeUpload:
+    """An upload started in the background before the user asks for a task.
+
+    Tasks await `result()` instead of uploading again; every later task on
+    the same video can await it too. If the user picks another file before
+    any task asked for it, `discard()` cancels the upload or deletes the
+    remote file it produced. Once a task has asked, the upload is that
+    task's and `discard()` leaves it running.
+    """
+
+    def __init__(
+        self,
+        client: AsyncGeminiVideoClient,
+        video_path: str,
+        profile: TranscodeProfile | None = None,
+    ) -> None:
+        self.client = client
+        self.video_path = video_path
+        self.profile = profile
+        self.claimed = False
+        # Keeps the latest snapshot for a caller that starts watching late.
+        self._progress = Fanout(history=1)
+        self.task = asyncio.ensure_future(
+            client.upload_video(
+                video_path,
+                profile=profile,
+                on_progress=self._progress,
+                speculative=True,
+            )
+        )
+        self.task.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Future[Any]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.info(f"Background upload failed: {task.exception()}")
+
+    def _keep(self, task: asyncio.Future[Any]) -> None:
+        if not self.failed:
+            self.client.keep_upload(task.result())
+
+    @property
+    def failed(self) -> bool:
+        return self.task.done() and (
+            self.task.cancelled() or self.task.exception() is not None
+        )
+
+    async def result(self, on_progress: ProgressCallback | None = None) -> Any:
+        """Waits for the upload, forwarding its progress; the caller now owns it."""
+        # Claimed before the wait, so a discard meanwhile leaves it running.
+        if not self.claimed:
+            self.claimed = True
+            self.task.add_done_callback(self._keep)
+        if on_progress is not None:
+            self._progress.subscribe(on_progress)
+        try:
+            return await asyncio.shield(self.task)
+        finally:
+            if on_progress is not None:
+                self._progress.unsubscribe(on_progress)
+
+    async def discard(self) -> None:
+        """Cancels the upload, or deletes its file if no task claimed it.
+
+        A claimed upload is only detached: its task keeps the file.
+        """
+        if self.claimed:
+            return
+        if not self.task.done():
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self.task
+            return
+        if self.failed:
+            return
+        await self.client.discard_upload(self.task.result())
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import io
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class UploadProgress:
+    """A snapshot of an upload: bytes confirmed so far, rate and time left."""
+
+    sent_bytes: int
+    total_bytes: int
+    elapsed: float
+    # Bytes already on the server before this run (a resumed session).
+    resumed_bytes: int = 0
+
+    @property
+    def fraction(self) -> float:
+        if self.total_bytes <= 0:
+            return 1.0
+        return min(1.0, self.sent_bytes / self.total_bytes)
+
+    @property
+    def bytes_per_second(self) -> float | None:
+        sent = self.sent_bytes - self.resumed_bytes
+        if self.elapsed <= 0 or sent <= 0:
+            return None
+        return sent / self.elapsed
+
+    @property
+    def mb_per_second(self) -> float | None:
+        rate = self.bytes_per_second
+        return None if rate is None else rate / 1024**2
+
+    @property
+    def eta_seconds(self) -> float | None:
+        rate = self.bytes_per_second
+        if rate is None:
+            return None
+        return max(0, self.total_bytes - self.sent_bytes) / rate
+
+
+ProgressCallback = Callable[[UploadProgress], None]
+
+
+class ProgressMeter:
+    """Turns byte counts into throttled `UploadProgress` callbacks."""
+
+    def __init__(
+        self,
+        total_bytes: int,
+        callback: ProgressCallback,
+        resumed_bytes: int = 0,
+        interval: float = 0.1,
+    ) -> None:
+        self.total_bytes = total_bytes
+        self.callback = callback
+        self.resumed_bytes = resumed_bytes
+        self.interval = interval
+        self._started = time.perf_counter()
+        self._last_emit = float("-inf")
+
+    def update(self, sent_bytes: int, force: bool = False) -> None:
+        now = time.perf_counter()
+        done = sent_bytes >= self.total_bytes
+        if not (force or done) and now - self._last_emit < self.interval:
+            return
+        self._last_emit = now
+        self.callback(
+            UploadProgress(
+                sent_bytes=sent_bytes,
+                total_bytes=self.total_bytes,
+                elapsed=now - self._started,
+                resumed_bytes=self.resumed_bytes,
+            )
+        )
+
+
+class ProgressReader(io.RawIOBase):
+    """Seekable read-only wrapper that reports how much of a file was consumed.
+
+    The SDK sends each chunk before reading the next, so the position at the
+    start of a read is what has been handed to the network. Seeking back
+    (e.g. for a retry) moves the reported progress with it.
+    """
+
+    def __init__(self, handle: io.BufferedReader, meter: ProgressMeter) -> None:
+        super().__init__()
+        self._handle = handle
+        self._meter = meter
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._handle.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._handle.tell()
+
+    def read(self, size: int | None = -1) -> bytes:
+        self._meter.update(self._handle.tell())
+        return self._handle.read(size)
+
+    def readinto(self, buffer: Any) -> int:
+        self._meter.update(self._handle.tell())
+        return self._handle.readinto(buffer)
+
+
+def combine_callbacks(
+    *callbacks: ProgressCallback | None,
+) -> ProgressCallback | None:
+    active = [callback for callback in callbacks if callback is not None]
+    if not active:
+        return None
+    if len(active) == 1:
+        return active[0]
+
+    def forward(progress: UploadProgress) -> None:
+        for callback in active:
+            callback(progress)
+
+    return forward
+
+
+@contextmanager
+def rich_upload_progress(
+    console: Any, description: str = "Uploading video..."
+) -> Iterator[ProgressCallback]:
+    """Shows a determinate Rich bar with bytes, MB/s and ETA while uploading."""
+    from rich.progress import (
+        BarColumn,
+        DownloadColumn,
+        Progress,
+        TextColumn,
+        TimeRemainingColumn,
+    )
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TextColumn("{task.fields[rate]}"),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task(f"[cyan]{description}", total=None, rate="")
+
+        def update(snapshot: UploadProgress) -> None:
+            rate = snapshot.mb_per_second
+            progress.update(
+                task,
+                total=snapshot.total_bytes,
+                completed=snapshot.sent_bytes,
+                rate="" if rate is None else f"{rate:.1f} MB/s",
+            )
+
+        yield update
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from google.genai import errors, types
+from loguru import logger
+
+from personal_assistant.deadline import AttemptTimeout, DeadlineExceeded, remaining
+
+T = TypeVar("T")
+
+# Approximate input token rates at default media resolution.
+VIDEO_FRAME_TOKENS = 258
+AUDIO_TOKENS_PER_SECOND = 32
+CHARS_PER_TOKEN = 4
+# Assumed length of media whose duration the client does not know.
+UNKNOWN_MEDIA_SECONDS = 600.0
+# Quota exhaustion and model overload; both mean "slow down and try again".
+_THROTTLE_CODES = frozenset({429, 503})
+
+
+def is_throttled(exc: BaseException) -> bool:
+    return isinstance(exc, errors.APIError) and exc.code in _THROTTLE_CODES
+
+
+def _seconds(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(str(value).rstrip("s"))
+    except ValueError:
+        return None
+
+
+def retry_after(exc: errors.APIError) -> float | None:
+    """Returns the server's retry hint: a RetryInfo delay or a Retry-After header."""
+    pending: list[Any] = [exc.details]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, dict):
+            delay = _seconds(item.get("retryDelay"))
+            if delay is not None:
+                return delay
+            pending.extend(item.values())
+        elif isinstance(item, list):
+            pending.extend(item)
+    headers = getattr(exc.response, "headers", None) or {}
+    header = headers.get("retry-after")
+    if not header:
+        return None
+    delay = _seconds(header)
+    if delay is not None:
+        return delay
+    try:
+        when = email.utils.parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def media_seconds(file_obj: Any) -> float | None:
+    """Returns a processed file's duration from its Files API metadata."""
+    metadata = getattr(file_obj, "video_metadata", None) or {}
+    return _seconds(metadata.get("videoDuration") or metadata.get("video_duration"))
+
+
+def _media_tokens(
+    mime_type: str | None,
+    seconds: float | None,
+    metadata: types.VideoMetadata | None = None,
+) -> int:
+    seconds = UNKNOWN_MEDIA_SECONDS if seconds is None else seconds
+    fps = 1.0
+    if metadata is not None:
+        start = _seconds(metadata.start_offset) or 0.0
+        end = _seconds(metadata.end_offset)
+        seconds = max(0.0, (seconds if end is None else min(end, seconds)) - start)
+        fps = metadata.fps or fps
+    if (mime_type or "").startswith("audio/"):
+        return int(seconds * AUDIO_TOKENS_PER_SECOND)
+    return int(seconds * (VIDEO_FRAME_TOKENS * fps + AUDIO_TOKENS_PER_SECOND))
+
+
+def estimate_tokens(
+    contents: Any, known_seconds: Callable[[str], float | None] | None = None
+) -> int:
+    """Estimates the input tokens of a request before it is sent.
+
+    `known_seconds` maps a file URI to its duration, for parts that only
+    reference an upload. The estimate is corrected from the response's usage.
+    """
+    lookup = known_seconds or (lambda uri: None)
+    if contents is None:
+        return 0
+    if isinstance(contents, str):
+        return len(contents) // CHARS_PER_TOKEN + 1
+    if isinstance(contents, list | tuple):
+        return sum(estimate_tokens(item, known_seconds) for item in contents)
+    if isinstance(contents, types.Content):
+        return estimate_tokens(contents.parts, known_seconds)
+    if isinstance(contents, types.File):
+        seconds = media_seconds(contents)
+        if seconds is None and contents.uri:
+            seconds = lookup(contents.uri)
+        return _media_tokens(contents.mime_type, seconds)
+    if isinstance(contents, types.Part):
+        if contents.text:
+            return estimate_tokens(contents.text)
+        if contents.file_data is not None:
+            uri = contents.file_data.file_uri
+            return _media_tokens(
+                contents.file_data.mime_type,
+                lookup(uri) if uri else None,
+                contents.video_metadata,
+            )
+    return 0
+
+
+@dataclass(frozen=True)
+class ModelLimits:
+    """Client-side quota for one model; None disables that budget."""
+
+    rpm: float | None = None
+    tpm: float | None = None
+    max_concurrency: int = 8
+
+    @classmethod
+    def from_dict(cls, settings: dict[str, Any]) -> ModelLimits:
+        known = cls.__dataclass_fields__.keys()
+        return cls(**{key: value for key, value in settings.items() if key in known})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 5
+    initial_backoff: float = 2.0
+    max_backoff: float = 60.0
+
+    def delay(self, attempt: int, hint: float | None = None) -> float:
+        """Seconds before retry `attempt`, honoring a server hint when given."""
+        if hint is not None:
+            return hint * random.uniform(1.0, 1.1)
+        delay = min(self.max_backoff, self.initial_backoff * 2 ** (attempt - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RetryPolicy:
+        # Applies with rate limiting disabled too; only the budgets are off then.
+        settings = config.get("rate_limits") or {}
+        return cls(
+            max_retries=int(settings.get("max_retries", 5)),
+            initial_backoff=float(settings.get("initial_backoff", 2.0)),
+            max_backoff=float(settings.get("max_backoff", 60.0)),
+        )
+
+
+async def retry_within_deadline(  # noqa: UP047
+    attempt: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    can_retry: Callable[[], bool] = lambda: True,
+) -> T:
+    """Runs `attempt`, retrying throttled (429/503) and timed-out attempts.
+
+    Retries back off per `policy`, or wait for the server's retry delay when
+    it sends one. No retry starts if its backoff would outlast the job's
+    deadline. Only pass idempotent calls. `can_retry` is consulted before
+    each retry, e.g. to stop once a stream has shown output to the caller.
+    """
+    retries = 0
+    while True:
+        try:
+            return await attempt()
+        except (AttemptTimeout, errors.APIError) as exc:
+            if isinstance(exc, AttemptTimeout):
+                reason, hint = str(exc), None
+            elif is_throttled(exc):
+                reason = f"Gemini throttled the request ({exc.code} {exc.status})"
+                hint = retry_after(exc)
+            else:
+                raise
+            if retries >= policy.max_retries or not can_retry():
+                raise
+            retries += 1
+            delay = policy.delay(retries, hint)
+            left = remaining()
+            if left is not None and delay >= left:
+                raise DeadlineExceeded(
+                    f"No time left to retry before the deadline ({reason})"
+                ) from exc
+            logger.warning(
+                f"{reason}; retry {retries}/{policy.max_retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+class TokenBucket:
+    """A budget that refills continuously to `per_minute` units per minute."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # An oversized request waits for a full bucket rather than forever.
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        """Spends `amount`; a negative amount refunds it. The level may go negative."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+
+class AdaptiveConcurrency:
+    """AIMD cap on in-flight requests: +1 per window of successes, halved when throttled."""
+
+    def __init__(self, maximum: int, minimum: int = 1, cooldown: float = 1.0) -> None:
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.cooldown = cooldown
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._changed = asyncio.Condition()
+        self._last_decrease = float("-inf")
+
+    async def acquire(self) -> None:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, throttled: bool) -> None:
+        async with self._changed:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                # One burst of 429s is one congestion signal, not many.
+                if now - self._last_decrease >= self.cooldown:
+                    self._last_decrease = now
+                    self.limit = max(self.minimum, self.limit / 2)
+                    logger.info(f"Throttled; concurrency limit now {int(self.limit)}")
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._changed.notify_all()
+
+
+class ModelRateLimiter:
+    """Request and token budgets plus adaptive concurrency for one model."""
+
+    def __init__(self, limits: ModelLimits) -> None:
+        self.limits = limits
+        self.requests = TokenBucket(limits.rpm) if limits.rpm else None
+        self.tokens = TokenBucket(limits.tpm) if limits.tpm else None
+        self.concurrency = AdaptiveConcurrency(limits.max_concurrency)
+        self.throttled = 0
+        self._budget_lock = asyncio.Lock()
+        # Set from a server retry hint; every caller waits it out.
+        self._paused_until = 0.0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        await self.concurrency.acquire()
+        try:
+            # One waiter reserves at a time, so requests are admitted in order.
+            async with self._budget_lock:
+                while True:
+                    now = time.monotonic()
+                    wait = max(
+                        self._paused_until - now,
+                        self.requests.wait_time(1, now) if self.requests else 0.0,
+                        self.tokens.wait_time(estimated_tokens, now)
+                        if self.tokens
+                        else 0.0,
+                    )
+                    if wait <= 0:
+                        break
+                    left = remaining()
+                    if left is not None and wait >= left:
+                        raise DeadlineExceeded(
+                            f"Rate limit budget frees up in {wait:.1f}s, "
+                            f"after the deadline"
+                        )
+                    logger.debug(f"Rate limit: waiting {wait:.1f}s for budget")
+                    await asyncio.sleep(wait)
+                if self.requests:
+                    self.requests.take(1, now)
+                if self.tokens:
+                    self.tokens.take(estimated_tokens, now)
+        except BaseException:
+            await self.concurrency.release(throttled=False)
+            raise
+
+    def charge(self, estimated_tokens: int) -> None:
+        """Spends budget for a duplicate request sent outside `acquire`."""
+        now = time.monotonic()
+        if self.requests:
+            self.requests.take(1, now)
+        if self.tokens:
+            self.tokens.take(estimated_tokens, now)
+
+    async def release(
+        self,
+        estimated_tokens: int,
+        actual_tokens: int | None,
+        exc: BaseException | None = None,
+    ) -> None:
+        now = time.monotonic()
+        throttled = exc is not None and is_throttled(exc)
+        if self.tokens:
+            if throttled:
+                # Rejected requests are not billed against the token quota.
+                self.tokens.take(-estimated_tokens, now)
+            elif actual_tokens is not None:
+                self.tokens.take(actual_tokens - estimated_tokens, now)
+        if throttled:
+            assert isinstance(exc, errors.APIError)
+            self.throttled += 1
+            hint = retry_after(exc)
+            if hint is not None:
+                self._paused_until = max(self._paused_until, now + hint)
+        await self.concurrency.release(throttled)
+
+
+class RateLimiter:
+    """Client-side RPM/TPM limits per model.
+
+    Each call pre-charges its estimated input tokens and is settled with the
+    real prompt token count afterwards. Throttled calls (429/503) halve the
+    model's concurrency limit, and a server retry delay pauses every caller.
+    The limiter only admits attempts; `retry_within_deadline` retries them.
+    """
+
+    def __init__(
+        self,
+        default: ModelLimits | None = None,
+        models: dict[str, ModelLimits] | None = None,
+    ) -> None:
+        self.default = default or ModelLimits()
+        self.models = models or {}
+        self._limiters: dict[str, ModelRateLimiter] = {}
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RateLimiter | None:
+        settings = config.get("rate_limits") or {}
+        if not settings.get("enabled", True):
+            return None
+        models = {
+            name: ModelLimits.from_dict(values or {})
+            for name, values in (settings.get("models") or {}).items()
+        }
+        return cls(ModelLimits.from_dict(settings.get("default") or {}), models)
+
+    def limits_for(self, model_id: str) -> ModelLimits:
+        """Returns the most specific configured limits whose key is in `model_id`."""
+        model_id = model_id.lower()
+        matches = [key for key in self.models if key.lower() in model_id]
+        if not matches:
+            return self.default
+        return self.models[max(matches, key=len)]
+
+    def for_model(self, model_id: str) -> ModelRateLimiter:
+        limiter = self._limiters.get(model_id)
+        if limiter is None:
+            limiter = ModelRateLimiter(self.limits_for(model_id))
+            self._limiters[model_id] = limiter
+        return limiter
+
+    async def run(
+        self,
+        model_id: str,
+        estimated_tokens: int,
+        attempt: Callable[[], Awaitable[T]],
+        prompt_tokens: Callable[[T], int | None] = lambda result: None,
+    ) -> T:
+        """Runs one `attempt` within the model's budget and settles its cost."""
+        limiter = self.for_model(model_id)
+        await limiter.acquire(estimated_tokens)
+        try:
+            result = await attempt()
+        except BaseException as exc:
+            await limiter.release(estimated_tokens, None, exc)
+            raise
+        await limiter.release(estimated_tokens, prompt_tokens(result))
+        return result
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+from google import genai
+from google.genai import types
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class ClientRegistry:
+    """Process-wide pool of Gemini clients, safe to share across threads.
+
+    One `genai.Client` per API key and transport options owns the HTTP
+    connection pools, so agents, UI views and repeated CLI calls reuse warm
+    keep-alive connections instead of building a transport each time. Objects
+    layered on top (video clients per model and options) are cached by key as
+    well; switching models or per-agent settings only builds a thin wrapper
+    over the same transport.
+
+    The async transport binds its connections to the event loop it first runs
+    on; in this project that is one loop per process (the CLI's background
+    loop or Flet's).
+    """
+
+    def __init__(self, http_options: types.HttpOptionsDict | None = None) -> None:
+        self.http_options = http_options
+        # Re-entrant: factories passed to get_or_create may ask for a transport.
+        self._lock = threading.RLock()
+        self._transports: dict[tuple[str, str], genai.Client] = {}
+        self._instances: dict[Hashable, Any] = {}
+
+    def genai_client(
+        self, api_key: str, http_options: types.HttpOptionsDict | None = None
+    ) -> genai.Client:
+        """Returns the shared client (and connection pool) for an API key.
+
+        `http_options` overrides the registry's default transport options;
+        each distinct set gets its own client.
+        """
+        options = http_options if http_options is not None else self.http_options
+        key = (api_key, json.dumps(options, sort_keys=True, default=str))
+        with self._lock:
+            client = self._transports.get(key)
+            if client is None:
+                logger.debug("Creating shared Gemini transport")
+                client = genai.Client(api_key=api_key, http_options=options)
+                self._transports[key] = client
+            return client
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Returns the object cached under `key`, building it once with `factory`."""
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = factory()
+            return self._instances[key]
+
+    def clear(self) -> None:
+        """Drops every cached object and closes the sync connection pools."""
+        with self._lock:
+            transports = list(self._transports.values())
+            self._transports.clear()
+            self._instances.clear()
+        for client in transports:
+            client.close()
+
+
+client_registry = ClientRegistry()
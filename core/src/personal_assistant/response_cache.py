@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from personal_assistant.config import default_cache_dir
+from personal_assistant.usage import UsageCounts
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    usage_metadata: UsageCounts
+    model_id: str
+    created_at: float
+    cache_hit: bool = True
+    time_to_first_token: float | None = None
+
+
+def response_cache_key(
+    content_key: str,
+    model_id: str,
+    prompt: str,
+    generation_config: Mapping[str, Any] | None = None,
+) -> str:
+    payload = json.dumps(
+        {
+            "content": content_key,
+            "model": model_id,
+            "prompt": prompt,
+            "config": generation_config or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite store of generated answers with TTL and LRU eviction."""
+
+    DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+    DEFAULT_MAX_ENTRIES = 2000
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path) if path else default_cache_dir() / "responses.sqlite3"
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._initialized = False
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> ResponseCache | None:
+        settings = config.get("response_cache") or {}
+        if not settings.get("enabled", True):
+            return None
+        ttl_hours = settings.get("ttl_hours")
+        return cls(
+            path=settings.get("path"),
+            ttl_seconds=ttl_hours * 3600 if ttl_hours else cls.DEFAULT_TTL_SECONDS,
+            max_entries=settings.get("max_entries") or cls.DEFAULT_MAX_ENTRIES,
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per call keeps the cache safe to share
+        # across threads and concurrent CLI processes.
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=10)) as conn, conn:
+            if not self._initialized:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        model_id TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        usage TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_last_used "
+                    "ON responses (last_used)"
+                )
+                self._initialized = True
+            yield conn
+
+    def get(self, key: str) -> CachedResponse | None:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT model_id, text, usage, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            model_id, text, usage, created_at = row
+            if created_at + self.ttl_seconds < now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return CachedResponse(
+            text=text,
+            usage_metadata=UsageCounts(**json.loads(usage)),
+            model_id=model_id,
+            created_at=created_at,
+        )
+
+    def put(self, key: str, model_id: str, response: Any) -> None:
+        text = getattr(response, "text", None)
+        if not text:
+            return
+        usage = asdict(UsageCounts.from_response(response))
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model_id, text, usage, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_id, text, json.dumps(usage), now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        conn.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,),
+        )
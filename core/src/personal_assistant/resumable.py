@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from personal_assistant.config import default_cache_dir
+from personal_assistant.deadline import check_deadline
+from personal_assistant.progress import ProgressCallback, ProgressMeter
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+# Upload sessions are kept by the server for about a week; resume within a day.
+SESSION_MAX_AGE_SECONDS = 24 * 3600
+_TRANSIENT_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class UploadSessionExpired(Exception):
+    """The server no longer knows the upload session; start a new one."""
+
+
+@dataclass
+class UploadSession:
+    upload_url: str
+    size_bytes: int
+    mtime_ns: int
+    granularity: int
+    offset: int = 0
+    created_at: float = 0.0
+
+    def is_stale(self, size_bytes: int, mtime_ns: int, now: float) -> bool:
+        return (
+            self.size_bytes != size_bytes
+            or self.mtime_ns != mtime_ns
+            or now - self.created_at > SESSION_MAX_AGE_SECONDS
+        )
+
+
+class UploadSessionStore:
+    """Persistent map from local files to open resumable-upload sessions."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path else default_cache_dir() / "upload_sessions.json"
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, UploadSession]:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable upload sessions {self.path}: {exc}")
+            return {}
+        sessions: dict[str, UploadSession] = {}
+        for key, value in raw.items():
+            try:
+                sessions[key] = UploadSession(**value)
+            except TypeError:
+                continue
+        return sessions
+
+    def _save(self, sessions: dict[str, UploadSession]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({key: asdict(value) for key, value in sessions.items()}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> UploadSession | None:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, session: UploadSession) -> None:
+        with self._lock:
+            sessions = self._load()
+            sessions[key] = session
+            self._save(sessions)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            sessions = self._load()
+            if sessions.pop(key, None) is not None:
+                self._save(sessions)
+
+
+def _read_chunk(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        return handle.read(size)
+
+
+class ResumableUploader:
+    """Chunked Files API uploads that survive dropped connections and restarts.
+
+    The session URL and confirmed offset are persisted after every chunk, so
+    a transient failure (or a new process) resumes from the last byte the
+    server acknowledged instead of from zero.
+    """
+
+    DEFAULT_CHUNK_BYTES = 16 * 1024**2
+    # Smaller files go through the SDK's single-request upload.
+    DEFAULT_MIN_BYTES = 256 * 1024**2
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        min_bytes: int = DEFAULT_MIN_BYTES,
+        max_retries: int = 5,
+        retry_delay: float = 1.0,
+        store: UploadSessionStore | None = None,
+        timeout: float = 120.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.chunk_bytes = chunk_bytes
+        self.min_bytes = min_bytes
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.store = store or UploadSessionStore()
+        self.timeout = timeout
+        # Replaces the network, e.g. with httpx.MockTransport in tests.
+        self.transport = transport
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> ResumableUploader | None:
+        settings = config.get("resumable_upload") or {}
+        if not settings.get("enabled", True):
+            return None
+        chunk_mb = settings.get("chunk_mb")
+        min_size_mb = settings.get("min_size_mb")
+        return cls(
+            base_url=settings.get("base_url"),
+            chunk_bytes=int(chunk_mb * 1024**2)
+            if chunk_mb
+            else cls.DEFAULT_CHUNK_BYTES,
+            min_bytes=int(min_size_mb * 1024**2)
+            if min_size_mb is not None
+            else cls.DEFAULT_MIN_BYTES,
+            max_retries=int(settings.get("max_retries", 5)),
+            store=UploadSessionStore(settings.get("path")),
+        )
+
+    def _chunk_size(self, granularity: int) -> int:
+        # Every chunk but the last must be a multiple of the server granularity.
+        return max(granularity, self.chunk_bytes // granularity * granularity)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(30.0, self.retry_delay * 2 ** (attempt - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _start(
+        self,
+        http: httpx.AsyncClient,
+        size_bytes: int,
+        mime_type: str,
+        display_name: str,
+    ) -> tuple[str, int]:
+        response = await http.post(
+            f"{self.base_url}/upload/v1beta/files",
+            headers={
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(size_bytes),
+                "X-Goog-Upload-Header-Content-Type": mime_type,
+            },
+            json={"file": {"display_name": display_name}},
+        )
+        response.raise_for_status()
+        upload_url = response.headers.get("x-goog-upload-url")
+        if not upload_url:
+            raise ValueError("Upload server did not return a session URL")
+        granularity = int(
+            response.headers.get("x-goog-upload-chunk-granularity") or 256 * 1024
+        )
+        return upload_url, granularity
+
+    async def _query(self, http: httpx.AsyncClient, session: UploadSession) -> int:
+        """Returns how many bytes the server has, or raises if the session is gone."""
+        response = await http.post(
+            session.upload_url, headers={"X-Goog-Upload-Command": "query"}
+        )
+        if response.status_code in (404, 410):
+            raise UploadSessionExpired(session.upload_url)
+        response.raise_for_status()
+        if response.headers.get("x-goog-upload-status") == "final":
+            raise UploadSessionExpired(session.upload_url)
+        return int(response.headers.get("x-goog-upload-size-received") or 0)
+
+    async def _session(
+        self,
+        http: httpx.AsyncClient,
+        key: str,
+        size_bytes: int,
+        mtime_ns: int,
+        mime_type: str,
+        display_name: str,
+    ) -> UploadSession:
+        now = time.time()
+        session = await asyncio.to_thread(self.store.get, key)
+        if session is not None and not session.is_stale(size_bytes, mtime_ns, now):
+            try:
+                session.offset = await self._query(http, session)
+                logger.info(
+                    f"Resuming upload at {session.offset:,} of {size_bytes:,} bytes"
+                )
+                return session
+            except (UploadSessionExpired, httpx.HTTPError) as exc:
+                logger.info(f"Upload session is no longer usable, restarting: {exc}")
+        upload_url, granularity = await self._start(
+            http, size_bytes, mime_type, display_name
+        )
+        session = UploadSession(
+            upload_url=upload_url,
+            size_bytes=size_bytes,
+            mtime_ns=mtime_ns,
+            granularity=granularity,
+            created_at=now,
+        )
+        await asyncio.to_thread(self.store.put, key, session)
+        return session
+
+    async def upload(
+        self,
+        path: str,
+        mime_type: str,
+        display_name: str,
+        api_key: str,
+        on_progress: ProgressCallback | None = None,
+    ) -> str:
+        """Uploads `path` in chunks and returns the remote file name ('files/...').
+
+        `on_progress` is called with the confirmed offset after every chunk.
+        """
+        stat = os.stat(path)
+        size_bytes = stat.st_size
+        key = f"{os.path.abspath(path)}|{mime_type}"
+        async with httpx.AsyncClient(
+            headers={"x-goog-api-key": api_key},
+            timeout=self.timeout,
+            transport=self.transport,
+        ) as http:
+            session = await self._session(
+                http, key, size_bytes, stat.st_mtime_ns, mime_type, display_name
+            )
+            meter = (
+                ProgressMeter(size_bytes, on_progress, resumed_bytes=session.offset)
+                if on_progress is not None
+                else None
+            )
+            if meter is not None:
+                meter.update(session.offset, force=True)
+            chunk_size = self._chunk_size(session.granularity)
+            failures = 0
+            while True:
+                chunk = await asyncio.to_thread(
+                    _read_chunk, path, session.offset, chunk_size
+                )
+                last = session.offset + len(chunk) >= size_bytes
+                try:
+                    response = await http.post(
+                        session.upload_url,
+                        headers={
+                            "X-Goog-Upload-Command": "upload, finalize"
+                            if last
+                            else "upload",
+                            "X-Goog-Upload-Offset": str(session.offset),
+                        },
+                        content=chunk,
+                    )
+                    if response.status_code in _TRANSIENT_STATUS:
+                        raise httpx.HTTPStatusError(
+                            f"Upload chunk failed with {response.status_code}",
+                            request=response.request,
+                            response=response,
+                        )
+                    response.raise_for_status()
+                except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+                    status = getattr(
+                        getattr(exc, "response", None), "status_code", None
+                    )
+                    if status is not None and status not in _TRANSIENT_STATUS:
+                        raise
+                    failures += 1
+                    if failures > self.max_retries:
+                        raise
+                    delay = self._backoff(failures)
+                    # The session stays saved, so a later run resumes from here.
+                    check_deadline(delay)
+                    logger.warning(
+                        f"Upload interrupted at {session.offset:,} bytes ({exc}); "
+                        f"retry {failures}/{self.max_retries} in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    try:
+                        session.offset = await self._query(http, session)
+                    except UploadSessionExpired:
+                        # Never resumable again; a fresh session starts from zero.
+                        await asyncio.to_thread(self.store.remove, key)
+                        session = await self._session(
+                            http,
+                            key,
+                            size_bytes,
+                            stat.st_mtime_ns,
+                            mime_type,
+                            display_name,
+                        )
+                    except httpx.HTTPError:
+                        pass
+                    if meter is not None:
+                        meter.update(session.offset, force=True)
+                    continue
+
+                failures = 0
+                if last:
+                    if meter is not None:
+                        meter.update(size_bytes)
+                    await asyncio.to_thread(self.store.remove, key)
+                    remote = response.json().get("file") or {}
+                    name = remote.get("name")
+                    if not name:
+                        raise ValueError("Upload finished without a file name")
+                    return name
+                session.offset += len(chunk)
+                await asyncio.to_thread(self.store.put, key, session)
+                if meter is not None:
+                    meter.update(session.offset)
+                logger.debug(f"Uploaded {session.offset:,} of {size_bytes:,} bytes")
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from google.genai import types
+from loguru import logger
+
+from personal_assistant.client import AsyncGeminiVideoClient
+from personal_assistant.clip import VideoClip
+from personal_assistant.config import default_cache_dir
+from personal_assistant.usage import UsageCounts
+
+SEGMENT_PROMPT = (
+    "This clip is part {number} of {total} of a longer video and covers "
+    "{start} to {end} of it. Provide a concise but comprehensive summary of this "
+    "clip. Highlight the key events and their timestamps, measured from the start "
+    "of this clip (the clip starts at 00:00)."
+)
+REDUCE_PROMPT = (
+    "Below are summaries of consecutive parts of one video, in order. Their "
+    "timestamps are already relative to the start of the whole video. Merge them "
+    "into a single concise but comprehensive summary of the entire video. "
+    "Highlight the key events and keep their timestamps.\n\n{parts}"
+)
+
+# mm:ss or h:mm:ss, not part of a longer number or time.
+_TIMESTAMP = re.compile(r"(?<![\d:])(?:(\d{1,2}):)?(\d{1,3}):([0-5]\d)(?![\d:])")
+
+
+@dataclass
+class Segment:
+    index: int
+    start: float
+    end: float
+
+
+def plan_segments(duration: float, segment_count: int) -> list[Segment]:
+    """Splits [0, duration) into `segment_count` equal, contiguous windows."""
+    if duration <= 0:
+        raise ValueError("Video duration must be positive")
+    segment_count = max(1, segment_count)
+    length = duration / segment_count
+    return [
+        Segment(
+            index=index,
+            start=index * length,
+            end=duration if index == segment_count - 1 else (index + 1) * length,
+        )
+        for index in range(segment_count)
+    ]
+
+
+def format_timestamp(seconds: float) -> str:
+    total = max(0, round(seconds))
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def remap_timestamps(text: str, remap: Callable[[float], float]) -> str:
+    """Rewrites every mm:ss / h:mm:ss timestamp in `text` through `remap`."""
+
+    def replace(match: re.Match[str]) -> str:
+        hours, minutes, secs = match.groups()
+        seconds = int(hours or 0) * 3600 + int(minutes) * 60 + int(secs)
+        return format_timestamp(remap(seconds))
+
+    return _TIMESTAMP.sub(replace, text)
+
+
+def shift_timestamps(text: str, offset: float) -> str:
+    """Adds `offset` seconds to every mm:ss / h:mm:ss timestamp in `text`."""
+    if not offset:
+        return text
+    return remap_timestamps(text, lambda seconds: seconds + offset)
+
+
+def video_duration(video_file: Any, video_path: str | None = None) -> float:
+    """Returns the duration in seconds from the Files API metadata or ffprobe."""
+    metadata = getattr(video_file, "video_metadata", None) or {}
+    raw = metadata.get("videoDuration") or metadata.get("video_duration")
+    if raw:
+        return float(str(raw).rstrip("s"))
+    ffprobe = shutil.which("ffprobe")
+    if video_path and ffprobe:
+        output = subprocess.run(
+            [
+                ffprobe,
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                video_path,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        return float(output.strip())
+    raise ValueError(
+        "Could not determine the video duration (no Files API metadata and no ffprobe)"
+    )
+
+
+def clip_part(
+    video_file: Any, segment: Segment, fps: float | None = None
+) -> types.Part:
+    """Returns a video part limited to one segment via clip offsets."""
+    return VideoClip(segment.start, segment.end, fps).part(video_file)
+
+
+def plan_range(duration: float, clip: VideoClip | None) -> tuple[float, float]:
+    """Returns the (start, end) of the video range to cover, clamped to `duration`."""
+    if clip is None:
+        return 0.0, duration
+    end = duration if clip.end is None else min(clip.end, duration)
+    if end <= clip.start:
+        raise ValueError(
+            f"Clip starts at {format_timestamp(clip.start)}, after the video ends "
+            f"({format_timestamp(duration)})"
+        )
+    return clip.start, end
+
+
+class SegmentCheckpoint:
+    """JSON file of finished segment summaries, so a failed run resumes."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_job(
+        cls,
+        content_key: str,
+        model_id: str,
+        segments: list[Segment],
+        fps: float | None = None,
+    ) -> SegmentCheckpoint:
+        plan = json.dumps(
+            [content_key, model_id, SEGMENT_PROMPT, [asdict(s) for s in segments], fps]
+        )
+        digest = hashlib.sha256(plan.encode("utf-8")).hexdigest()[:32]
+        return cls(default_cache_dir() / "segments" / f"{digest}.json")
+
+    def load(self) -> dict[int, dict[str, Any]]:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {exc}")
+            return {}
+        return {int(index): value for index, value in raw.items()}
+
+    def save(self, index: int, text: str, usage: UsageCounts) -> None:
+        with self._lock:
+            done = self.load()
+            done[index] = {"text": text, "usage": asdict(usage)}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(done), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+@dataclass
+class SegmentedResponse:
+    """Merged result plus token counts summed over every request that built it."""
+
+    text: str
+    usage_metadata: UsageCounts
+    segment_texts: list[str] = field(default_factory=list)
+    resumed_segments: int = 0
+    analyzed_seconds: float | None = None
+    analyzed_fps: float | None = None
+
+
+async def summarize_segmented(
+    client: AsyncGeminiVideoClient,
+    video_file: Any,
+    segments: list[Segment],
+    concurrency: int = 4,
+    checkpoint: SegmentCheckpoint | None = None,
+    on_segment_done: Callable[[Segment], None] | None = None,
+    fps: float | None = None,
+) -> SegmentedResponse:
+    """Summarizes segments concurrently (map) and merges the results (reduce)."""
+    done = checkpoint.load() if checkpoint else {}
+    summaries: dict[int, str] = {}
+    usage = UsageCounts()
+    for segment in segments:
+        saved = done.get(segment.index)
+        if saved is not None:
+            summaries[segment.index] = saved["text"]
+            usage += UsageCounts(**saved["usage"])
+            if on_segment_done:
+                on_segment_done(segment)
+    resumed = len(summaries)
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def summarize(segment: Segment) -> None:
+        nonlocal usage
+        prompt = SEGMENT_PROMPT.format(
+            number=segment.index + 1,
+            total=len(segments),
+            start=format_timestamp(segment.start),
+            end=format_timestamp(segment.end),
+        )
+        async with slots:
+            response = await client.generate_contents(
+                [clip_part(video_file, segment, fps), prompt],
+                client.config_for(None),
+            )
+        text = shift_timestamps(response.text or "", segment.start)
+        counts = UsageCounts.from_response(response)
+        summaries[segment.index] = text
+        usage += counts
+        if checkpoint:
+            await asyncio.to_thread(checkpoint.save, segment.index, text, counts)
+        if on_segment_done:
+            on_segment_done(segment)
+
+    results = await asyncio.gather(
+        *(summarize(s) for s in segments if s.index not in summaries),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        # Finished segments are already checkpointed; a rerun only redoes these.
+        raise errors[0]
+
+    ordered = [summaries[segment.index] for segment in segments]
+    if len(ordered) == 1:
+        text = ordered[0]
+    else:
+        parts = "\n\n".join(
+            f"### Part {segment.index + 1} "
+            f"({format_timestamp(segment.start)}-{format_timestamp(segment.end)})\n"
+            f"{summary}"
+            for segment, summary in zip(segments, ordered, strict=True)
+        )
+        response = await client.generate_contents(
+            REDUCE_PROMPT.format(parts=parts), client.config_for(None)
+        )
+        text = response.text or ""
+        usage += UsageCounts.from_response(response)
+
+    if checkpoint:
+        checkpoint.clear()
+    return SegmentedResponse(
+        text=text,
+        usage_metadata=usage,
+        segment_texts=ordered,
+        resumed_segments=resumed,
+    )
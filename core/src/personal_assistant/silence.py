@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from personal_assistant.config import default_cache_dir
+from personal_assistant.fingerprint import file_fingerprint
+from personal_assistant.segmented import remap_timestamps
+from personal_assistant.transcode import AUDIO_PROFILE, ffmpeg_binary
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+_DURATION = re.compile(r"Duration:\s*(\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+
+@dataclass(frozen=True)
+class SilenceSettings:
+    """ffmpeg silencedetect thresholds for trimming dead air."""
+
+    noise_db: float = -35.0
+    min_silence_seconds: float = 2.0
+    # Audio kept on each side of a cut, so words at the edges are not clipped.
+    padding_seconds: float = 0.5
+
+    @property
+    def key(self) -> str:
+        return (
+            f"silence-n{self.noise_db:g}dB-d{self.min_silence_seconds:g}"
+            f"-p{self.padding_seconds:g}-a{AUDIO_PROFILE.audio_bitrate}"
+        )
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> SilenceSettings:
+        settings = (config or {}).get("silence_trimming") or {}
+        return cls(
+            noise_db=float(settings.get("noise_db", cls.noise_db)),
+            min_silence_seconds=float(
+                settings.get("min_silence_seconds", cls.min_silence_seconds)
+            ),
+            padding_seconds=float(settings.get("padding_seconds", cls.padding_seconds)),
+        )
+
+
+@dataclass
+class OffsetMap:
+    """Maps times in the trimmed audio back to the original recording."""
+
+    # Kept (start, end) spans of the original, in order.
+    spans: list[tuple[float, float]]
+    original_duration: float
+
+    @property
+    def kept_duration(self) -> float:
+        return sum(end - start for start, end in self.spans)
+
+    @property
+    def removed_seconds(self) -> float:
+        return max(0.0, self.original_duration - self.kept_duration)
+
+    @property
+    def removed_fraction(self) -> float:
+        if self.original_duration <= 0:
+            return 0.0
+        return self.removed_seconds / self.original_duration
+
+    def to_original(self, seconds: float) -> float:
+        elapsed = 0.0
+        for start, end in self.spans:
+            length = end - start
+            if seconds < elapsed + length:
+                return start + (seconds - elapsed)
+            elapsed += length
+        if not self.spans:
+            return seconds
+        # Past the end of the trimmed audio: keep counting from the last span.
+        return self.spans[-1][1] + (seconds - elapsed)
+
+    def remap_text(self, text: str) -> str:
+        """Rewrites the mm:ss / h:mm:ss timestamps in `text` to original time."""
+        return remap_timestamps(text, self.to_original)
+
+
+@dataclass
+class TrimResult:
+    path: str
+    offset_map: OffsetMap
+    cached: bool = False
+
+
+@dataclass
+class TrimmedResponse:
+    """A transcript with timestamps mapped back to the untrimmed recording."""
+
+    text: str
+    usage_metadata: Any = None
+    time_to_first_token: float | None = None
+    cache_hit: bool = False
+    audio_removed_fraction: float = 0.0
+
+
+def parse_silencedetect(output: str) -> tuple[list[tuple[float, float]], float | None]:
+    """Returns the (start, end) silences and the input duration from ffmpeg's log.
+
+    A silence still open at the end of the input gets `end` set to the duration.
+    """
+    duration: float | None = None
+    found = _DURATION.search(output)
+    if found:
+        hours, minutes, secs = found.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(secs)
+
+    silences: list[tuple[float, float]] = []
+    open_start: float | None = None
+    for line in output.splitlines():
+        if match := _SILENCE_START.search(line):
+            open_start = max(0.0, float(match.group(1)))
+        elif (match := _SILENCE_END.search(line)) and open_start is not None:
+            silences.append((open_start, float(match.group(1))))
+            open_start = None
+    if open_start is not None and duration is not None:
+        silences.append((open_start, duration))
+    return silences, duration
+
+
+def speech_spans(
+    duration: float, silences: list[tuple[float, float]], padding: float
+) -> list[tuple[float, float]]:
+    """Returns the spans left after cutting each silence, shrunk by `padding`."""
+    spans: list[tuple[float, float]] = []
+    cursor = 0.0
+    for start, end in silences:
+        cut_start = start + padding if start > 0 else 0.0
+        cut_end = end - padding if end < duration else duration
+        if cut_end <= cut_start:
+            continue
+        if cut_start > cursor:
+            spans.append((cursor, cut_start))
+        cursor = max(cursor, cut_end)
+    if cursor < duration:
+        spans.append((cursor, duration))
+    return spans
+
+
+def detect_silences(
+    video_path: str, settings: SilenceSettings
+) -> tuple[list[tuple[float, float]], float]:
+    """Runs ffmpeg silencedetect over the audio track of `video_path`."""
+    detect = (
+        f"silencedetect=noise={settings.noise_db:g}dB"
+        f":d={settings.min_silence_seconds:g}"
+    )
+    try:
+        completed = subprocess.run(
+            [
+                ffmpeg_binary(),
+                "-hide_banner",
+                "-nostats",
+                "-i",
+                video_path,
+                "-vn",
+                "-af",
+                detect,
+                "-f",
+                "null",
+                "-",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        raise ValueError(f"ffmpeg silencedetect failed: {exc.stderr.strip()}") from exc
+    silences, duration = parse_silencedetect(completed.stderr)
+    if duration is None:
+        raise ValueError(f"Could not read the duration of {video_path} from ffmpeg")
+    return silences, duration
+
+
+def trim_silence(
+    video_path: str,
+    settings: SilenceSettings | None = None,
+    cache_dir: str | Path | None = None,
+) -> TrimResult:
+    """Extracts the audio of `video_path` with dead air cut out.
+
+    The audio and its offset map are cached next to transcoded proxies, keyed
+    by the source hash and the settings.
+    """
+    settings = settings or SilenceSettings()
+    fingerprint = file_fingerprint(video_path)
+    directory = Path(cache_dir) if cache_dir else default_cache_dir() / "transcodes"
+    target = (
+        directory / f"{fingerprint.sha256[:32]}-{settings.key}{AUDIO_PROFILE.suffix}"
+    )
+    map_path = target.with_suffix(".json")
+
+    if target.exists() and map_path.exists():
+        try:
+            raw = json.loads(map_path.read_text(encoding="utf-8"))
+            offset_map = OffsetMap(
+                spans=[(start, end) for start, end in raw["spans"]],
+                original_duration=raw["original_duration"],
+            )
+            return TrimResult(path=str(target), offset_map=offset_map, cached=True)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning(f"Ignoring unreadable offset map {map_path}: {exc}")
+
+    logger.info(f"Detecting silence in {video_path}")
+    silences, duration = detect_silences(video_path, settings)
+    spans = speech_spans(duration, silences, settings.padding_seconds)
+    if not spans:
+        raise ValueError(f"No speech found in {video_path}; nothing to transcribe")
+    offset_map = OffsetMap(spans=spans, original_duration=duration)
+
+    selection = "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in spans)
+    directory.mkdir(parents=True, exist_ok=True)
+    partial = target.with_suffix(f".{os.getpid()}.partial{AUDIO_PROFILE.suffix}")
+    logger.info(f"Trimming {offset_map.removed_fraction:.0%} silence from {video_path}")
+    try:
+        subprocess.run(
+            [
+                ffmpeg_binary(),
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                "-i",
+                video_path,
+                "-vn",
+                "-af",
+                f"aselect='{selection}',asetpts=N/SR/TB",
+                "-ac",
+                "1",
+                "-c:a",
+                "aac",
+                "-b:a",
+                AUDIO_PROFILE.audio_bitrate,
+                str(partial),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        partial.unlink(missing_ok=True)
+        raise ValueError(f"ffmpeg failed: {exc.stderr.strip()}") from exc
+    os.replace(partial, target)
+    map_path.write_text(json.dumps(asdict(offset_map)), encoding="utf-8")
+    return TrimResult(path=str(target), offset_map=offset_map)
+
+
+def remap_response(response: Any, offset_map: OffsetMap) -> TrimmedResponse:
+    """Returns `response` with its timestamps moved back to original-video time."""
+    return TrimmedResponse(
+        text=offset_map.remap_text(response.text or ""),
+        usage_metadata=response.usage_metadata,
+        time_to_first_token=getattr(response, "time_to_first_token", None),
+        cache_hit=getattr(response, "cache_hit", False),
+        audio_removed_fraction=offset_map.removed_fraction,
+    )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class Fanout:
+    """Forwards events to every subscriber; late subscribers get a replay first.
+
+    `history` bounds the replay (e.g. 1 for progress snapshots); None keeps
+    every event, as streamed text chunks need.
+    """
+
+    def __init__(self, history: int | None = None) -> None:
+        self._listeners: list[Callable[[Any], None]] = []
+        self._history: deque[Any] = deque(maxlen=history)
+
+    def subscribe(self, listener: Callable[[Any], None]) -> None:
+        for event in self._history:
+            listener(event)
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Any], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def __call__(self, event: Any) -> None:
+        self._history.append(event)
+        for listener in list(self._listeners):
+            listener(event)
+
+
+class Holds:
+    """Counts who holds each shared result, so only the last holder frees it.
+
+    Results from one flight reach every caller that joined it, whatever
+    object the caller is. Holders that may give a result back count; any
+    other holder `keep`s it, after which it is never released.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[Hashable, int] = {}
+        self._kept: set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def hold(self, key: Hashable) -> None:
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def keep(self, key: Hashable) -> None:
+        with self._lock:
+            self._counts.pop(key, None)
+            self._kept.add(key)
+
+    def release(self, key: Hashable) -> bool:
+        """Gives back one hold; True once nobody holds or keeps the result."""
+        with self._lock:
+            count = self._counts.get(key, 0) - 1
+            if count > 0:
+                self._counts[key] = count
+                return False
+            self._counts.pop(key, None)
+            return key not in self._kept
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future[Any]
+    events: Fanout
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Collapses concurrent identical operations into one in-flight call.
+
+    A caller whose key is already in flight awaits that call's result instead
+    of starting its own; the key is dropped once the call settles, so later
+    calls run afresh (the persistent caches handle reuse over time). The work
+    keeps running while anyone still waits for it and is cancelled when the
+    last waiter is. Flights are tracked per event loop; `holds` tracks who
+    still uses each shared result across loops.
+    """
+
+    def __init__(self) -> None:
+        self._flights: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[Hashable, _Flight]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.holds = Holds()
+        self.started = 0
+        self.joined = 0
+
+    def _loop_flights(self) -> dict[Hashable, _Flight]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flights = self._flights.get(loop)
+            if flights is None:
+                flights = {}
+                self._flights[loop] = flights
+            return flights
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._loop_flights()
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[Callable[[Any], None]], Awaitable[T]],
+        listener: Callable[[Any], None] | None = None,
+        history: int | None = None,
+    ) -> T:
+        """Runs `factory(emit)` once per in-flight `key` and shares its result.
+
+        Events the work passes to `emit` reach `listener` and every other
+        caller's listener for the same flight.
+        """
+        flights = self._loop_flights()
+        flight = flights.get(key)
+        if flight is None:
+            events: Fanout = Fanout(history)
+            flight = _Flight(asyncio.ensure_future(factory(events)), events)
+            flights[key] = flight
+            started = flight
+
+            def forget(_: asyncio.Future[Any]) -> None:
+                if flights.get(key) is started:
+                    del flights[key]
+
+            flight.task.add_done_callback(forget)
+            self.started += 1
+        else:
+            self.joined += 1
+            logger.debug("Joining an identical request already in flight")
+
+        if listener is not None:
+            flight.events.subscribe(listener)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+            if listener is not None:
+                flight.events.unsubscribe(listener)
+
+
+flights = SingleFlight()
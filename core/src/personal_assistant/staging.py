@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import io
+import mimetypes
+import os
+import re
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from loguru import logger
+
+# Extensions the stdlib table misses on some platforms.
+_VIDEO_MIME_TYPES = {
+    ".mp4": "video/mp4",
+    ".m4v": "video/mp4",
+    ".mov": "video/quicktime",
+    ".mkv": "video/x-matroska",
+    ".webm": "video/webm",
+    ".avi": "video/x-msvideo",
+    ".flv": "video/x-flv",
+    ".mpg": "video/mpeg",
+    ".mpeg": "video/mpeg",
+    ".wmv": "video/x-ms-wmv",
+    ".3gp": "video/3gpp",
+}
+
+
+# Audio-only uploads (e.g. tracks extracted for transcription).
+_AUDIO_MIME_TYPES = {
+    ".aac": "audio/aac",
+    ".mp3": "audio/mp3",
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".ogg": "audio/ogg",
+}
+
+
+VIDEO_EXTENSIONS = frozenset(_VIDEO_MIME_TYPES)
+
+
+def safe_display_name(path: str) -> str:
+    """Returns the file name with non-ASCII runs replaced for use in API headers."""
+    return re.sub(r"[^\x00-\x7F]+", "_", os.path.basename(path))
+
+
+def guess_mime_type(path: str) -> str:
+    suffix = os.path.splitext(path)[1].lower()
+    mime_type = (
+        _VIDEO_MIME_TYPES.get(suffix)
+        or _AUDIO_MIME_TYPES.get(suffix)
+        or mimetypes.guess_type(path)[0]
+    )
+    if not mime_type:
+        raise ValueError(f"Could not determine MIME type for {path}")
+    return mime_type
+
+
+@contextmanager
+def ascii_alias(path: str) -> Iterator[str]:
+    """Yields an ASCII-only path to the same file without copying its content.
+
+    Tries a hardlink first and falls back to a symlink (e.g. across devices).
+    """
+    if path.isascii():
+        yield path
+        return
+
+    suffix = os.path.splitext(path)[1]
+    with tempfile.TemporaryDirectory(prefix="video-upload-") as tmp_dir:
+        alias = os.path.join(tmp_dir, f"upload{suffix}")
+        try:
+            os.link(path, alias)
+        except OSError:
+            os.symlink(os.path.abspath(path), alias)
+        logger.info(f"Staged video as zero-copy alias: {alias}")
+        yield alias
+
+
+@contextmanager
+def open_upload_stream(path: str) -> Iterator[io.BufferedReader | str]:
+    """Yields a seekable handle on the original file, or an ASCII alias path.
+
+    The upload reads straight from the source, so nothing is copied to
+    temporary storage.
+    """
+    with open(path, "rb") as handle:
+        if handle.seekable():
+            yield handle
+            return
+    with ascii_alias(path) as alias:
+        yield alias
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from personal_assistant.clip import VideoClip
+from personal_assistant.config import default_cache_dir
+from personal_assistant.fingerprint import file_fingerprint
+
+
+@dataclass(frozen=True)
+class TranscodeProfile:
+    """ffmpeg settings for a compact upload proxy."""
+
+    name: str
+    max_height: int = 720
+    max_fps: float = 5.0
+    crf: int = 30
+    preset: str = "veryfast"
+    audio_bitrate: str = "64k"
+    # Drop the video stream and upload a mono audio track only.
+    audio_only: bool = False
+
+    @property
+    def key(self) -> str:
+        """Identifies the exact settings, so edited profiles never reuse old proxies."""
+        if self.audio_only:
+            return f"{self.name}-audio-mono-a{self.audio_bitrate}"
+        return (
+            f"{self.name}-{self.max_height}p-{self.max_fps:g}fps-crf{self.crf}"
+            f"-{self.preset}-a{self.audio_bitrate}"
+        )
+
+    @property
+    def suffix(self) -> str:
+        return ".aac" if self.audio_only else ".mp4"
+
+    def ffmpeg_args(
+        self, source: str, target: str, clip: VideoClip | None = None
+    ) -> list[str]:
+        if self.audio_only:
+            return [
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                *_input_args(source, clip),
+                "-vn",
+                "-ac",
+                "1",
+                "-c:a",
+                "aac",
+                "-b:a",
+                self.audio_bitrate,
+                target,
+            ]
+        return [
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            *_input_args(source, clip),
+            # Never upscale; keep the width even for the encoder.
+            "-vf",
+            f"scale=-2:'min(ih,{self.max_height})'",
+            "-fpsmax",
+            f"{self.max_fps:g}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            self.preset,
+            "-crf",
+            str(self.crf),
+            "-c:a",
+            "aac",
+            "-b:a",
+            self.audio_bitrate,
+            "-movflags",
+            "+faststart",
+            target,
+        ]
+
+
+def _input_args(source: str, clip: VideoClip | None) -> list[str]:
+    """Returns the input arguments, seeking to and limiting to `clip` if given."""
+    if clip is None:
+        return ["-i", source]
+    args = ["-ss", f"{clip.start:.3f}", "-i", source]
+    if clip.end is not None:
+        args += ["-t", f"{clip.end - clip.start:.3f}"]
+    return args
+
+
+# Gemini samples video at about 1 fps by default, so a few fps is plenty.
+TRANSCODE_PROFILES: dict[str, TranscodeProfile] = {
+    "compact": TranscodeProfile("compact", max_height=720, max_fps=5, crf=30),
+    "small": TranscodeProfile("small", max_height=480, max_fps=2, crf=32),
+    "tiny": TranscodeProfile(
+        "tiny", max_height=360, max_fps=1, crf=34, audio_bitrate="48k"
+    ),
+    # Speech needs far less than music; 32 kbps mono AAC keeps words intelligible.
+    "audio": TranscodeProfile("audio", audio_bitrate="32k", audio_only=True),
+}
+AUDIO_PROFILE = TRANSCODE_PROFILES["audio"]
+
+
+def get_profile(name: str) -> TranscodeProfile:
+    try:
+        return TRANSCODE_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown transcode profile: {name}. "
+            f"Choose from {', '.join(TRANSCODE_PROFILES)}."
+        ) from None
+
+
+def ffmpeg_available() -> bool:
+    return bool(os.getenv("FFMPEG_BINARY") or shutil.which("ffmpeg"))
+
+
+def ffmpeg_binary() -> str:
+    binary = os.getenv("FFMPEG_BINARY") or shutil.which("ffmpeg")
+    if not binary:
+        raise ValueError(
+            "ffmpeg was not found on PATH; install it or set FFMPEG_BINARY"
+        )
+    return binary
+
+
+def transcription_profile(with_video: bool = False) -> TranscodeProfile | None:
+    """Returns the audio-only profile for transcription, or None to send the video.
+
+    Falls back to uploading the video (with a warning) when ffmpeg is missing.
+    """
+    if with_video:
+        return None
+    if not ffmpeg_available():
+        logger.warning("ffmpeg not found; uploading the full video for transcription")
+        return None
+    return AUDIO_PROFILE
+
+
+@dataclass
+class TranscodeResult:
+    path: str
+    profile: str
+    source_bytes: int
+    output_bytes: int
+    cached: bool = False
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.source_bytes - self.output_bytes)
+
+
+def transcode_video(
+    video_path: str,
+    profile: TranscodeProfile,
+    cache_dir: str | Path | None = None,
+    clip: VideoClip | None = None,
+) -> TranscodeResult:
+    """Re-encodes a video (or extracts its audio), reusing output cached by source hash.
+
+    With `clip`, only that time range is kept. Otherwise, if the proxy would
+    not be smaller than the source, the source is returned unchanged (with
+    `profile` set to 'original').
+    """
+    fingerprint = file_fingerprint(video_path)
+    directory = Path(cache_dir) if cache_dir else default_cache_dir() / "transcodes"
+    name = f"{fingerprint.sha256[:32]}-{profile.key}"
+    if clip is not None:
+        name += f"-{clip.range_key}"
+    target = directory / f"{name}{profile.suffix}"
+    source_bytes = fingerprint.size_bytes
+
+    if target.exists():
+        output_bytes = target.stat().st_size
+        cached = True
+    else:
+        directory.mkdir(parents=True, exist_ok=True)
+        partial = target.with_suffix(f".{os.getpid()}.partial{profile.suffix}")
+        logger.info(f"Transcoding {video_path} with profile '{profile.name}'")
+        try:
+            subprocess.run(
+                [
+                    ffmpeg_binary(),
+                    *profile.ffmpeg_args(video_path, str(partial), clip),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError as exc:
+            partial.unlink(missing_ok=True)
+            raise ValueError(f"ffmpeg failed: {exc.stderr.strip()}") from exc
+        os.replace(partial, target)
+        output_bytes = target.stat().st_size
+        cached = False
+
+    if clip is None and output_bytes >= source_bytes:
+        logger.info(f"Proxy is not smaller than {video_path}; uploading the original")
+        return TranscodeResult(
+            path=video_path,
+            profile="original",
+            source_bytes=source_bytes,
+            output_bytes=source_bytes,
+            cached=cached,
+        )
+    return TranscodeResult(
+        path=str(target),
+        profile=profile.name,
+        source_bytes=source_bytes,
+        output_bytes=output_bytes,
+        cached=cached,
+    )
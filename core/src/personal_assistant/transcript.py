@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from difflib import SequenceMatcher
+from typing import Any
+
+from personal_assistant.client import AsyncGeminiVideoClient
+from personal_assistant.segmented import (
+    Segment,
+    SegmentedResponse,
+    clip_part,
+    format_timestamp,
+)
+from personal_assistant.usage import UsageCounts
+
+CHUNK_PROMPT = (
+    "This clip is part {number} of {total} of a longer recording. "
+    "Transcribe the audio from this clip. "
+    "Identify different speakers and label them accordingly. "
+    "Measure timestamps from the start of this clip (the clip starts at 00:00). "
+    "Format the output strictly as followed: '[timestamp] Speaker: <content>'. "
+    "For example: '[00:15] Speaker 1: Hello world.'"
+)
+
+_LINE = re.compile(
+    r"^\s*\[(?:(\d{1,2}):)?(\d{1,3}):([0-5]\d)(?:\.\d+)?\]\s*([^:\]]{1,60}?):\s*(.*)$"
+)
+_SPEAKER_NUMBER = re.compile(r"(\d+)\s*$")
+
+
+@dataclass
+class TranscriptLine:
+    start: float
+    speaker: str
+    text: str
+
+
+def parse_transcript(text: str) -> list[TranscriptLine]:
+    """Parses '[mm:ss] Speaker: text' lines; unlabelled lines continue the previous."""
+    lines: list[TranscriptLine] = []
+    for raw in text.splitlines():
+        match = _LINE.match(raw)
+        if match:
+            hours, minutes, secs, speaker, content = match.groups()
+            start = int(hours or 0) * 3600 + int(minutes) * 60 + int(secs)
+            lines.append(TranscriptLine(start, speaker.strip(), content.strip()))
+        elif raw.strip() and lines:
+            lines[-1].text = f"{lines[-1].text} {raw.strip()}".strip()
+    return lines
+
+
+def format_transcript(lines: list[TranscriptLine]) -> str:
+    return "\n".join(
+        f"[{format_timestamp(line.start)}] {line.speaker}: {line.text}"
+        for line in lines
+    )
+
+
+def plan_windows(
+    duration: float, window_seconds: float, overlap_seconds: float
+) -> list[Segment]:
+    """Splits [0, duration) into windows that overlap their predecessor."""
+    if duration <= 0:
+        raise ValueError("Video duration must be positive")
+    if overlap_seconds >= window_seconds:
+        raise ValueError("Overlap must be shorter than the window")
+    step = window_seconds - overlap_seconds
+    windows: list[Segment] = []
+    start = 0.0
+    while True:
+        end = min(duration, start + window_seconds)
+        windows.append(Segment(index=len(windows), start=start, end=end))
+        if end >= duration:
+            return windows
+        start += step
+
+
+def _similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+
+
+def _best_match(
+    line: TranscriptLine,
+    candidates: list[TranscriptLine],
+    tolerance: float,
+    threshold: float,
+) -> TranscriptLine | None:
+    best: TranscriptLine | None = None
+    best_score = threshold
+    for candidate in candidates:
+        if abs(candidate.start - line.start) > tolerance:
+            continue
+        score = _similarity(candidate.text, line.text)
+        if score >= best_score:
+            best, best_score = candidate, score
+    return best
+
+
+def reconcile_speakers(
+    previous: list[TranscriptLine],
+    current: list[TranscriptLine],
+    overlap: tuple[float, float],
+    known_speakers: set[str],
+    tolerance: float = 5.0,
+    threshold: float = 0.6,
+) -> dict[str, str]:
+    """Maps the current chunk's speaker labels onto the previous chunk's.
+
+    Lines transcribed twice in the overlap vote for which earlier label each
+    new label corresponds to. Labels without evidence keep their name unless
+    it is already taken, in which case they get the next free 'Speaker N'.
+    """
+    start, end = overlap
+    earlier = [line for line in previous if line.start >= start - tolerance]
+    votes: dict[str, Counter[str]] = {}
+    for line in current:
+        if line.start > end + tolerance:
+            break
+        match = _best_match(line, earlier, tolerance, threshold)
+        if match is not None:
+            votes.setdefault(line.speaker, Counter())[match.speaker] += 1
+
+    mapping: dict[str, str] = {}
+    ranked = sorted(votes.items(), key=lambda item: -sum(item[1].values()))
+    for speaker, counter in ranked:
+        for target, _ in counter.most_common():
+            if target not in mapping.values():
+                mapping[speaker] = target
+                break
+
+    taken = set(known_speakers) | set(mapping.values())
+    next_number = 1 + max(
+        (
+            int(found.group(1))
+            for label in taken
+            if (found := _SPEAKER_NUMBER.search(label))
+        ),
+        default=0,
+    )
+    for line in current:
+        if line.speaker in mapping:
+            continue
+        if line.speaker not in taken:
+            mapping[line.speaker] = line.speaker
+        else:
+            mapping[line.speaker] = f"Speaker {next_number}"
+            next_number += 1
+        taken.add(mapping[line.speaker])
+    return mapping
+
+
+def stitch_transcripts(
+    chunks: list[tuple[Segment, list[TranscriptLine]]],
+    tolerance: float = 5.0,
+    duplicate_threshold: float = 0.8,
+) -> list[TranscriptLine]:
+    """Joins chunk transcripts (already on absolute time) into one transcript.
+
+    Each overlap prefers the earlier chunk before its midpoint and the later
+    chunk after it. The chunks stamp a shared utterance slightly differently,
+    so lines are deduplicated by matching text, not by which side of the
+    midpoint they fall on: a line from either chunk without a match in the
+    other is kept. Speaker labels are carried across chunks.
+    """
+    merged: list[TranscriptLine] = []
+    previous_segment: Segment | None = None
+    for segment, lines in chunks:
+        if previous_segment is None:
+            merged = list(lines)
+            previous_segment = segment
+            continue
+        overlap = (segment.start, previous_segment.end)
+        mapping = reconcile_speakers(
+            merged, lines, overlap, {line.speaker for line in merged}, tolerance
+        )
+        cut = (overlap[0] + overlap[1]) / 2
+        in_overlap = [line for line in lines if line.start <= overlap[1] + tolerance]
+        # Earlier lines past the cut survive only if the later chunk missed them.
+        kept = [
+            line
+            for line in merged
+            if line.start < cut
+            or _best_match(line, in_overlap, tolerance, duplicate_threshold) is None
+        ]
+        recent = [line for line in kept if line.start >= overlap[0] - tolerance]
+        for line in lines:
+            if (
+                line.start <= overlap[1] + tolerance
+                and _best_match(line, recent, tolerance, duplicate_threshold)
+                is not None
+            ):
+                continue
+            kept.append(replace(line, speaker=mapping[line.speaker]))
+        merged = sorted(kept, key=lambda line: line.start)
+        previous_segment = segment
+    return merged
+
+
+async def transcribe_chunked(
+    client: AsyncGeminiVideoClient,
+    video_file: Any,
+    windows: list[Segment],
+    concurrency: int = 4,
+    on_chunk_done: Callable[[Segment], None] | None = None,
+    fps: float | None = None,
+) -> SegmentedResponse:
+    """Transcribes overlapping windows concurrently and stitches the results."""
+    slots = asyncio.Semaphore(concurrency)
+    usage = UsageCounts()
+
+    async def transcribe(window: Segment) -> list[TranscriptLine]:
+        nonlocal usage
+        prompt = CHUNK_PROMPT.format(number=window.index + 1, total=len(windows))
+        async with slots:
+            response = await client.generate_contents(
+                [clip_part(video_file, window, fps), prompt],
+                client.config_for(None),
+            )
+        usage += UsageCounts.from_response(response)
+        if on_chunk_done:
+            on_chunk_done(window)
+        return [
+            replace(line, start=line.start + window.start)
+            for line in parse_transcript(response.text or "")
+        ]
+
+    chunk_lines = await asyncio.gather(*(transcribe(window) for window in windows))
+    chunks = list(zip(windows, chunk_lines, strict=True))
+    return SegmentedResponse(
+        text=format_transcript(stitch_transcripts(chunks)),
+        usage_metadata=usage,
+        segment_texts=[format_transcript(lines) for lines in chunk_lines],
+    )
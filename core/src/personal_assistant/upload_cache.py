@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from personal_assistant.config import default_cache_dir
+
+
+@dataclass
+class CachedUpload:
+    name: str
+    uri: str
+    size_bytes: int
+    mime_type: str | None = None
+    expiration_time: str | None = None
+    last_used: float = 0.0
+
+    def expires_at(self) -> datetime | None:
+        if not self.expiration_time:
+            return None
+        return datetime.fromisoformat(self.expiration_time)
+
+    def is_expired(self, margin: timedelta, now: datetime | None = None) -> bool:
+        expires_at = self.expires_at()
+        if expires_at is None:
+            return False
+        return (now or datetime.now(UTC)) + margin >= expires_at
+
+
+class UploadCache:
+    """Persistent map from local file fingerprints to uploaded Gemini files."""
+
+    # The Files API stores at most 20 GB per project and keeps files for 48 hours.
+    DEFAULT_MAX_BYTES = 20 * 1024**3
+    # Treat entries this close to expiry as gone so a task never starts on a
+    # file that disappears mid-request.
+    EXPIRY_MARGIN = timedelta(minutes=15)
+
+    def __init__(
+        self, path: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.path = Path(path) if path else default_cache_dir() / "uploads.json"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> UploadCache | None:
+        settings = config.get("upload_cache") or {}
+        if not settings.get("enabled", True):
+            return None
+        max_size_mb = settings.get("max_size_mb")
+        max_bytes = int(max_size_mb * 1024**2) if max_size_mb else cls.DEFAULT_MAX_BYTES
+        return cls(path=settings.get("path"), max_bytes=max_bytes)
+
+    def _load(self) -> dict[str, CachedUpload]:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable upload cache {self.path}: {exc}")
+            return {}
+        entries: dict[str, CachedUpload] = {}
+        for key, value in raw.items():
+            try:
+                entries[key] = CachedUpload(**value)
+            except TypeError:
+                continue
+        return entries
+
+    def _save(self, entries: dict[str, CachedUpload]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        payload = {key: asdict(entry) for key, entry in entries.items()}
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> CachedUpload | None:
+        """Returns the live entry for a fingerprint key and marks it as used."""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if entry.is_expired(self.EXPIRY_MARGIN):
+                del entries[key]
+                self._save(entries)
+                return None
+            entry.last_used = time.time()
+            self._save(entries)
+            return entry
+
+    def put(self, key: str, video_file: Any) -> list[CachedUpload]:
+        """Records an ACTIVE upload and returns entries evicted to make room."""
+        expiration = getattr(video_file, "expiration_time", None)
+        entry = CachedUpload(
+            name=video_file.name,
+            uri=video_file.uri or "",
+            size_bytes=getattr(video_file, "size_bytes", None) or 0,
+            mime_type=getattr(video_file, "mime_type", None),
+            expiration_time=expiration.isoformat() if expiration else None,
+            last_used=time.time(),
+        )
+        with self._lock:
+            entries = self._load()
+            entries[key] = entry
+            evicted = self._evict(entries, keep=key)
+            self._save(entries)
+        return evicted
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
+
+    def evict(self) -> list[CachedUpload]:
+        """Drops expired entries, then least recently used ones over the size limit."""
+        with self._lock:
+            entries = self._load()
+            evicted = self._evict(entries)
+            if evicted:
+                self._save(entries)
+        return evicted
+
+    def _evict(
+        self, entries: dict[str, CachedUpload], keep: str | None = None
+    ) -> list[CachedUpload]:
+        evicted: list[CachedUpload] = []
+        now = datetime.now(UTC)
+        for key, entry in list(entries.items()):
+            if entry.is_expired(self.EXPIRY_MARGIN, now):
+                # Expired files are already gone remotely; nothing to delete.
+                del entries[key]
+
+        total = sum(entry.size_bytes for entry in entries.values())
+        by_age = sorted(entries.items(), key=lambda item: item[1].last_used)
+        for key, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            del entries[key]
+            total -= entry.size_bytes
+            evicted.append(entry)
+        return evicted
@@ -1,4 +1,43 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class UsageCounts:
+    """Plain token counts shaped like a response's usage_metadata."""
+
+    prompt_token_count: int = 0
+    candidates_token_count: int = 0
+    total_token_count: int = 0
+    cached_content_token_count: int = 0
+
+    @classmethod
+    def from_response(cls, response: Any) -> UsageCounts:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return cls()
+        return cls(
+            prompt_token_count=getattr(usage, "prompt_token_count", 0) or 0,
+            candidates_token_count=getattr(usage, "candidates_token_count", 0) or 0,
+            total_token_count=getattr(usage, "total_token_count", 0) or 0,
+            cached_content_token_count=(
+                getattr(usage, "cached_content_token_count", 0) or 0
+            ),
+        )
+
+    def __add__(self, other: UsageCounts) -> UsageCounts:
+        return UsageCounts(
+            prompt_token_count=self.prompt_token_count + other.prompt_token_count,
+            candidates_token_count=(
+                self.candidates_token_count + other.candidates_token_count
+            ),
+            total_token_count=self.total_token_count + other.total_token_count,
+            cached_content_token_count=(
+                self.cached_content_token_count + other.cached_content_token_count
+            ),
+        )
 
 
 @dataclass
@@ -8,6 +47,31 @@ class UsageStats:
     total_token_count: int = 0
     estimated_cost: float = 0.0
     currency: str = "USD"
+    time_to_first_token: float | None = None
+    # Prompt tokens served from a Gemini cached context (included in
+    # prompt_token_count) and their share of estimated_cost at the cached rate.
+    cached_token_count: int = 0
+    cached_cost: float = 0.0
+    # True when the answer came from the local response cache. The token
+    # counts are those of the original call, which cost nothing this time;
+    # saved_cost is what the original call was estimated to cost.
+    cache_hit: bool = False
+    saved_cost: float = 0.0
+    # Share of the recording cut as silence before a transcription upload.
+    audio_removed_fraction: float = 0.0
+    # Length and sampling rate of the analyzed range when only a clip was sent.
+    analyzed_seconds: float | None = None
+    analyzed_fps: float | None = None
+    # Bytes sent and measured throughput of the run's upload; None when the
+    # upload was reused or not reported.
+    uploaded_bytes: int | None = None
+    upload_seconds: float | None = None
+    upload_mb_per_second: float | None = None
+    # Duplicate requests sent for slow calls, how many answered first, and
+    # their estimated input cost (included in estimated_cost).
+    hedged_requests: int = 0
+    hedges_won: int = 0
+    hedge_cost: float = 0.0
 
 
 class UsageTracker:
@@ -16,29 +80,37 @@ class UsageTracker:
         "gemini-3-pro-preview": {
             "input": 2.00,
             "output": 12.00,
+            "cached_input": 0.20,
         },
         "gemini-1.5-pro": {
             "input": 1.25,
             "output": 5.00,
+            "cached_input": 0.3125,
         },
         "gemini-1.5-flash": {
             "input": 0.075,
             "output": 0.30,
+            "cached_input": 0.01875,
         },
         # Fallback/Aliases
         "gemini-3-pro": {
             "input": 2.00,
             "output": 12.00,
+            "cached_input": 0.20,
         },
         "gemini-3-flash": {  # Placeholder for 3-flash if it exists/is used
             "input": 0.075,
             "output": 0.30,
+            "cached_input": 0.01875,
         },
     }
 
     @staticmethod
     def calculate_cost(
-        model_id: str, prompt_tokens: int, completion_tokens: int
+        model_id: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
     ) -> float:
         # Normalize model_id to lower case
         model_id = model_id.lower()
@@ -55,30 +127,82 @@ class UsageTracker:
             # Assuming 1.5 Pro pricing if unknown as a reasonable estimate
             pricing = UsageTracker.PRICING["gemini-1.5-pro"]
 
-        input_cost = (prompt_tokens / 1_000_000) * pricing["input"]
+        # Cached tokens are part of the prompt count but billed at the cached rate.
+        cached_tokens = min(cached_tokens, prompt_tokens)
+        input_cost = ((prompt_tokens - cached_tokens) / 1_000_000) * pricing["input"]
+        cached_cost = (cached_tokens / 1_000_000) * pricing["cached_input"]
         output_cost = (completion_tokens / 1_000_000) * pricing["output"]
 
-        return input_cost + output_cost
+        return input_cost + cached_cost + output_cost
 
     @staticmethod
-    def extract_usage(response, model_id: str) -> UsageStats:
+    def extract_usage(
+        response, model_id: str, upload: Any = None, scope: Any = None
+    ) -> UsageStats:
         """
         Extracts usage metadata from a Gemini API response object.
+        `upload` is the client's UploadReport for the video, if any; `scope`
+        is the job's RequestScope, whose hedged requests are billed on top.
         """
+        stats = UsageTracker._extract_usage(response, model_id)
+        if scope is not None and scope.hedges_fired:
+            stats.hedged_requests = scope.hedges_fired
+            stats.hedges_won = scope.hedges_won
+            stats.hedge_cost = UsageTracker.calculate_cost(
+                model_id, scope.hedge_prompt_tokens, 0
+            )
+            stats.estimated_cost += stats.hedge_cost
+        rate = getattr(upload, "bytes_per_second", None)
+        if rate is not None:
+            stats.uploaded_bytes = upload.uploaded_bytes
+            stats.upload_seconds = upload.upload_seconds
+            stats.upload_mb_per_second = rate / 1024**2
+        return stats
+
+    @staticmethod
+    def _extract_usage(response, model_id: str) -> UsageStats:
         usage_metadata = getattr(response, "usage_metadata", None)
+        time_to_first_token = getattr(response, "time_to_first_token", None)
+        cache_hit = bool(getattr(response, "cache_hit", False))
+        audio_removed_fraction = getattr(response, "audio_removed_fraction", 0.0)
+        analyzed_seconds = getattr(response, "analyzed_seconds", None)
+        analyzed_fps = getattr(response, "analyzed_fps", None)
 
         if not usage_metadata:
-            return UsageStats()
+            return UsageStats(
+                time_to_first_token=time_to_first_token,
+                cache_hit=cache_hit,
+                audio_removed_fraction=audio_removed_fraction,
+                analyzed_seconds=analyzed_seconds,
+                analyzed_fps=analyzed_fps,
+            )
 
         prompt_tokens = usage_metadata.prompt_token_count or 0
         candidates_tokens = usage_metadata.candidates_token_count or 0
         total_tokens = usage_metadata.total_token_count or 0
+        cached_tokens = getattr(usage_metadata, "cached_content_token_count", None) or 0
 
-        cost = UsageTracker.calculate_cost(model_id, prompt_tokens, candidates_tokens)
+        cost = UsageTracker.calculate_cost(
+            model_id, prompt_tokens, candidates_tokens, cached_tokens
+        )
+        cached_cost = UsageTracker.calculate_cost(
+            model_id, cached_tokens, 0, cached_tokens
+        )
+        saved_cost = 0.0
+        if cache_hit:
+            saved_cost, cost, cached_cost = cost, 0.0, 0.0
 
         return UsageStats(
             prompt_token_count=prompt_tokens,
             candidates_token_count=candidates_tokens,
             total_token_count=total_tokens,
             estimated_cost=cost,
+            time_to_first_token=time_to_first_token,
+            cached_token_count=cached_tokens,
+            cached_cost=cached_cost,
+            cache_hit=cache_hit,
+            saved_cost=saved_cost,
+            audio_removed_fraction=audio_removed_fraction,
+            analyzed_seconds=analyzed_seconds,
+            analyzed_fps=analyzed_fps,
         )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from personal_assistant.batch import collect_videos, plan_batch
+
+
+def _videos(root: Path, *names: str) -> list[str]:
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    return collect_videos(str(root / "**" / "*"))
+
+
+def _outputs(items, output_dir: Path) -> list[str]:
+    return sorted(str(Path(item.output_path).relative_to(output_dir)) for item in items)
+
+
+def test_distinct_stems_keep_plain_names(tmp_path: Path):
+    videos = _videos(tmp_path / "in", "a.mp4", "b.mov")
+    out = tmp_path / "results"
+
+    assert _outputs(plan_batch(videos, ["summarize"], str(out)), out) == [
+        "a.md",
+        "b.md",
+    ]
+
+
+def test_same_stem_in_one_folder_keeps_extension(tmp_path: Path):
+    videos = _videos(tmp_path / "in", "a.mp4", "a.mov", "b.mp4")
+    out = tmp_path / "results"
+
+    items = plan_batch(videos, ["summarize"], str(out))
+
+    assert _outputs(items, out) == ["a.mov.md", "a.mp4.md", "b.md"]
+    assert len({item.key for item in items}) == len(items)
+
+
+def test_same_name_in_subfolders_keeps_folder(tmp_path: Path):
+    videos = _videos(tmp_path / "in", "x/a.mp4", "y/a.mp4")
+    out = tmp_path / "results"
+
+    items = plan_batch(videos, ["summarize", "events"], str(out))
+
+    assert _outputs(items, out) == [
+        "x/a.mp4.events.md",
+        "x/a.mp4.summarize.md",
+        "y/a.mp4.events.md",
+        "y/a.mp4.summarize.md",
+    ]
+
+
+def test_rejects_existing_file_as_output(tmp_path: Path):
+    videos = _videos(tmp_path / "in", "a.mp4")
+    output = tmp_path / "results.md"
+    output.write_text("keep me")
+
+    with pytest.raises(ValueError, match="is a file"):
+        plan_batch(videos, ["summarize"], str(output))
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from personal_assistant.clip import VideoClip, parse_time
+from personal_assistant.segmented import plan_range
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [
+        ("2400", 2400.0),
+        ("12.5", 12.5),
+        ("40:00", 2400.0),
+        ("0:07", 7.0),
+        ("1:02:03", 3723.0),
+        ("1:02:03.25", 3723.25),
+        (" 90 ", 90.0),
+    ],
+)
+def test_parse_time(value, seconds):
+    assert parse_time(value) == seconds
+
+
+@pytest.mark.parametrize("value", ["", "abc", "-5", "1:2:3:4", "1:", ":30", "1,5"])
+def test_parse_time_rejects_invalid(value):
+    with pytest.raises(ValueError, match="Invalid time"):
+        parse_time(value)
+
+
+@pytest.mark.parametrize(
+    ("options", "message"),
+    [
+        ({"start": -1.0}, "negative"),
+        ({"start": 10.0, "end": 10.0}, "after its start"),
+        ({"start": 10.0, "end": 5.0}, "after its start"),
+        ({"fps": 0.0}, "fps"),
+        ({"fps": 30.0}, "fps"),
+    ],
+)
+def test_invalid_clip_is_rejected(options, message):
+    with pytest.raises(ValueError, match=message):
+        VideoClip(**options)
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "fps", "expected"),
+    [
+        (None, None, None, None),
+        ("1:00", None, None, VideoClip(start=60.0)),
+        (None, "2:30", None, VideoClip(end=150.0)),
+        ("10", "1:00:00", 0.5, VideoClip(10.0, 3600.0, 0.5)),
+        (None, None, 2.0, VideoClip(fps=2.0)),
+    ],
+)
+def test_clip_from_options(start, end, fps, expected):
+    assert VideoClip.from_options(start, end, fps) == expected
+
+
+def test_clip_keys_tell_ranges_and_rates_apart():
+    clips = [
+        VideoClip(),
+        VideoClip(start=60.0),
+        VideoClip(end=60.0),
+        VideoClip(fps=1.0),
+        VideoClip(60.0, 120.0, 1.0),
+    ]
+
+    assert len({clip.key for clip in clips}) == len(clips)
+    assert VideoClip(60.0, 120.0, 1.0).key == "clip=60-120s@1fps"
+    assert not VideoClip(fps=1.0).has_range
+
+
+@pytest.mark.parametrize(
+    ("clip", "duration", "seconds"),
+    [
+        (VideoClip(start=60.0), 600.0, 540.0),
+        (VideoClip(start=60.0), None, None),
+        (VideoClip(60.0, 120.0), None, 60.0),
+        # An end past the video is clamped to its duration.
+        (VideoClip(60.0, 900.0), 600.0, 540.0),
+        (VideoClip(start=700.0), 600.0, 0.0),
+    ],
+)
+def test_analyzed_seconds(clip, duration, seconds):
+    assert clip.analyzed_seconds(duration) == seconds
+
+
+def test_part_carries_offsets_unless_already_cut():
+    video = SimpleNamespace(uri="https://files.example/a", mime_type="video/mp4")
+    clip = VideoClip(60.0, 90.5, 1.0)
+
+    metadata = clip.part(video).video_metadata
+    assert (metadata.start_offset, metadata.end_offset, metadata.fps) == (
+        "60.000s",
+        "90.500s",
+        1.0,
+    )
+    cut = clip.part(video, offsets=False).video_metadata
+    assert (cut.start_offset, cut.end_offset, cut.fps) == (None, None, 1.0)
+
+
+@pytest.mark.parametrize(
+    ("clip", "bounds"),
+    [
+        (None, (0.0, 600.0)),
+        (VideoClip(start=60.0), (60.0, 600.0)),
+        (VideoClip(60.0, 900.0), (60.0, 600.0)),
+    ],
+)
+def test_plan_range(clip, bounds):
+    assert plan_range(600.0, clip) == bounds
+
+
+def test_plan_range_rejects_clip_after_the_end():
+    with pytest.raises(ValueError, match="after the video ends"):
+        plan_range(600.0, VideoClip(start=600.0))
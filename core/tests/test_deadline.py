@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import warnings
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from personal_assistant.client import AsyncGeminiVideoClient
+from personal_assistant.deadline import (
+    AttemptTimeout,
+    DeadlineExceeded,
+    bounded,
+    check_deadline,
+    remaining,
+    request_scope,
+)
+from personal_assistant.ratelimit import RetryPolicy
+
+
+def test_nested_scope_cannot_extend_outer_deadline():
+    with request_scope(1.0), request_scope(60.0):
+        left = remaining()
+        assert left is not None and left <= 1.0
+
+
+def test_nested_bounded_call_honours_outer_deadline():
+    async def main() -> None:
+        with request_scope(0.05), request_scope(60.0):
+            await bounded(asyncio.sleep(5), timeout=10.0)
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(main())
+    assert time.perf_counter() - started < 1.0
+
+
+def test_bounded_attempt_timeout_is_retryable():
+    async def main() -> None:
+        with request_scope(60.0):
+            await bounded(asyncio.sleep(5), timeout=0.05)
+
+    with pytest.raises(AttemptTimeout):
+        asyncio.run(main())
+
+
+def test_bounded_after_deadline_never_starts_the_request():
+    started = False
+
+    async def request() -> None:
+        nonlocal started
+        started = True
+
+    async def main() -> None:
+        with request_scope(0.01):
+            await asyncio.sleep(0.02)
+            with pytest.raises(DeadlineExceeded):
+                check_deadline()
+            await bounded(request())
+
+    with warnings.catch_warnings():
+        # The unstarted coroutine is closed, not left "never awaited".
+        warnings.simplefilter("error", RuntimeWarning)
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(main())
+    assert not started
+
+
+def test_bounded_without_limits_just_awaits():
+    async def main() -> str:
+        await asyncio.sleep(0)
+        return "done"
+
+    assert asyncio.run(bounded(main())) == "done"
+
+
+class StallingModels:
+    """`generate_content` that hangs on its first `stalls` calls."""
+
+    def __init__(self, stalls: int) -> None:
+        self.stalls = stalls
+        self.calls = 0
+
+    async def generate_content(self, **kwargs: Any) -> Any:
+        self.calls += 1
+        if self.calls <= self.stalls:
+            await asyncio.sleep(10)
+        return SimpleNamespace(text="answer", usage_metadata=None)
+
+
+def _client(models: StallingModels, **options: Any) -> AsyncGeminiVideoClient:
+    return AsyncGeminiVideoClient(
+        api_key="stand-in",
+        genai_client=SimpleNamespace(aio=SimpleNamespace(models=models)),  # type: ignore[arg-type]
+        attempt_timeout=0.05,
+        **options,
+    )
+
+
+def test_timed_out_attempt_is_retried_without_rate_limiter():
+    models = StallingModels(stalls=1)
+    client = _client(models, retry_policy=RetryPolicy(initial_backoff=0.01))
+    assert client.rate_limiter is None
+
+    async def main() -> Any:
+        with request_scope(5.0):
+            return await client.generate_contents("Hi")
+
+    assert asyncio.run(main()).text == "answer"
+    assert models.calls == 2
+
+
+def test_retry_never_outlasts_the_deadline():
+    models = StallingModels(stalls=1)
+    client = _client(models, retry_policy=RetryPolicy(initial_backoff=30.0))
+
+    async def main() -> Any:
+        with request_scope(1.0):
+            return await client.generate_contents("Hi")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(main())
+    assert models.calls == 1
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from personal_assistant.deadline import request_scope
+from personal_assistant.hedging import HedgePolicy, Hedger, LatencyTracker
+
+DELAY = 0.1
+MODEL = "gemini-test"
+
+
+def _hedger() -> Hedger:
+    return Hedger(HedgePolicy(initial_delay=DELAY, min_delay=0.0))
+
+
+class Attempts:
+    """Request copies with scripted latencies that note when they start and end."""
+
+    def __init__(self, *latencies: float) -> None:
+        self.latencies = list(latencies)
+        self.started: list[float] = []
+        self.cancelled: list[int] = []
+        self.origin = time.perf_counter()
+
+    async def __call__(self) -> int:
+        copy = len(self.started)
+        self.started.append(time.perf_counter() - self.origin)
+        try:
+            await asyncio.sleep(self.latencies[copy])
+        except asyncio.CancelledError:
+            self.cancelled.append(copy)
+            raise
+        return copy
+
+
+def test_fast_request_is_not_hedged():
+    attempts = Attempts(0.01)
+    hedged = []
+
+    async def main() -> int:
+        with request_scope() as scope:
+            result = await _hedger().run(
+                MODEL, attempts, on_hedge=lambda: hedged.append(1)
+            )
+            assert scope.hedges_fired == 0
+            return result
+
+    assert asyncio.run(main()) == 0
+    assert len(attempts.started) == 1
+    assert hedged == []
+
+
+def test_hedge_fires_only_after_the_delay_and_loser_is_cancelled():
+    attempts = Attempts(5.0, 0.01)
+
+    async def main() -> tuple[int, int, int, int]:
+        with request_scope() as scope:
+            result = await _hedger().run(MODEL, attempts, estimated_tokens=500)
+        await asyncio.sleep(0)
+        leftovers = len(asyncio.all_tasks()) - 1
+        return result, scope.hedges_fired, scope.hedges_won, leftovers
+
+    result, fired, won, leftovers = asyncio.run(main())
+
+    assert result == 1
+    assert (fired, won) == (1, 1)
+    assert attempts.started[1] >= DELAY
+    assert attempts.cancelled == [0]
+    assert leftovers == 0
+
+
+def test_primary_that_finishes_first_cancels_the_hedge():
+    attempts = Attempts(DELAY + 0.05, 5.0)
+
+    async def main() -> tuple[int, int]:
+        with request_scope() as scope:
+            result = await _hedger().run(MODEL, attempts)
+        return result, scope.hedges_won
+
+    assert asyncio.run(main()) == (0, 0)
+    assert attempts.cancelled == [1]
+
+
+def test_no_hedge_when_deadline_ends_first():
+    attempts = Attempts(0.2)
+
+    async def main() -> int:
+        with request_scope(DELAY / 2):
+            return await _hedger().run(MODEL, attempts)
+
+    assert asyncio.run(main()) == 0
+    assert len(attempts.started) == 1
+
+
+def test_delay_follows_observed_percentile():
+    tracker = LatencyTracker()
+    hedger = Hedger(
+        HedgePolicy(min_delay=2.0, initial_delay=60.0, min_samples=5), tracker
+    )
+    assert hedger.delay_for(MODEL) == 60.0
+
+    for seconds in (1.0, 3.0, 4.0, 5.0, 9.0):
+        tracker.record(MODEL, seconds)
+    assert hedger.delay_for(MODEL) == 9.0
+
+    fast = LatencyTracker()
+    for _ in range(5):
+        fast.record(MODEL, 0.5)
+    assert Hedger(hedger.policy, fast).delay_for(MODEL) == 2.0
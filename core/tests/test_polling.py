@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from personal_assistant.polling import FileStatePoller, PollSchedule
+
+FAST = PollSchedule(initial_delay=0.01, max_delay=0.02, multiplier=2.0, jitter=0.0)
+
+
+def _file(name: str, state: str) -> Any:
+    return SimpleNamespace(name=name, state=SimpleNamespace(name=state))
+
+
+class FakeFiles:
+    """`files.get` / `files.list` that report PROCESSING for `polls` refreshes."""
+
+    def __init__(
+        self,
+        polls: int = 2,
+        error: Exception | None = None,
+        uploaded: tuple[str, ...] = (),
+    ) -> None:
+        self.polls = polls
+        self.error = error
+        self.gets: list[str] = []
+        self.lists = 0
+        # files.list only reports files that exist, as with real uploads.
+        self._seen: dict[str, int] = dict.fromkeys(uploaded, 0)
+
+    def _state(self, name: str) -> Any:
+        self._seen[name] = self._seen.get(name, 0) + 1
+        done = self._seen[name] > self.polls
+        return _file(name, "ACTIVE" if done else "PROCESSING")
+
+    async def get(self, name: str) -> Any:
+        self.gets.append(name)
+        if self.error is not None:
+            raise self.error
+        return self._state(name)
+
+    async def list(self, config: Any) -> Any:
+        self.lists += 1
+        names = list(self._seen)
+
+        async def pager():
+            for name in names:
+                yield self._state(name)
+
+        return pager()
+
+
+def test_schedule_backs_off_to_the_cap():
+    schedule = PollSchedule(
+        initial_delay=0.5, max_delay=4.0, multiplier=2.0, jitter=0.0
+    )
+
+    delays = list(itertools.islice(schedule.delays(), 6))
+
+    assert delays == [0.5, 1.0, 2.0, 4.0, 4.0, 4.0]
+
+
+def test_schedule_starts_large_files_slower():
+    schedule = PollSchedule(initial_delay=0.5, max_delay=15.0, jitter=0.0)
+
+    first = next(schedule.delays(size_bytes=4 * schedule.size_scale_bytes))
+
+    assert first == 2.0
+
+
+def test_schedule_jitter_stays_in_range():
+    schedule = PollSchedule(initial_delay=1.0, jitter=0.2)
+
+    assert all(0.8 <= next(schedule.delays()) <= 1.2 for _ in range(50))
+
+
+def test_waiters_on_one_file_share_each_poll():
+    files = FakeFiles(polls=2)
+    poller = FileStatePoller(files, FAST, coalesce_window=0.0)
+
+    async def main() -> list[Any]:
+        processing = _file("files/a", "PROCESSING")
+        return await asyncio.gather(*(poller.wait(processing) for _ in range(4)))
+
+    results = asyncio.run(main())
+
+    assert {result.state.name for result in results} == {"ACTIVE"}
+    assert len({id(result) for result in results}) == 1
+    assert files.gets == ["files/a"] * 3
+    assert poller.pending_count == 0
+
+
+def test_many_due_files_are_refreshed_with_one_list():
+    names = [f"files/{index}" for index in range(4)]
+    files = FakeFiles(polls=0, uploaded=tuple(names))
+    poller = FileStatePoller(files, FAST, list_threshold=3, coalesce_window=0.1)
+
+    async def main() -> list[Any]:
+        return await asyncio.gather(
+            *(poller.wait(_file(name, "PROCESSING")) for name in names)
+        )
+
+    results = asyncio.run(main())
+
+    assert [result.name for result in results] == names
+    assert files.lists == 1
+    assert files.gets == []
+
+
+def test_finished_file_is_returned_without_polling():
+    files = FakeFiles()
+    poller = FileStatePoller(files, FAST)
+    active = _file("files/a", "ACTIVE")
+
+    assert asyncio.run(poller.wait(active)) is active
+    assert files.gets == []
+
+
+def test_failed_refresh_fails_every_waiter_and_leaves_none_pending():
+    files = FakeFiles(error=ConnectionError("network down"))
+    poller = FileStatePoller(files, FAST, coalesce_window=0.1)
+
+    async def main() -> list[Any]:
+        results = await asyncio.gather(
+            poller.wait(_file("files/a", "PROCESSING")),
+            poller.wait(_file("files/a", "PROCESSING")),
+            poller.wait(_file("files/b", "PROCESSING")),
+            return_exceptions=True,
+        )
+        assert poller.pending_count == 0
+        # The poller recovers: the next wait polls afresh.
+        files.error = None
+        files.polls = 0
+        results.append(await poller.wait(_file("files/c", "PROCESSING")))
+        return results
+
+    *failures, recovered = asyncio.run(main())
+
+    assert all(isinstance(failure, ConnectionError) for failure in failures)
+    assert recovered.state.name == "ACTIVE"
+
+
+def test_stopped_poller_fails_its_waiters():
+    files = FakeFiles(polls=1000)
+    poller = FileStatePoller(files, FAST)
+
+    async def main() -> None:
+        waiter = asyncio.ensure_future(poller.wait(_file("files/a", "PROCESSING")))
+        await asyncio.sleep(0.05)
+        assert poller._runner is not None
+        poller._runner.cancel()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await waiter
+        assert poller.pending_count == 0
+
+    asyncio.run(main())
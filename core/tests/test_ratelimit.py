@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from google.genai import errors
+from personal_assistant import ratelimit
+from personal_assistant.ratelimit import (
+    AdaptiveConcurrency,
+    TokenBucket,
+    is_throttled,
+    retry_after,
+)
+
+NOW = 1_000.0
+
+
+class FakeClock:
+    """Stands in for `time` inside the ratelimit module; moves only when told."""
+
+    def __init__(self, now: float = NOW) -> None:
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", fake)
+    return fake
+
+
+def _api_error(code: int, details: object = None, headers=None) -> errors.APIError:
+    response = httpx.Response(code, headers=headers or {})
+    body = {"error": {"code": code, "status": "RESOURCE_EXHAUSTED"}}
+    if details is not None:
+        body["error"]["details"] = details
+    return errors.APIError(code, body, response)
+
+
+def test_token_bucket_starts_full_then_refills_at_rate(clock: FakeClock):
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.wait_time(60, clock.now) == 0.0
+    bucket.take(60, clock.now)
+    assert bucket.wait_time(1, clock.now) == pytest.approx(1.0)
+
+    clock.advance(0.5)
+    assert bucket.wait_time(1, clock.now) == pytest.approx(0.5)
+    clock.advance(0.5)
+    assert bucket.wait_time(1, clock.now) == 0.0
+
+
+def test_token_bucket_burst_is_capped_at_capacity(clock: FakeClock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60, clock.now)
+
+    clock.advance(3600)
+    bucket.take(0, clock.now)
+
+    assert bucket.level == 60
+    # An oversized request waits for a full bucket, not forever.
+    bucket.take(60, clock.now)
+    assert bucket.wait_time(500, clock.now) == pytest.approx(60.0)
+
+
+def test_token_bucket_refund_and_overdraft(clock: FakeClock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(90, clock.now)
+    assert bucket.level == -30
+    assert bucket.wait_time(1, clock.now) == pytest.approx(31.0)
+
+    bucket.take(-90, clock.now)
+    assert bucket.level == 60
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrency_halves_once_per_burst_of_throttles(clock: FakeClock):
+    async def main() -> list[int]:
+        limits = AdaptiveConcurrency(maximum=8, cooldown=1.0)
+        seen = []
+        for _ in range(3):
+            await limits.acquire()
+            await limits.release(throttled=True)
+            seen.append(int(limits.limit))
+        clock.advance(1.0)
+        for _ in range(5):
+            await limits.acquire()
+            await limits.release(throttled=True)
+            clock.advance(1.0)
+            seen.append(int(limits.limit))
+        return seen
+
+    # One halving for the burst, then one per cooldown down to the minimum.
+    assert _run(main()) == [4, 4, 4, 2, 1, 1, 1, 1]
+
+
+def test_concurrency_recovers_about_one_slot_per_round(clock: FakeClock):
+    async def main() -> list[int]:
+        limits = AdaptiveConcurrency(maximum=8)
+        await limits.acquire()
+        await limits.release(throttled=True)
+        rounds = []
+        for _ in range(6):
+            for _ in range(int(limits.limit)):
+                await limits.acquire()
+                await limits.release(throttled=False)
+            rounds.append(int(limits.limit))
+        return rounds
+
+    # Each round of `limit` successes adds just under one slot, up to the max.
+    assert _run(main()) == [4, 5, 6, 7, 8, 8]
+
+
+def test_concurrency_blocks_at_the_limit(clock: FakeClock):
+    async def main() -> None:
+        limits = AdaptiveConcurrency(maximum=2)
+        await limits.acquire()
+        await limits.acquire()
+        waiter = asyncio.ensure_future(limits.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await limits.release(throttled=False)
+        await asyncio.wait_for(waiter, 1.0)
+        assert limits.in_flight == 2
+
+    _run(main())
+
+
+def test_retry_after_reads_retry_info():
+    details = [
+        {"@type": "type.googleapis.com/google.rpc.QuotaFailure"},
+        {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "17s"},
+    ]
+
+    assert retry_after(_api_error(429, details)) == 17.0
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [("12", 12.0), ("0.5", 0.5), ("soon", None)],
+)
+def test_retry_after_reads_header_seconds(header, expected):
+    assert retry_after(_api_error(503, headers={"Retry-After": header})) == expected
+
+
+def test_retry_after_reads_header_date(clock: FakeClock):
+    when = datetime.fromtimestamp(NOW + 30, UTC)
+    error = _api_error(429, headers={"Retry-After": format_datetime(when, True)})
+
+    assert retry_after(error) == pytest.approx(30.0)
+    clock.advance(60)
+    assert retry_after(error) == 0.0
+
+
+def test_retry_after_without_hint():
+    assert retry_after(_api_error(429)) is None
+
+
+def test_is_throttled():
+    assert is_throttled(_api_error(429))
+    assert is_throttled(_api_error(503))
+    assert not is_throttled(_api_error(400))
+    assert not is_throttled(SimpleNamespace(code=429))  # type: ignore[arg-type]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+from personal_assistant import main
+from personal_assistant.registry import ClientRegistry
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch: pytest.MonkeyPatch) -> ClientRegistry:
+    fresh = ClientRegistry()
+    monkeypatch.setattr(main, "client_registry", fresh)
+    monkeypatch.setenv("GOOGLE_API_KEY", "stand-in")
+    return fresh
+
+
+def _config(**overrides):
+    return {"upload_cache": {"enabled": False}, **overrides}
+
+
+def test_unrelated_settings_share_one_client():
+    first = main.get_agent("gemini-3-flash", _config(question="Why?", output="a/"))
+    second = main.get_agent("gemini-3-flash", _config(theme="Blue", output="b/"))
+
+    assert second.client is first.client
+
+
+def test_client_settings_vary_over_one_transport():
+    base = main.get_agent("gemini-3-flash", _config())
+    other_cache = main.get_agent(
+        "gemini-3-flash", _config(response_cache={"ttl_hours": 1})
+    )
+    other_model = main.get_agent("gemini-3-pro", _config())
+
+    assert other_cache.client is not base.client
+    assert other_model.client is not base.client
+    assert other_cache.client.aio.client is base.client.aio.client
+    assert other_model.client.aio.client is base.client.aio.client
+
+
+def test_transport_is_keyed_on_key_and_http_options(registry: ClientRegistry):
+    base = main.get_agent("gemini-3-flash", _config())
+    proxied = main.get_agent(
+        "gemini-3-flash", _config(http_options={"timeout": 60_000})
+    )
+
+    assert proxied.client.aio.client is not base.client.aio.client
+    assert registry.genai_client("stand-in") is base.client.aio.client
+    assert registry.genai_client("stand-in", {"timeout": 60_000}) is (
+        proxied.client.aio.client
+    )
+    assert registry.genai_client("other") is not base.client.aio.client
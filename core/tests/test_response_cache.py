@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from personal_assistant import response_cache
+from personal_assistant.response_cache import ResponseCache
+from personal_assistant.usage import UsageCounts, UsageTracker
+
+MODEL = "gemini-1.5-pro"
+
+
+class FakeClock:
+    """Stands in for `time` inside the response_cache module."""
+
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache, "time", fake)
+    return fake
+
+
+def _response(text: str) -> Any:
+    usage = UsageCounts(
+        prompt_token_count=1_000_000,
+        candidates_token_count=100_000,
+        total_token_count=1_100_000,
+    )
+    return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+def _cache(tmp_path: Path, **options: Any) -> ResponseCache:
+    return ResponseCache(tmp_path / "responses.sqlite3", **options)
+
+
+def _stored(cache: ResponseCache) -> set[str]:
+    with closing(sqlite3.connect(cache.path)) as conn:
+        return {key for (key,) in conn.execute("SELECT key FROM responses")}
+
+
+def test_hit_returns_the_stored_answer(tmp_path: Path, clock: FakeClock):
+    cache = _cache(tmp_path)
+    cache.put("k", MODEL, _response("answer"))
+
+    hit = cache.get("k")
+
+    assert hit is not None
+    assert (hit.text, hit.model_id, hit.cache_hit) == ("answer", MODEL, True)
+    assert hit.usage_metadata.prompt_token_count == 1_000_000
+    assert cache.get("missing") is None
+
+
+def test_entry_expires_after_ttl(tmp_path: Path, clock: FakeClock):
+    cache = _cache(tmp_path, ttl_seconds=60)
+    cache.put("k", MODEL, _response("answer"))
+
+    clock.advance(60)
+    assert cache.get("k") is not None
+    clock.advance(1)
+    assert cache.get("k") is None
+    # The expired row is deleted, not merely hidden.
+    assert _stored(cache) == set()
+
+
+def test_put_drops_expired_entries(tmp_path: Path, clock: FakeClock):
+    cache = _cache(tmp_path, ttl_seconds=60)
+    cache.put("old", MODEL, _response("old"))
+    clock.advance(120)
+    cache.put("new", MODEL, _response("new"))
+
+    assert _stored(cache) == {"new"}
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path: Path, clock: FakeClock):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.put("a", MODEL, _response("a"))
+    clock.advance(1)
+    cache.put("b", MODEL, _response("b"))
+    clock.advance(1)
+    # Reading "a" makes "b" the least recently used.
+    assert cache.get("a") is not None
+    clock.advance(1)
+    cache.put("c", MODEL, _response("c"))
+
+    assert _stored(cache) == {"a", "c"}
+
+
+def test_empty_answer_is_not_stored(tmp_path: Path, clock: FakeClock):
+    cache = _cache(tmp_path)
+    cache.put("k", MODEL, _response(""))
+
+    assert cache.get("k") is None
+
+
+def test_cache_hit_costs_nothing_and_reports_the_saving(
+    tmp_path: Path, clock: FakeClock
+):
+    cache = _cache(tmp_path)
+    original = _response("answer")
+    cache.put("k", MODEL, original)
+    hit = cache.get("k")
+
+    paid = UsageTracker.extract_usage(original, MODEL)
+    free = UsageTracker.extract_usage(hit, MODEL)
+
+    assert paid.estimated_cost == pytest.approx(1.75)
+    assert (paid.cache_hit, paid.saved_cost) == (False, 0.0)
+    assert free.cache_hit
+    assert free.estimated_cost == 0.0
+    assert free.saved_cost == pytest.approx(paid.estimated_cost)
+    assert free.prompt_token_count == paid.prompt_token_count
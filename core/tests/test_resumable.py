@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+from personal_assistant.resumable import ResumableUploader, UploadSessionStore
+
+GRANULARITY = 1024
+CHUNK = 2 * GRANULARITY
+UPLOAD_URL = "https://upload.invalid/session/1"
+
+
+class FakeUploadServer:
+    """In-memory resumable upload endpoint that can drop a chunk midway.
+
+    A dropped chunk keeps its first `GRANULARITY` bytes, as the real server
+    does with whatever arrived before the connection broke, and answers 503.
+    """
+
+    def __init__(self, fail_at: set[int] | None = None) -> None:
+        self.fail_at = set(fail_at or ())
+        self.received = bytearray()
+        self.starts = 0
+        self.upload_offsets: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        command = request.headers["x-goog-upload-command"]
+        if command == "start":
+            self.starts += 1
+            return httpx.Response(
+                200,
+                headers={
+                    "x-goog-upload-url": UPLOAD_URL,
+                    "x-goog-upload-chunk-granularity": str(GRANULARITY),
+                },
+            )
+        if command == "query":
+            return httpx.Response(
+                200,
+                headers={
+                    "x-goog-upload-status": "active",
+                    "x-goog-upload-size-received": str(len(self.received)),
+                },
+            )
+
+        offset = int(request.headers["x-goog-upload-offset"])
+        self.upload_offsets.append(offset)
+        if offset != len(self.received):
+            return httpx.Response(400)
+        if offset in self.fail_at:
+            self.fail_at.discard(offset)
+            self.received += request.content[:GRANULARITY]
+            return httpx.Response(503)
+        self.received += request.content
+        if "finalize" in command:
+            return httpx.Response(200, json={"file": {"name": "files/abc"}})
+        return httpx.Response(200)
+
+
+def _uploader(
+    server: FakeUploadServer, store_path: Path, max_retries: int = 3
+) -> ResumableUploader:
+    return ResumableUploader(
+        chunk_bytes=CHUNK,
+        min_bytes=0,
+        max_retries=max_retries,
+        retry_delay=0.0,
+        store=UploadSessionStore(store_path),
+        transport=httpx.MockTransport(server),
+    )
+
+
+@pytest.fixture
+def video(tmp_path: Path) -> Path:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(os.urandom(5 * CHUNK))
+    return path
+
+
+def _upload(uploader: ResumableUploader, path: Path) -> str:
+    return asyncio.run(uploader.upload(str(path), "video/mp4", "video", "key"))
+
+
+def test_dropped_chunk_resumes_from_server_offset(video: Path, tmp_path: Path):
+    server = FakeUploadServer(fail_at={2 * CHUNK})
+    uploader = _uploader(server, tmp_path / "sessions.json")
+
+    assert _upload(uploader, video) == "files/abc"
+
+    assert bytes(server.received) == video.read_bytes()
+    assert server.starts == 1
+    # The retry continues after the bytes the server kept, not from zero or
+    # from the start of the failed chunk.
+    resumed = 2 * CHUNK + GRANULARITY
+    assert server.upload_offsets == [
+        0,
+        CHUNK,
+        2 * CHUNK,
+        resumed,
+        resumed + CHUNK,
+        resumed + 2 * CHUNK,
+    ]
+
+
+def test_new_process_resumes_saved_session(video: Path, tmp_path: Path):
+    store_path = tmp_path / "sessions.json"
+    server = FakeUploadServer(fail_at={2 * CHUNK})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _upload(_uploader(server, store_path, max_retries=0), video)
+    assert UploadSessionStore(store_path).get(f"{video}|video/mp4") is not None
+
+    offsets_before = len(server.upload_offsets)
+    assert _upload(_uploader(server, store_path), video) == "files/abc"
+
+    assert bytes(server.received) == video.read_bytes()
+    assert server.starts == 1
+    assert server.upload_offsets[offsets_before] == 2 * CHUNK + GRANULARITY
+    assert UploadSessionStore(store_path).get(f"{video}|video/mp4") is None
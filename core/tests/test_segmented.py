@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from personal_assistant.segmented import (
+    Segment,
+    SegmentCheckpoint,
+    format_timestamp,
+    plan_segments,
+    shift_timestamps,
+    summarize_segmented,
+)
+from personal_assistant.usage import UsageCounts
+
+
+@pytest.mark.parametrize(
+    ("duration", "count", "bounds"),
+    [
+        (60.0, 1, [(0.0, 60.0)]),
+        (60.0, 3, [(0.0, 20.0), (20.0, 40.0), (40.0, 60.0)]),
+        # A zero or negative count still yields one segment.
+        (60.0, 0, [(0.0, 60.0)]),
+        # The last segment ends exactly at the duration despite rounding.
+        (10.0, 3, [(0.0, 10 / 3), (10 / 3, 20 / 3), (20 / 3, 10.0)]),
+    ],
+)
+def test_plan_segments(duration, count, bounds):
+    segments = plan_segments(duration, count)
+
+    assert [segment.index for segment in segments] == list(range(len(bounds)))
+    assert [(s.start, s.end) for s in segments] == pytest.approx(bounds)
+    assert segments[-1].end == duration
+
+
+@pytest.mark.parametrize("duration", [0.0, -5.0])
+def test_plan_segments_rejects_empty_video(duration):
+    with pytest.raises(ValueError, match="positive"):
+        plan_segments(duration, 4)
+
+
+@pytest.mark.parametrize(
+    ("seconds", "expected"),
+    [(0, "00:00"), (59.6, "01:00"), (754, "12:34"), (3723, "1:02:03"), (-3, "00:00")],
+)
+def test_format_timestamp(seconds, expected):
+    assert format_timestamp(seconds) == expected
+
+
+def test_shift_timestamps_moves_segment_times_to_video_time():
+    text = "[00:05] intro, 12:30 demo, 1:00:00 end, ratio 16:9"
+
+    assert shift_timestamps(text, 3600) == (
+        "[1:00:05] intro, 1:12:30 demo, 2:00:00 end, ratio 16:9"
+    )
+    assert shift_timestamps(text, 0) == text
+
+
+class FakeClient:
+    """`generate_contents` with a fixed answer that fails prompts containing `fail_on`."""
+
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.fail_on = fail_on
+        self.prompts: list[str] = []
+
+    def config_for(self, config: Any) -> Any:
+        return config
+
+    async def generate_contents(self, contents: Any, config: Any = None) -> Any:
+        prompt = contents[-1] if isinstance(contents, list) else contents
+        self.prompts.append(prompt)
+        if self.fail_on is not None and self.fail_on in prompt:
+            raise ConnectionError("network down")
+        usage = UsageCounts(prompt_token_count=10, candidates_token_count=1)
+        return SimpleNamespace(text="summary at 00:10", usage_metadata=usage)
+
+
+SEGMENTS = [
+    Segment(0, 0.0, 600.0),
+    Segment(1, 600.0, 1200.0),
+    Segment(2, 1200.0, 1800.0),
+]
+VIDEO = SimpleNamespace(uri="https://files.example/a", mime_type="video/mp4")
+
+
+def test_failed_run_resumes_from_its_checkpoint(tmp_path: Path):
+    checkpoint = SegmentCheckpoint(tmp_path / "job.json")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(
+            summarize_segmented(
+                FakeClient(fail_on="part 2 of 3"),
+                VIDEO,
+                SEGMENTS,
+                checkpoint=checkpoint,
+            )
+        )
+    assert sorted(checkpoint.load()) == [0, 2]
+
+    client = FakeClient()
+    result = asyncio.run(
+        summarize_segmented(client, VIDEO, SEGMENTS, checkpoint=checkpoint)
+    )
+
+    # Only the failed segment and the merge are requested again.
+    assert len(client.prompts) == 2
+    assert "part 2 of 3" in client.prompts[0]
+    assert result.resumed_segments == 2
+    assert result.segment_texts == [
+        "summary at 00:10",
+        "summary at 10:10",
+        "summary at 20:10",
+    ]
+    # Usage covers the checkpointed requests too: 3 segments and 1 merge.
+    assert result.usage_metadata.prompt_token_count == 40
+    assert not checkpoint.path.exists()
+
+
+def test_unreadable_checkpoint_starts_over(tmp_path: Path):
+    checkpoint = SegmentCheckpoint(tmp_path / "job.json")
+    checkpoint.path.write_text("{torn", encoding="utf-8")
+
+    assert checkpoint.load() == {}
+
+
+def test_checkpoint_is_keyed_on_the_plan():
+    segments = plan_segments(1800.0, 3)
+    same = SegmentCheckpoint.for_job("content", "model", segments)
+
+    assert SegmentCheckpoint.for_job("content", "model", segments).path == same.path
+    for other in (
+        SegmentCheckpoint.for_job("other", "model", segments),
+        SegmentCheckpoint.for_job("content", "model", plan_segments(1800.0, 4)),
+        SegmentCheckpoint.for_job("content", "model", segments, fps=1.0),
+    ):
+        assert other.path != same.path
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+from personal_assistant.silence import OffsetMap, parse_silencedetect, speech_spans
+
+# Trimmed from `ffmpeg -i talk.mp4 -af silencedetect=n=-35dB:d=2 -f null -`.
+SILENCEDETECT_LOG = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'talk.mp4':
+  Metadata:
+    major_brand     : isom
+  Duration: 00:01:00.50, start: 0.000000, bitrate: 1205 kb/s
+  Stream #0:1[0x2](und): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo
+[silencedetect @ 0x5581c6a3e2c0] silence_start: -0.00625
+[silencedetect @ 0x5581c6a3e2c0] silence_end: 3.2 | silence_duration: 3.20625
+[silencedetect @ 0x5581c6a3e2c0] silence_start: 20.5
+[silencedetect @ 0x5581c6a3e2c0] silence_end: 25.75 | silence_duration: 5.25
+[silencedetect @ 0x5581c6a3e2c0] silence_start: 57.1
+size=N/A time=00:01:00.50 bitrate=N/A speed= 612x
+"""
+
+
+def test_parse_silencedetect_log():
+    silences, duration = parse_silencedetect(SILENCEDETECT_LOG)
+
+    assert duration == pytest.approx(60.5)
+    # A negative start is clamped; the trailing open silence ends at the end.
+    assert silences == pytest.approx([(0.0, 3.2), (20.5, 25.75), (57.1, 60.5)])
+
+
+def test_parse_silencedetect_without_duration_drops_open_silence():
+    log = "[silencedetect @ 0x1] silence_start: 4.0\n"
+
+    assert parse_silencedetect(log) == ([], None)
+
+
+@pytest.mark.parametrize(
+    ("duration", "silences", "padding", "expected"),
+    [
+        # No silence keeps everything.
+        (30.0, [], 0.5, [(0.0, 30.0)]),
+        # Edge silences are cut flush; inner ones keep `padding` on each side.
+        (
+            60.5,
+            [(0.0, 3.2), (20.5, 25.75), (57.1, 60.5)],
+            0.5,
+            [(2.7, 21.0), (25.25, 57.6)],
+        ),
+        # A silence shorter than twice the padding cuts nothing.
+        (30.0, [(10.0, 10.8)], 0.5, [(0.0, 30.0)]),
+        # Cuts that overlap after padding merge into one.
+        (30.0, [(10.0, 14.0), (13.0, 20.0)], 0.5, [(0.0, 10.5), (19.5, 30.0)]),
+        # An all-silent input keeps nothing.
+        (30.0, [(0.0, 30.0)], 0.5, []),
+    ],
+)
+def test_speech_spans(duration, silences, padding, expected):
+    assert speech_spans(duration, silences, padding) == pytest.approx(expected)
+
+
+OFFSETS = OffsetMap(spans=[(2.0, 5.0), (10.0, 20.0)], original_duration=25.0)
+
+
+@pytest.mark.parametrize(
+    ("trimmed", "original"),
+    [
+        (0.0, 2.0),  # start of the first span
+        (1.5, 3.5),  # inside the first span
+        (3.0, 10.0),  # boundary: the second span starts where the first ends
+        (12.9, 19.9),  # inside the last span
+        (13.0, 20.0),  # end of the trimmed audio
+        (15.0, 22.0),  # past the end, counted on from the last span
+    ],
+)
+def test_offset_map_to_original(trimmed, original):
+    assert OFFSETS.to_original(trimmed) == pytest.approx(original)
+
+
+def test_offset_map_without_spans_is_identity():
+    assert OffsetMap(spans=[], original_duration=0.0).to_original(7.5) == 7.5
+
+
+def test_offset_map_remaps_transcript_timestamps():
+    text = "[00:01] Speaker 1: Hi.\n[00:04] Speaker 2: Hello."
+
+    assert OFFSETS.remap_text(text) == (
+        "[00:03] Speaker 1: Hi.\n[00:11] Speaker 2: Hello."
+    )
+
+
+def test_offset_map_totals():
+    assert OFFSETS.kept_duration == 13.0
+    assert OFFSETS.removed_seconds == 12.0
+    assert OFFSETS.removed_fraction == pytest.approx(0.48)
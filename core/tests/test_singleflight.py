@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from personal_assistant.client import AsyncGeminiVideoClient
+from personal_assistant.prefetch import SpeculativeUpload
+from personal_assistant.singleflight import SingleFlight
+
+VIEWS = 5
+
+
+class FakeGenai:
+    """Just enough of `genai.Client().aio` for uploads and generations."""
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.latency = latency
+        self.calls = {"upload": 0, "generate": 0}
+        self.deleted: list[str] = []
+        self.aio = SimpleNamespace(
+            files=SimpleNamespace(
+                upload=self._upload, get=self._get, delete=self._delete
+            ),
+            models=SimpleNamespace(generate_content=self._generate),
+        )
+
+    @staticmethod
+    def _file(name: str) -> Any:
+        return SimpleNamespace(
+            name=name,
+            uri=f"https://example.invalid/{name}",
+            state="ACTIVE",
+            mime_type="video/mp4",
+            video_metadata=None,
+        )
+
+    async def _upload(self, file: Any, config: Any) -> Any:
+        self.calls["upload"] += 1
+        await asyncio.sleep(self.latency)
+        return self._file(f"files/{self.calls['upload']}")
+
+    async def _get(self, name: str) -> Any:
+        return self._file(name)
+
+    async def _delete(self, name: str) -> None:
+        self.deleted.append(name)
+
+    async def _generate(self, model: str, contents: Any, config: Any) -> Any:
+        self.calls["generate"] += 1
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text="answer", usage_metadata=None)
+
+
+@pytest.fixture
+def video(tmp_path: Path) -> Path:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(os.urandom(64 * 1024))
+    return path
+
+
+def _client(fake: FakeGenai, flights: SingleFlight) -> AsyncGeminiVideoClient:
+    return AsyncGeminiVideoClient(
+        api_key="stand-in",
+        genai_client=fake,  # type: ignore[arg-type]
+        single_flight=flights,
+    )
+
+
+def test_concurrent_identical_uploads_and_analyses_share_one_call(video: Path):
+    fake = FakeGenai()
+    flights = SingleFlight()
+
+    async def view() -> str:
+        # Separate clients, as separate views would hold, share the flights.
+        client = _client(fake, flights)
+        video_file = await client.upload_video(str(video))
+        response = await client.analyze_video(video_file, "Summarize the video.")
+        return response.text
+
+    async def main() -> list[str]:
+        return await asyncio.gather(*(view() for _ in range(VIEWS)))
+
+    assert asyncio.run(main()) == ["answer"] * VIEWS
+    assert fake.calls == {"upload": 1, "generate": 1}
+    assert flights.started == 2
+    assert flights.joined == 2 * (VIEWS - 1)
+
+
+def test_discard_keeps_upload_another_client_was_handed(video: Path):
+    fake = FakeGenai()
+    flights = SingleFlight()
+    # E.g. views on two models: separate clients, one shared upload flight.
+    first, second = _client(fake, flights), _client(fake, flights)
+
+    async def main() -> None:
+        speculative = SpeculativeUpload(first, str(video))
+        handed, prefetched = await asyncio.gather(
+            second.upload_video(str(video)), speculative.task
+        )
+        assert handed.name == prefetched.name
+        await speculative.discard()
+
+    asyncio.run(main())
+    assert fake.calls["upload"] == 1
+    assert fake.deleted == []
+
+
+def test_last_speculative_holder_on_any_client_deletes(video: Path):
+    fake = FakeGenai()
+    flights = SingleFlight()
+    first, second = _client(fake, flights), _client(fake, flights)
+
+    async def main() -> None:
+        uploads = [SpeculativeUpload(first, str(video))]
+        uploads.append(SpeculativeUpload(second, str(video)))
+        await asyncio.gather(*(upload.task for upload in uploads))
+        await uploads[0].discard()
+        assert fake.deleted == []
+        await uploads[1].discard()
+
+    asyncio.run(main())
+    assert fake.calls["upload"] == 1
+    assert fake.deleted == ["files/1"]
+
+
+def test_failing_leader_releases_key():
+    flights = SingleFlight()
+    runs = 0
+
+    async def work(emit: Any) -> str:
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        if runs == 1:
+            raise RuntimeError("upload failed")
+        return "done"
+
+    async def main() -> list[Any]:
+        first = await asyncio.gather(
+            flights.do("key", work), flights.do("key", work), return_exceptions=True
+        )
+        assert not flights.in_flight("key")
+        return [*first, await flights.do("key", work)]
+
+    leader, follower, retry = asyncio.run(main())
+
+    # The follower shares the failure, but the next caller starts afresh.
+    assert isinstance(leader, RuntimeError)
+    assert follower is leader
+    assert retry == "done"
+    assert runs == 2
+
+
+def test_cancelled_follower_keeps_shared_work_running():
+    flights = SingleFlight()
+    runs = 0
+
+    async def work(emit: Any) -> str:
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main() -> tuple[str, bool]:
+        leader = asyncio.create_task(flights.do("key", work))
+        follower = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader, follower.cancelled()
+
+    assert asyncio.run(main()) == ("done", True)
+    assert runs == 1
+
+
+def test_last_cancelled_waiter_cancels_shared_work():
+    flights = SingleFlight()
+    finished = False
+
+    async def work(emit: Any) -> None:
+        nonlocal finished
+        await asyncio.sleep(0.05)
+        finished = True
+
+    async def main() -> None:
+        waiters = [asyncio.create_task(flights.do("key", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0.1)
+        assert not flights.in_flight("key")
+
+    asyncio.run(main())
+    assert not finished
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import pytest
+from personal_assistant.segmented import Segment
+from personal_assistant.transcript import (
+    TranscriptLine,
+    plan_windows,
+    reconcile_speakers,
+    stitch_transcripts,
+)
+
+# Two 60s windows overlapping on [50, 60]; the cut is at 55.
+FIRST = Segment(index=0, start=0.0, end=60.0)
+SECOND = Segment(index=1, start=50.0, end=110.0)
+
+
+def _line(start: float, text: str, speaker: str = "Speaker 1") -> TranscriptLine:
+    return TranscriptLine(start, speaker, text)
+
+
+def _texts(lines: list[TranscriptLine]) -> list[str]:
+    return [line.text for line in lines]
+
+
+@pytest.mark.parametrize(
+    ("duration", "window", "overlap", "expected"),
+    [
+        (50, 60, 10, [(0, 50)]),
+        (60, 60, 10, [(0, 60)]),
+        (100, 60, 10, [(0, 60), (50, 100)]),
+        (200, 60, 10, [(0, 60), (50, 110), (100, 160), (150, 200)]),
+    ],
+)
+def test_plan_windows(duration, window, overlap, expected):
+    windows = plan_windows(duration, window, overlap)
+    assert [(w.start, w.end) for w in windows] == expected
+    assert [w.index for w in windows] == list(range(len(expected)))
+
+
+@pytest.mark.parametrize(
+    ("duration", "window", "overlap"), [(0, 60, 10), (100, 60, 60), (100, 60, 90)]
+)
+def test_plan_windows_rejects_invalid(duration, window, overlap):
+    with pytest.raises(ValueError):
+        plan_windows(duration, window, overlap)
+
+
+def test_stitch_keeps_line_straddling_the_cut():
+    # Each chunk stamps the utterance on the side of the cut it drops.
+    previous = [_line(40, "Before the overlap."), _line(56, "Right at the cut.")]
+    current = [_line(54, "Right at the cut."), _line(70, "After the overlap.")]
+
+    merged = stitch_transcripts([(FIRST, previous), (SECOND, current)])
+
+    assert _texts(merged) == [
+        "Before the overlap.",
+        "Right at the cut.",
+        "After the overlap.",
+    ]
+
+
+def test_stitch_drops_exact_duplicate():
+    previous = [_line(40, "Hello there."), _line(52, "Shared line.")]
+    current = [_line(52, "Shared line."), _line(58, "Later one."), _line(80, "End.")]
+
+    merged = stitch_transcripts([(FIRST, previous), (SECOND, current)])
+
+    assert _texts(merged) == ["Hello there.", "Shared line.", "Later one.", "End."]
+
+
+def test_stitch_drops_jittered_duplicate():
+    previous = [_line(51, "We should ship it on Friday."), _line(57, "Agreed!")]
+    current = [
+        _line(53, "We should ship it on friday"),
+        _line(58, "Agreed."),
+        _line(90, "Next topic."),
+    ]
+
+    merged = stitch_transcripts([(FIRST, previous), (SECOND, current)])
+
+    assert [(line.start, line.text) for line in merged] == [
+        (51, "We should ship it on Friday."),
+        (58, "Agreed."),
+        (90, "Next topic."),
+    ]
+
+
+def test_stitch_keeps_earlier_line_the_later_chunk_missed():
+    previous = [_line(57, "Only the first chunk heard this.")]
+    current = [_line(75, "Something else entirely.")]
+
+    merged = stitch_transcripts([(FIRST, previous), (SECOND, current)])
+
+    assert _texts(merged) == [
+        "Only the first chunk heard this.",
+        "Something else entirely.",
+    ]
+
+
+def test_stitch_carries_speaker_labels_across_chunks():
+    previous = [_line(52, "I think so.", "Speaker 2")]
+    current = [
+        _line(52, "I think so.", "Speaker 1"),
+        _line(70, "Then let's go.", "Speaker 1"),
+    ]
+
+    merged = stitch_transcripts([(FIRST, previous), (SECOND, current)])
+
+    assert [line.speaker for line in merged] == ["Speaker 2", "Speaker 2"]
+
+
+def test_reconcile_speakers_follows_overlap_votes():
+    previous = [
+        _line(51, "Good morning everyone.", "Speaker 1"),
+        _line(54, "Morning! Shall we start?", "Speaker 2"),
+    ]
+    current = [
+        _line(51, "Good morning everyone.", "Speaker 2"),
+        _line(54, "Morning! Shall we start?", "Speaker 1"),
+        _line(80, "A new voice joins.", "Speaker 3"),
+    ]
+
+    mapping = reconcile_speakers(
+        previous, current, (50, 60), {"Speaker 1", "Speaker 2"}
+    )
+
+    assert mapping == {
+        "Speaker 2": "Speaker 1",
+        "Speaker 1": "Speaker 2",
+        "Speaker 3": "Speaker 3",
+    }
+
+
+def test_reconcile_speakers_renames_unmatched_label_that_is_taken():
+    previous = [_line(20, "Earlier talk.", "Speaker 1")]
+    current = [_line(80, "Someone new.", "Speaker 1")]
+
+    mapping = reconcile_speakers(previous, current, (50, 60), {"Speaker 1"})
+
+    assert mapping == {"Speaker 1": "Speaker 2"}
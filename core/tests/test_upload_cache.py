@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+from google.genai import errors
+from personal_assistant.client import AsyncGeminiVideoClient
+from personal_assistant.upload_cache import UploadCache
+
+MB = 1024**2
+
+
+def _remote(
+    name: str,
+    state: str = "ACTIVE",
+    size_bytes: int = MB,
+    expires_in: timedelta | None = timedelta(hours=47),
+) -> Any:
+    return SimpleNamespace(
+        name=name,
+        uri=f"https://files.example/{name}",
+        size_bytes=size_bytes,
+        mime_type="video/mp4",
+        expiration_time=datetime.now(UTC) + expires_in if expires_in else None,
+        state=SimpleNamespace(name=state),
+    )
+
+
+class FakeFiles:
+    """`files.get` / `files.delete` over a fixed set of remote files."""
+
+    def __init__(self, *remote: Any) -> None:
+        self.remote = {file.name: file for file in remote}
+        self.gets: list[str] = []
+        self.deleted: list[str] = []
+
+    async def get(self, name: str) -> Any:
+        self.gets.append(name)
+        if name not in self.remote:
+            response = httpx.Response(404)
+            raise errors.ClientError(404, {"error": {"code": 404}}, response)
+        return self.remote[name]
+
+    async def delete(self, name: str) -> None:
+        self.deleted.append(name)
+
+
+def _client(cache: UploadCache, files: FakeFiles) -> AsyncGeminiVideoClient:
+    return AsyncGeminiVideoClient(
+        api_key="stand-in",
+        genai_client=SimpleNamespace(aio=SimpleNamespace(files=files)),  # type: ignore[arg-type]
+        upload_cache=cache,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> UploadCache:
+    return UploadCache(tmp_path / "uploads.json", max_bytes=2 * MB)
+
+
+def test_get_drops_entries_close_to_expiry(cache: UploadCache):
+    cache.put("live", _remote("files/live"))
+    cache.put("stale", _remote("files/stale", expires_in=timedelta(minutes=5)))
+    cache.put("forever", _remote("files/forever", expires_in=None))
+
+    assert cache.get("stale") is None
+    assert cache.get("live") is not None
+    assert cache.get("forever") is not None
+    assert set(cache._load()) == {"live", "forever"}
+
+
+def test_put_evicts_least_recently_used_over_the_size_limit(cache: UploadCache):
+    assert cache.put("a", _remote("files/a")) == []
+    assert cache.put("b", _remote("files/b")) == []
+    # Using "a" leaves "b" as the least recently used.
+    assert cache.get("a") is not None
+
+    evicted = cache.put("c", _remote("files/c"))
+
+    assert [entry.name for entry in evicted] == ["files/b"]
+    assert set(cache._load()) == {"a", "c"}
+
+
+def test_put_never_evicts_the_new_entry(cache: UploadCache):
+    cache.put("small", _remote("files/small"))
+
+    evicted = cache.put("huge", _remote("files/huge", size_bytes=5 * MB))
+
+    assert [entry.name for entry in evicted] == ["files/small"]
+    assert set(cache._load()) == {"huge"}
+
+
+def test_evict_drops_expired_entries_without_reporting_them(cache: UploadCache):
+    cache.put("stale", _remote("files/stale", expires_in=timedelta(minutes=5)))
+
+    assert cache.evict() == []
+    assert cache._load() == {}
+
+
+@pytest.mark.parametrize(
+    ("remote", "reused"),
+    [
+        (_remote("files/a"), True),
+        (_remote("files/a", state="FAILED"), False),
+        (_remote("files/a", state="PROCESSING"), False),
+        (None, False),  # deleted remotely: files.get raises 404
+    ],
+)
+def test_cached_upload_is_reused_only_while_active(
+    cache: UploadCache, remote: Any, reused: bool
+):
+    cache.put("key", _remote("files/a"))
+    files = FakeFiles(*([remote] if remote else []))
+
+    video_file = asyncio.run(_client(cache, files)._get_cached_upload("key"))
+
+    assert files.gets == ["files/a"]
+    if reused:
+        assert video_file is remote
+        assert "key" in cache._load()
+    else:
+        assert video_file is None
+        assert cache._load() == {}
+
+
+def test_expired_entry_is_not_looked_up_remotely(cache: UploadCache):
+    cache.put("key", _remote("files/a", expires_in=timedelta(minutes=5)))
+    files = FakeFiles(_remote("files/a"))
+
+    assert asyncio.run(_client(cache, files)._get_cached_upload("key")) is None
+    assert files.gets == []
+
+
+def test_size_evictions_are_deleted_remotely(cache: UploadCache):
+    files = FakeFiles()
+    client = _client(cache, files)
+
+    async def main() -> None:
+        for name in ("a", "b", "c"):
+            await client._cache_upload(name, _remote(f"files/{name}"))
+
+    asyncio.run(main())
+
+    assert files.deleted == ["files/a"]
+    assert set(cache._load()) == {"b", "c"}
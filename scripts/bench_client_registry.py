@@ -0,0 +1,112 @@
+"""Benchmark per-request setup: a new genai client per call vs the shared registry.
+
+Requests go to a local keep-alive stand-in for the Gemini API, so the timings
+isolate client construction (SSL context, connection pool) and connection
+setup from network latency. No API key needed.
+
+    python scripts/bench_client_registry.py --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from google import genai
+from rich.console import Console
+from rich.table import Table
+
+from personal_assistant.registry import ClientRegistry
+
+_API_KEY = "stand-in"
+
+
+class _Connections:
+    def __init__(self) -> None:
+        self.count = 0
+        self.lock = threading.Lock()
+
+
+def _handler(connections: _Connections) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; avoid delayed-ACK stalls.
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with connections.lock:
+                connections.count += 1
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+        def do_GET(self) -> None:  # noqa: N802
+            body = b'{"name": "models/gemini-3-flash-preview"}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+async def _measure(
+    get_client: Callable[[], genai.Client], requests: int
+) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client = get_client()
+        await client.aio.models.get(model="gemini-3-flash-preview")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    connections = _Connections()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(connections))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    http_options = {"base_url": f"http://{host}:{port}"}
+
+    registry = ClientRegistry(http_options=http_options)
+    strategies: list[tuple[str, Callable[[], genai.Client]]] = [
+        (
+            "new client per call (before)",
+            lambda: genai.Client(api_key=_API_KEY, http_options=http_options),
+        ),
+        ("shared registry (after)", lambda: registry.genai_client(_API_KEY)),
+    ]
+
+    table = Table(title=f"Per-request setup ({args.requests} sequential requests)")
+    table.add_column("Strategy", style="cyan")
+    table.add_column("Median", justify="right", style="green")
+    table.add_column("p95", justify="right", style="green")
+    table.add_column("TCP connections", justify="right", style="green")
+    for label, get_client in strategies:
+        before = connections.count
+        timings = asyncio.run(_measure(get_client, args.requests))
+        timings.sort()
+        table.add_row(
+            label,
+            f"{statistics.median(timings) * 1000:.2f} ms",
+            f"{timings[int(len(timings) * 0.95) - 1] * 1000:.2f} ms",
+            str(connections.count - before),
+        )
+    server.shutdown()
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
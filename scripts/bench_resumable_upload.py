@@ -0,0 +1,161 @@
+"""Resumable uploads against a local stand-in server that drops chunks.
+
+The stand-in speaks the Files API resumable protocol (start / query / upload,
+finalize) and fails every Nth chunk after reading part of it, so the run shows
+how many bytes are re-sent and how long recovery takes. No API key needed.
+
+    python scripts/bench_resumable_upload.py --size-mb 512 --fail-every 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from personal_assistant.resumable import ResumableUploader, UploadSessionStore
+
+_GRANULARITY = 256 * 1024
+
+
+class _State:
+    def __init__(self, fail_every: int) -> None:
+        self.fail_every = fail_every
+        self.received = 0
+        self.chunks = 0
+        self.failures = 0
+        self.bytes_on_wire = 0
+        self.lock = threading.Lock()
+
+
+def _handler(state: _State) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+        def _reply(
+            self, status: int, headers: dict[str, str], body: bytes = b""
+        ) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:  # noqa: N802
+            command = self.headers.get("X-Goog-Upload-Command", "")
+            length = int(self.headers.get("Content-Length") or 0)
+            if command == "start":
+                self.rfile.read(length)
+                host, port = self.server.server_address[:2]
+                self._reply(
+                    200,
+                    {
+                        "X-Goog-Upload-URL": f"http://{host}:{port}/session",
+                        "X-Goog-Upload-Chunk-Granularity": str(_GRANULARITY),
+                    },
+                )
+                return
+            if command == "query":
+                self._reply(
+                    200,
+                    {
+                        "X-Goog-Upload-Status": "active",
+                        "X-Goog-Upload-Size-Received": str(state.received),
+                    },
+                )
+                return
+            with state.lock:
+                state.chunks += 1
+                drop = state.fail_every > 0 and state.chunks % state.fail_every == 0
+            if drop:
+                # Take half the chunk, then hang up mid-request.
+                state.bytes_on_wire += len(self.rfile.read(length // 2))
+                state.failures += 1
+                self.close_connection = True
+                self.connection.close()
+                return
+            chunk = self.rfile.read(length)
+            state.bytes_on_wire += len(chunk)
+            offset = int(self.headers.get("X-Goog-Upload-Offset") or 0)
+            if offset != state.received:
+                self._reply(400, {})
+                return
+            state.received += len(chunk)
+            if "finalize" in command:
+                body = b'{"file": {"name": "files/stand-in"}}'
+                self._reply(200, {"Content-Type": "application/json"}, body)
+            else:
+                self._reply(200, {"X-Goog-Upload-Status": "active"})
+
+    return Handler
+
+
+def _make_input(directory: Path, size_mb: int) -> str:
+    path = directory / "recording.mp4"
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as handle:
+        for _ in range(size_mb):
+            handle.write(block)
+    return str(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    parser.add_argument("--fail-every", type=int, default=3)
+    args = parser.parse_args()
+
+    console = Console()
+    state = _State(args.fail_every)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+
+    with tempfile.TemporaryDirectory(prefix="bench-resumable-") as tmp_dir:
+        with console.status(f"Writing {args.size_mb} MB test input..."):
+            video_path = _make_input(Path(tmp_dir), args.size_mb)
+        uploader = ResumableUploader(
+            base_url=f"http://{host}:{port}",
+            chunk_bytes=args.chunk_mb * 1024**2,
+            min_bytes=0,
+            max_retries=args.size_mb,
+            retry_delay=0.05,
+            store=UploadSessionStore(Path(tmp_dir) / "sessions.json"),
+        )
+        start = time.perf_counter()
+        name = asyncio.run(
+            uploader.upload(video_path, "video/mp4", "recording.mp4", "stand-in")
+        )
+        elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    size_bytes = args.size_mb * 1024**2
+    table = Table(
+        title=f"Resumable upload ({args.size_mb} MB, {args.chunk_mb} MB chunks)"
+    )
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    table.add_row("Remote file", name)
+    table.add_row("Bytes confirmed", f"{state.received:,} / {size_bytes:,}")
+    table.add_row("Injected failures", str(state.failures))
+    table.add_row("Bytes on the wire", f"{state.bytes_on_wire:,}")
+    table.add_row("Re-sent overhead", f"{state.bytes_on_wire / size_bytes - 1:.1%}")
+    table.add_row("Wall clock", f"{elapsed:.2f}s")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
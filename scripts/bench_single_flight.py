@@ -0,0 +1,115 @@
+"""Count remote calls when several views start the same upload and prompt at once.
+
+Runs against an in-process fake of the genai client, so no API key or network
+is needed. Each "view" uploads the same file and asks the same question
+concurrently, as happens when Summarize, Events and Chat are opened on one
+video while earlier jobs are still running.
+
+    python scripts/bench_single_flight.py --views 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from personal_assistant.client import AsyncGeminiVideoClient
+from personal_assistant.singleflight import SingleFlight
+
+
+class FakeGenai:
+    """Just enough of `genai.Client().aio` for uploads and generations."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = {"upload": 0, "generate": 0}
+        self.aio = SimpleNamespace(
+            files=SimpleNamespace(upload=self._upload, get=self._get),
+            models=SimpleNamespace(generate_content=self._generate),
+        )
+
+    @staticmethod
+    def _file(name: str) -> Any:
+        return SimpleNamespace(
+            name=name,
+            uri=f"https://example.invalid/{name}",
+            state="ACTIVE",
+            mime_type="video/mp4",
+            video_metadata=None,
+        )
+
+    async def _upload(self, file: Any, config: Any) -> Any:
+        self.calls["upload"] += 1
+        await asyncio.sleep(self.latency)
+        return self._file(f"files/{self.calls['upload']}")
+
+    async def _get(self, name: str) -> Any:
+        return self._file(name)
+
+    async def _generate(self, model: str, contents: Any, config: Any) -> Any:
+        self.calls["generate"] += 1
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text="answer", usage_metadata=None)
+
+
+async def _run(video_path: str, views: int, shared: bool, latency: float):
+    fake = FakeGenai(latency)
+    flights = SingleFlight()
+
+    async def view() -> None:
+        client = AsyncGeminiVideoClient(
+            api_key="stand-in",
+            genai_client=fake,  # type: ignore[arg-type]
+            # Without sharing, every view behaves like an independent helper.
+            single_flight=flights if shared else SingleFlight(),
+        )
+        video_file = await client.upload_video(video_path)
+        await client.analyze_video(video_file, "Summarize the video.")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(view() for _ in range(views)))
+    return fake.calls, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--views", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as handle:
+        handle.write(os.urandom(1024 * 1024))
+    try:
+        table = Table(title=f"{args.views} concurrent views on one video")
+        table.add_column("Strategy", style="cyan")
+        table.add_column("Uploads", justify="right", style="green")
+        table.add_column("Generations", justify="right", style="green")
+        table.add_column("Wall time", justify="right", style="green")
+        for label, shared in (
+            ("independent calls (before)", False),
+            ("single-flight (after)", True),
+        ):
+            calls, elapsed = asyncio.run(
+                _run(handle.name, args.views, shared, args.latency)
+            )
+            table.add_row(
+                label,
+                str(calls["upload"]),
+                str(calls["generate"]),
+                f"{elapsed:.2f}s",
+            )
+        Console().print(table)
+    finally:
+        os.unlink(handle.name)
+
+
+if __name__ == "__main__":
+    main()
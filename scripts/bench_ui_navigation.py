@@ -0,0 +1,179 @@
+"""Measure tab-switch and theme-change cost of the Flet layout, and its memory.
+
+Builds the real app on a `ft.Page` whose connection only records the
+commands a Flet client would receive, so no window or API key is needed.
+Compares rebuilding views on every switch (and the whole layout on a theme
+change) with the cached views of `AppLayout`.
+
+    python scripts/bench_ui_navigation.py --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict
+from types import SimpleNamespace
+from typing import Any
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import PageCommandsBatchResponsePayload
+from rich.console import Console
+from rich.table import Table
+
+from personal_assistant_ui import theme
+from personal_assistant_ui.app import app_main
+from personal_assistant_ui.layout import AppLayout
+
+TABS = 5
+
+
+class RecordingConnection(Connection):
+    """Accepts page updates like a client would and counts what was sent."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.bytes_sent = 0
+        self._ids = itertools.count(1)
+
+    def send_command(self, session_id: str, command: Any) -> Any:
+        return PageCommandsBatchResponsePayload(results=[], error="")
+
+    def send_commands(self, session_id: str, commands: list[Any]) -> Any:
+        results = []
+        for command in commands:
+            self.bytes_sent += len(json.dumps(asdict(command)))
+            if command.name == "add":
+                results.append(
+                    " ".join(f"_{next(self._ids)}" for _ in command.commands)
+                )
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+
+class RebuildingLayout(AppLayout):
+    """The layout before view caching: a new view on every switch."""
+
+    def on_nav_change(self, e):
+        index = e.control.selected_index
+        self.selected_index = index
+        view = self._view_classes[index](self.page)
+        self.current_view = view
+        self.view_container.content = view
+        self.page.update()
+
+    def apply_theme(self):
+        page = self.page
+        layout = RebuildingLayout(page, selected_index=self.selected_index)
+        page.app_layout = layout
+        page.app_container.content = layout
+
+
+def _build_page(cached: bool) -> tuple[ft.Page, RecordingConnection]:
+    conn = RecordingConnection()
+    page = ft.Page(conn, "bench", asyncio.new_event_loop())
+    app_main(page)
+    if not cached:
+        layout = RebuildingLayout(page)
+        page.app_layout = layout
+        page.app_container.content = layout
+        page.update()
+    return page, conn
+
+
+def _switch(page: ft.Page, index: int) -> None:
+    page.app_layout.on_nav_change(
+        SimpleNamespace(control=SimpleNamespace(selected_index=index))
+    )
+
+
+def _run(cached: bool, rounds: int) -> dict[str, float]:
+    result = _measure(cached, rounds, traced=False)
+    # Memory in a second run, so tracing overhead stays out of the timings.
+    memory = _measure(cached, rounds, traced=True)
+    result["retained_mb"] = memory["retained_mb"]
+    result["peak_mb"] = memory["peak_mb"]
+    return result
+
+
+def _measure(cached: bool, rounds: int, traced: bool) -> dict[str, float]:
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+    page, conn = _build_page(cached)
+    # One lap so the cached layout has built every view, as after normal use.
+    for index in range(TABS):
+        _switch(page, index)
+
+    conn.bytes_sent = 0
+    latencies = []
+    for _ in range(rounds):
+        for index in range(TABS):
+            started = time.perf_counter()
+            _switch(page, index)
+            latencies.append(time.perf_counter() - started)
+    switch_bytes = conn.bytes_sent / len(latencies)
+
+    started = time.perf_counter()
+    theme.apply_accent("Teal")
+    page.apply_theme()
+    theme_seconds = time.perf_counter() - started
+    theme.apply_accent(theme.DEFAULT_ACCENT_NAME)
+
+    retained = peak = 0
+    if traced:
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    latencies.sort()
+    return {
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "switch_kb": switch_bytes / 1024,
+        "theme_ms": theme_seconds * 1000,
+        "retained_mb": retained / 1024**2,
+        "peak_mb": peak / 1024**2,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    table = Table(title=f"{args.rounds} laps over {TABS} tabs")
+    table.add_column("Strategy", style="cyan")
+    for column in (
+        "Switch mean",
+        "Switch p95",
+        "Sent/switch",
+        "Theme change",
+        "Retained",
+        "Peak",
+    ):
+        table.add_column(column, justify="right", style="green")
+    for label, cached in (
+        ("rebuild per switch (before)", False),
+        ("cached views (after)", True),
+    ):
+        result = _run(cached, args.rounds)
+        table.add_row(
+            label,
+            f"{result['mean_ms']:.2f} ms",
+            f"{result['p95_ms']:.2f} ms",
+            f"{result['switch_kb']:.1f} KB",
+            f"{result['theme_ms']:.1f} ms",
+            f"{result['retained_mb']:.1f} MB",
+            f"{result['peak_mb']:.1f} MB",
+        )
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark upload staging: temp-file copy (old) vs streaming the original file.
+
+The fake upload sink reads the stream the way the SDK does, so the timings
+cover staging plus one full read of the video. No network or API key needed.
+
+    python scripts/bench_upload_staging.py --size-mb 2048 --runs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from personal_assistant.staging import open_upload_stream
+
+_READ_SIZE = 8 * 1024 * 1024
+
+
+def _drain(source: io.BufferedReader | str) -> int:
+    """Reads the stream to EOF, mimicking the SDK's chunked upload loop."""
+    if isinstance(source, str):
+        with open(source, "rb") as handle:
+            return _drain(handle)
+    total = 0
+    while chunk := source.read(_READ_SIZE):
+        total += len(chunk)
+    return total
+
+
+def copy_to_temp(video_path: str) -> int:
+    """The previous upload_video staging: copy2 into a NamedTemporaryFile."""
+    suffix = os.path.splitext(video_path)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        safe_path = tmp_file.name
+    try:
+        shutil.copy2(video_path, safe_path)
+        temp_bytes = os.path.getsize(safe_path)
+        _drain(safe_path)
+    finally:
+        os.remove(safe_path)
+    return temp_bytes
+
+
+def stream_original(video_path: str) -> int:
+    with open_upload_stream(video_path) as source:
+        _drain(source)
+    return 0
+
+
+def _make_input(directory: Path, size_mb: int) -> str:
+    # Non-ASCII name exercises the case the temp copy used to work around.
+    path = directory / "réunion vidéo.mp4"
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as handle:
+        for _ in range(size_mb):
+            handle.write(block)
+    return str(path)
+
+
+def _measure(
+    strategy: Callable[[str], int], video_path: str, runs: int
+) -> tuple[float, int]:
+    timings = []
+    temp_bytes = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        temp_bytes = strategy(video_path)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), temp_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    console = Console()
+    with tempfile.TemporaryDirectory(prefix="bench-upload-") as tmp_dir:
+        with console.status(f"Writing {args.size_mb} MB test input..."):
+            video_path = _make_input(Path(tmp_dir), args.size_mb)
+
+        table = Table(
+            title=f"Upload staging ({args.size_mb} MB, median of {args.runs})"
+        )
+        table.add_column("Strategy", style="cyan")
+        table.add_column("Wall clock", justify="right", style="green")
+        table.add_column("Temp bytes written", justify="right", style="green")
+        for label, strategy in (
+            ("copy to temp (before)", copy_to_temp),
+            ("stream original (after)", stream_original),
+        ):
+            elapsed, temp_bytes = _measure(strategy, video_path, args.runs)
+            table.add_row(label, f"{elapsed:.2f}s", f"{temp_bytes:,}")
+        console.print(table)
+
+
+if __name__ == "__main__":
+    main()
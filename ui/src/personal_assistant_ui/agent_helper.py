@@ -1,12 +1,31 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from typing import Any
 
 from personal_assistant.agent import VideoAgent
+from personal_assistant.chat import VideoChatSession
+from personal_assistant.clip import VideoClip
 from personal_assistant.config import load_config
+from personal_assistant.deadline import (
+    RequestScope,
+    bounded,
+    request_scope,
+    timeout_from_config,
+)
 from personal_assistant.main import get_agent
+from personal_assistant.prefetch import SpeculativeUpload
+from personal_assistant.progress import ProgressCallback
+from personal_assistant.silence import SilenceSettings, remap_response, trim_silence
+from personal_assistant.transcode import (
+    TranscodeProfile,
+    ffmpeg_available,
+    transcription_profile,
+)
 from personal_assistant.usage import UsageStats, UsageTracker
 from personal_assistant_ui.config import load_ui_config
 
@@ -21,39 +40,205 @@ class AgentHelper:
             or "gemini-3-flash"
         )
         self.agent: VideoAgent | None = None
+        self.chat_session: VideoChatSession | None = None
+        self.chat_video_path: str | None = None
+        # Uploads of the active video, keyed by transcode profile. They start
+        # when the file is picked and every later task on it reuses them.
+        self.video_path: str | None = None
+        self.uploads: dict[str | None, SpeculativeUpload] = {}
 
-    def _ensure_agent(self) -> None:
+    def _job_scope(self) -> AbstractContextManager[RequestScope]:
+        return request_scope(timeout_from_config(self.core_config))
+
+    def _ensure_agent(self) -> VideoAgent:
         if self.agent is None:
-            self.agent = get_agent(self.model_id)
+            self.agent = get_agent(self.model_id, self.core_config)
+        return self.agent
+
+    async def select_video(self, video_path: str) -> None:
+        """
+        Makes video_path the active video. Uploads of the previous one that no
+        task used are cancelled or deleted.
+        """
+        if self.video_path is not None and os.path.realpath(
+            self.video_path
+        ) == os.path.realpath(video_path):
+            return
+        self.video_path = video_path
+        await self.discard_uploads()
+
+    async def prefetch_upload(self, video_path: str, task_type: str) -> None:
+        """
+        Starts uploading the video a task will need in the background, so the
+        task only waits for whatever is left. Does nothing if that upload
+        already exists.
+        """
+        await self.select_video(video_path)
+        if not self.ui_config.get("speculative_upload", True) or (
+            # Trimmed audio only exists once the job runs.
+            task_type == "transcribe" and self._trim_silence()
+        ):
+            return
+        self._session_upload(
+            transcription_profile() if task_type == "transcribe" else None
+        )
+
+    async def discard_uploads(self) -> None:
+        """Cancels uploads in flight and deletes the files no task used."""
+        uploads, self.uploads = self.uploads, {}
+        for upload in uploads.values():
+            await upload.discard()
+
+    def _session_upload(self, profile: TranscodeProfile | None) -> SpeculativeUpload:
+        key = profile.key if profile else None
+        upload = self.uploads.get(key)
+        if upload is None or upload.failed:
+            assert self.video_path is not None
+            upload = SpeculativeUpload(
+                self._ensure_agent().client.aio, self.video_path, profile
+            )
+            self.uploads[key] = upload
+        return upload
+
+    async def _upload(
+        self,
+        video_path: str,
+        profile: TranscodeProfile | None,
+        clip: VideoClip | None,
+        on_progress: ProgressCallback | None,
+    ) -> Any:
+        """Returns the active video's upload, starting it if no view has yet."""
+        if clip is not None and clip.has_range and profile and profile.audio_only:
+            # The audio is cut to the range locally, so this upload is the
+            # run's own.
+            return await self._ensure_agent().client.aio.upload_video(
+                video_path, profile=profile, clip=clip, on_progress=on_progress
+            )
+        await self.select_video(video_path)
+        # A failed upload is started afresh by the next task; one this task
+        # stopped waiting for keeps running for the next task to reuse.
+        return await bounded(self._session_upload(profile).result(on_progress))
 
     async def analyze_video(
-        self, video_path: str, task_type: str, query: str | None = None
+        self,
+        video_path: str,
+        task_type: str,
+        query: str | None = None,
+        on_text: Callable[[str], None] | None = None,
+        clip: VideoClip | None = None,
+        on_upload_progress: ProgressCallback | None = None,
     ) -> tuple[str, UsageStats, float]:
         """
-        Runs the agent task in a separate thread to keep UI responsive.
+        Runs the agent task on the async client so the UI loop stays responsive.
         task_type: 'summarize', 'ask', 'events', 'transcribe'
+        on_text: when given, the answer is streamed and each chunk is passed to it
+        clip: when given, only that range is analyzed, at its fps
+        on_upload_progress: receives bytes sent, MB/s and ETA during the upload
         """
-
-        def _run() -> tuple[str, UsageStats, float]:
-            start_time = time.perf_counter()
-            self._ensure_agent()
+        start_time = time.perf_counter()
+        # Bounded by requests.timeout_seconds, so a stuck job fails instead of
+        # leaving the view waiting forever.
+        with self._job_scope() as scope:
+            agent = self._ensure_agent()
+            trim = None
+            if task_type == "transcribe" and clip is None and self._trim_silence():
+                trim = await asyncio.to_thread(
+                    trim_silence,
+                    video_path,
+                    SilenceSettings.from_config(self.core_config),
+                )
             # Upload
             print(f"Uploading {video_path}...")
-            video_file = self.agent.client.upload_video(video_path)
+            # Transcription only needs the audio track.
+            profile = (
+                transcription_profile()
+                if task_type == "transcribe" and not trim
+                else None
+            )
+            if trim:
+                video_file = await agent.client.aio.upload_video(
+                    trim.path,
+                    clip=clip,
+                    on_progress=on_upload_progress,
+                    transcode=False,
+                )
+            else:
+                video_file = await self._upload(
+                    video_path, profile, clip, on_upload_progress
+                )
 
             # Process
-            response = None
-            if task_type == "summarize":
-                response = self.agent.get_summary(video_file)
-            elif task_type == "ask":
-                response = self.agent.ask_question(video_file, query)
-            elif task_type == "events":
-                response = self.agent.detect_events(video_file)
-            elif task_type == "transcribe":
-                response = self.agent.transcribe_and_diarize(video_file)
-
-            elapsed = time.perf_counter() - start_time
-            stats = UsageTracker.extract_usage(response, self.model_id)
-            return response.text, stats, elapsed
-
-        return await asyncio.to_thread(_run)
+            if on_text is not None:
+                response = await agent.stream_task_async(
+                    task_type, video_file, query, on_text=on_text, clip=clip
+                )
+            else:
+                response = await agent.run_task_async(
+                    task_type, video_file, query, clip=clip
+                )
+            if trim:
+                # Streamed chunks carry trimmed-audio times; the final text is remapped.
+                response = remap_response(response, trim.offset_map)
+
+        elapsed = time.perf_counter() - start_time
+        stats = UsageTracker.extract_usage(
+            response, self.model_id, agent.client.upload_report(video_file), scope
+        )
+        return response.text, stats, elapsed
+
+    def _trim_silence(self) -> bool:
+        settings = self.core_config.get("silence_trimming") or {}
+        return bool(settings.get("enabled")) and ffmpeg_available()
+
+    async def chat(
+        self,
+        video_path: str,
+        question: str,
+        on_text: Callable[[str], None] | None = None,
+        clip: VideoClip | None = None,
+        on_upload_progress: ProgressCallback | None = None,
+    ) -> tuple[str, UsageStats, float]:
+        """
+        Asks a question in the chat session for video_path, starting one if needed.
+        Follow-ups reuse the upload and cached context and only send the new turn.
+        Changing the video or the clip starts a new session.
+        """
+        start_time = time.perf_counter()
+        with self._job_scope() as scope:
+            upload = None
+            if (
+                self.chat_session is None
+                or self.chat_video_path != video_path
+                or self.chat_session.clip != clip
+            ):
+                await self.end_chat()
+                agent = self._ensure_agent()
+                self.chat_session = await VideoChatSession.start(
+                    agent.client.aio,
+                    video_path,
+                    clip=clip,
+                    on_progress=on_upload_progress,
+                    video_file=await self._upload(
+                        video_path, None, clip, on_upload_progress
+                    ),
+                )
+                self.chat_video_path = video_path
+                # Only the turn that uploaded the video reports its throughput.
+                upload = agent.client.upload_report(self.chat_session.video_file)
+
+            response = await self.chat_session.ask(question, on_text=on_text)
+        elapsed = time.perf_counter() - start_time
+        stats = UsageTracker.extract_usage(response, self.model_id, upload, scope)
+        return response.text, stats, elapsed
+
+    async def close(self) -> None:
+        """Releases everything held for the active video when the app closes."""
+        await self.end_chat()
+        await self.discard_uploads()
+        self.video_path = None
+
+    async def end_chat(self) -> None:
+        if self.chat_session is not None:
+            await self.chat_session.close()
+        self.chat_session = None
+        self.chat_video_path = None
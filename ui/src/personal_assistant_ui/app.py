@@ -2,6 +2,7 @@ import flet as ft
 from personal_assistant_ui.layout import AppLayout
 from personal_assistant_ui import theme
 from personal_assistant_ui.config import load_ui_config
+from personal_assistant_ui.session import VideoSession
 
 
 def app_main(page: ft.Page):
@@ -17,21 +18,29 @@ def app_main(page: ft.Page):
     page.bgcolor = theme.BG_COLOR
     page.theme = ft.Theme(color_scheme_seed=theme.ACCENT)
 
+    # Shared by every view for the lifetime of the page.
+    session = VideoSession()
+    page.video_session = session
+
+    async def on_close(e):
+        # Delete uploads no task used and end the chat session.
+        await session.close()
+
+    page.on_close = on_close
+
     app = AppLayout(page)
     page.app_layout = app
     app_container = ft.Container(expand=True, padding=24, content=app)
     page.app_container = app_container
 
-    def rebuild_app(selected_index=None):
-        index = selected_index
-        if index is None and hasattr(page, "app_layout"):
-            index = getattr(page.app_layout, "selected_index", 0)
-        app_layout = AppLayout(page, selected_index=index or 0)
-        page.app_layout = app_layout
-        page.app_container.content = app_layout
+    def apply_theme():
+        # Recolors the live controls after theme.apply_accent(); the views and
+        # anything they are running are left in place.
+        page.theme = ft.Theme(color_scheme_seed=theme.ACCENT)
+        page.app_layout.apply_theme()
         page.update()
 
-    page.rebuild_app = rebuild_app
+    page.apply_theme = apply_theme
     root = ft.Stack(
         [
             ft.Container(expand=True, gradient=theme.BG_GRADIENT),
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import flet as ft
+from personal_assistant.clip import VideoClip
+
+from personal_assistant_ui import theme
+
+
+def _field(label: str, hint: str, width: int) -> ft.TextField:
+    return ft.TextField(
+        label=label,
+        hint_text=hint,
+        width=width,
+        dense=True,
+        filled=True,
+        fill_color=theme.INPUT_BG,
+        border_color=theme.BORDER,
+        focused_border_color=theme.ACCENT,
+        color=theme.TEXT_PRIMARY,
+        label_style=ft.TextStyle(color=theme.TEXT_SECONDARY),
+        hint_style=ft.TextStyle(color=theme.TEXT_DIM),
+        cursor_color=theme.ACCENT,
+        border_radius=12,
+    )
+
+
+class ClipRangeFields(ft.Row):
+    """Optional start/end/fps inputs that limit analysis to part of a video."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.start_field = _field("Start", "mm:ss", 110)
+        self.end_field = _field("End", "mm:ss", 110)
+        self.fps_field = _field("FPS", "1", 90)
+        self.fps_field.keyboard_type = ft.KeyboardType.NUMBER
+        self.controls = [self.start_field, self.end_field, self.fps_field]
+        self.alignment = ft.MainAxisAlignment.CENTER
+        self.spacing = 12
+
+    def apply_theme(self) -> None:
+        for field in self.controls:
+            field.focused_border_color = theme.ACCENT
+            field.cursor_color = theme.ACCENT
+
+    def clip(self) -> VideoClip | None:
+        """Returns the entered clip, None if all fields are empty.
+
+        Raises ValueError for unparsable input.
+        """
+        fps_text = (self.fps_field.value or "").strip()
+        try:
+            fps = float(fps_text) if fps_text else None
+        except ValueError:
+            raise ValueError(f"Invalid fps: {fps_text!r}") from None
+        return VideoClip.from_options(
+            (self.start_field.value or "").strip() or None,
+            (self.end_field.value or "").strip() or None,
+            fps,
+        )
@@ -22,10 +22,13 @@ class AppLayout(ft.Row):
             SettingsView,
         ]
 
-        # Current active view
-        self.current_view = self._view_classes[self.selected_index](self.page)
+        # Views are built on first visit and then kept, hidden while another
+        # tab is shown, so their state and running tasks survive navigation.
+        self._views: dict[int, ft.Control] = {}
+        self.view_stack = ft.Column(expand=True, spacing=0)
+        self.current_view = self._view(self.selected_index)
         self.view_container = ft.Container(
-            content=self.current_view,
+            content=self.view_stack,
             expand=True,
             padding=24,
             bgcolor=theme.PANEL_BG,
@@ -104,12 +107,33 @@ class AppLayout(ft.Row):
 
         self.controls = [self.sidebar_container, self.view_container]
 
+    def _view(self, index: int) -> ft.Control:
+        view = self._views.get(index)
+        if view is None:
+            view = self._view_classes[index](self.page)
+            self._views[index] = view
+            self.view_stack.controls.append(view)
+        return view
+
     def on_nav_change(self, e):
         index = e.control.selected_index
         if index < 0 or index >= len(self._view_classes):
             return
         self.selected_index = index
-        view = self._view_classes[index](self.page)
-        self.current_view = view
-        self.view_container.content = view
-        self.page.update()
+        previous = self.current_view
+        previous.visible = False
+        if index in self._views:
+            # Only the two views whose visibility changed are diffed.
+            self.current_view = self._views[index]
+            self.current_view.visible = True
+            # Re-read the shared session: another tab may have picked a video.
+            self.current_view.on_show()
+            self.page.update(previous, self.current_view)
+        else:
+            self.current_view = self._view(index)
+            self.view_stack.update()
+
+    def apply_theme(self):
+        # Recolors the accent on every cached view instead of rebuilding them.
+        for view in self._views.values():
+            view.apply_theme()
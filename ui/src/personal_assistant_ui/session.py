@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import flet as ft
+from personal_assistant.usage import UsageStats
+
+from personal_assistant_ui.agent_helper import AgentHelper
+
+
+@dataclass
+class TaskResult:
+    """The last answer a view showed, kept so it survives a tab switch."""
+
+    text: str
+    stats: UsageStats
+    elapsed: float
+    query: str | None = None
+    # Chat turn that produced the answer.
+    turn: int | None = None
+
+
+class VideoSession:
+    """
+    App-wide state shared by every view, attached to the page as
+    `page.video_session`.
+
+    It holds the active video, the single AgentHelper (configs and agent are
+    loaded once) that owns the video's uploads, chat session and cached
+    context, and the last result of each task. A view opened for the first
+    time restores itself from here, so Chat on the video just summarized
+    starts without another upload.
+    """
+
+    def __init__(self, agent_helper: AgentHelper | None = None) -> None:
+        self.agent_helper = agent_helper or AgentHelper()
+        self.video_path: str | None = None
+        self.video_name: str | None = None
+        self.results: dict[str, TaskResult] = {}
+
+    def select_video(self, page: ft.Page, path: str, name: str, task_type: str):
+        """Makes path the active video and starts the upload task_type needs."""
+        if path != self.video_path:
+            self.results.clear()
+        self.video_path = path
+        self.video_name = name
+        page.run_task(self.agent_helper.prefetch_upload, path, task_type)
+
+    def record(self, video_path: str, task_type: str, result: TaskResult):
+        """Keeps result as task_type's answer while video_path stays active."""
+        if video_path == self.video_path:
+            self.results[task_type] = result
+
+    def restore(self, page: ft.Page, task_type: str) -> TaskResult | None:
+        """
+        Called by a view built for the active video. Makes sure the upload its
+        task needs is running and returns the task's previous result.
+        """
+        if self.video_path is None:
+            return None
+        page.run_task(self.agent_helper.prefetch_upload, self.video_path, task_type)
+        return self.results.get(task_type)
+
+    async def close(self) -> None:
+        await self.agent_helper.close()
+
+
+def video_session(page: ft.Page) -> VideoSession:
+    """Returns the page's session, creating it if the app did not."""
+    session = getattr(page, "video_session", None)
+    if session is None:
+        session = VideoSession()
+        page.video_session = session
+    return session
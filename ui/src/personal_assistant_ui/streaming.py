@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+
+import flet as ft
+from personal_assistant.progress import UploadProgress
+from personal_assistant.segmented import format_timestamp
+from personal_assistant.usage import UsageStats
+
+
+class MarkdownStreamWriter:
+    """Appends streamed text to a Markdown control with throttled repaints."""
+
+    def __init__(self, control: ft.Markdown, interval: float = 0.15) -> None:
+        self.control = control
+        self.interval = interval
+        self._last_update = 0.0
+
+    def reset(self) -> None:
+        self.control.value = ""
+        self._last_update = 0.0
+
+    def __call__(self, text: str) -> None:
+        self.control.value = (self.control.value or "") + text
+        now = time.monotonic()
+        if now - self._last_update >= self.interval:
+            self._last_update = now
+            self.control.update()
+
+
+def format_upload_progress(progress: UploadProgress) -> str:
+    mb = 1024**2
+    text = (
+        f"Uploading {progress.fraction:.0%} "
+        f"({progress.sent_bytes / mb:.1f} of {progress.total_bytes / mb:.1f} MB)"
+    )
+    if progress.mb_per_second is not None:
+        text += f" | {progress.mb_per_second:.1f} MB/s"
+    if progress.eta_seconds is not None:
+        text += f" | ETA {format_timestamp(progress.eta_seconds)}"
+    return text
+
+
+class UploadProgressDisplay:
+    """Shows upload progress on a ProgressBar and status line, throttled.
+
+    The bar is determinate while bytes are sent and returns to indeterminate
+    once the upload is done and Gemini is processing the video.
+    """
+
+    def __init__(
+        self, bar: ft.ProgressBar, status: ft.Text, interval: float = 0.2
+    ) -> None:
+        self.bar = bar
+        self.status = status
+        self.interval = interval
+        self._last_update = 0.0
+
+    def reset(self) -> None:
+        self.bar.value = None
+        self._last_update = 0.0
+
+    def __call__(self, progress: UploadProgress) -> None:
+        done = progress.fraction >= 1.0
+        now = time.monotonic()
+        if not done and now - self._last_update < self.interval:
+            return
+        self._last_update = now
+        if done:
+            self.bar.value = None
+            self.status.value = "Upload complete, Gemini is processing the video..."
+        else:
+            self.bar.value = progress.fraction
+            self.status.value = format_upload_progress(progress)
+        self.bar.update()
+        self.status.update()
+
+
+def format_elapsed(
+    elapsed: float, time_to_first_token: float | None, cache_hit: bool = False
+) -> str:
+    if cache_hit:
+        return f"{elapsed:.1f}s (cached answer)"
+    if time_to_first_token is None:
+        return f"{elapsed:.1f}s"
+    return f"{elapsed:.1f}s (first token {time_to_first_token:.1f}s)"
+
+
+def format_analyzed(stats: UsageStats) -> str:
+    """Returns a ' | Analyzed ...' suffix when only a clip was analyzed."""
+    if stats.analyzed_seconds is None and stats.analyzed_fps is None:
+        return ""
+    analyzed = (
+        "full video"
+        if stats.analyzed_seconds is None
+        else format_timestamp(stats.analyzed_seconds)
+    )
+    if stats.analyzed_fps is not None:
+        analyzed += f" @ {stats.analyzed_fps:g} fps"
+    return f" | Analyzed: {analyzed}"
+
+
+def format_upload(stats: UsageStats) -> str:
+    """Returns a ' | Upload ...' suffix with the measured upload throughput."""
+    if stats.upload_mb_per_second is None:
+        return ""
+    return f" | Upload: {stats.upload_mb_per_second:.1f} MB/s"
@@ -1,23 +1,20 @@
 import flet as ft
-from personal_assistant_ui.agent_helper import AgentHelper
 from personal_assistant_ui import theme
-import asyncio
-import os
-import subprocess
+from personal_assistant_ui.clip_fields import ClipRangeFields
+from personal_assistant_ui.session import TaskResult
+from personal_assistant_ui.streaming import (
+    MarkdownStreamWriter,
+    UploadProgressDisplay,
+)
+from personal_assistant_ui.views.task_view import TaskView
 
 
-class EventsView(ft.Column):
-    def __init__(self, page: ft.Page):
-        super().__init__()
-        self.page = page
-        self.expand = True
-        self.agent_helper = AgentHelper()
-        self.selected_file = None
-        self.save_default_name = "events.md"
+class EventsView(TaskView):
+    task_type = "events"
+    save_default_name = "events.md"
 
-        # Component Reuse (Ideally refactor to base class, but keeping simple for now)
-        self.file_picker = ft.FilePicker(on_result=self.on_file_picked)
-        self.save_file_picker = ft.FilePicker(on_result=self.on_save_result)
+    def __init__(self, page: ft.Page):
+        super().__init__(page)
 
         self.upload_area = ft.Container(
             content=ft.Column(
@@ -79,16 +76,22 @@ class EventsView(ft.Column):
             disabled=True,
         )
 
+        self.clip_fields = ClipRangeFields()
+
         self.progress_bar = ft.ProgressBar(
             width=400, color=theme.ACCENT, bgcolor=theme.BORDER_SOFT, visible=False
         )
         self.status_text = ft.Text("", color=theme.TEXT_MUTED)
+        self.upload_progress = UploadProgressDisplay(
+            self.progress_bar, self.status_text
+        )
 
         self.result_markdown = ft.Markdown(
             selectable=True,
             extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
             md_style_sheet=theme.markdown_style(),
         )
+        self.stream_writer = MarkdownStreamWriter(self.result_markdown)
 
         self.save_btn = ft.ElevatedButton(
             "Save Events",
@@ -145,6 +148,7 @@ class EventsView(ft.Column):
             ),
             self.upload_area,
             ft.Row([self.browse_btn], alignment=ft.MainAxisAlignment.CENTER),
+            self.clip_fields,
             ft.Row([self.process_btn], alignment=ft.MainAxisAlignment.CENTER),
             ft.Column(
                 [self.progress_bar, self.status_text],
@@ -152,144 +156,45 @@ class EventsView(ft.Column):
             ),
             self.results_container,
         ]
+        self._restore_session()
 
-    def on_file_picked(self, e: ft.FilePickerResultEvent):
-        if e.files:
-            self._apply_selected_file(e.files[0].path, e.files[0].name)
-
-    def _apply_selected_file(self, path: str, name: str):
-        self.selected_file = path
-        self.upload_area.content.controls[3].value = name
-        self.upload_area.content.controls[3].color = theme.SUCCESS
-        self.upload_area.update()
+    def _show_selected_file(self, path: str, name: str):
+        super()._show_selected_file(path, name)
         self.process_btn.disabled = False
-        self.process_btn.update()
-
-    def _on_upload_hover(self, e):
-        self.upload_area.border = ft.border.all(
-            1, theme.TEXT_PRIMARY if e.data == "true" else theme.DROP_BORDER
-        )
-        self.upload_area.update()
 
-    def _register_overlays(self):
-        if self.file_picker not in self.page.overlay:
-            self.page.overlay.append(self.file_picker)
-        if self.save_file_picker not in self.page.overlay:
-            self.page.overlay.append(self.save_file_picker)
-
-    def _unregister_overlays(self):
-        if self.file_picker in self.page.overlay:
-            self.page.overlay.remove(self.file_picker)
-        if self.save_file_picker in self.page.overlay:
-            self.page.overlay.remove(self.save_file_picker)
-
-    def did_mount(self):
-        self._register_overlays()
-        self.page.update()
-
-    def will_unmount(self):
-        self._unregister_overlays()
-
-    def open_file_picker(self, e=None):
-        if not self.page.web and self.page.platform == ft.PagePlatform.MACOS:
-            self.page.run_task(self._open_macos_file_dialog)
-            return
-        self._register_overlays()
-        if os.getenv("UI_DEBUG"):
-            self._show_snack("Opening file picker...")
-        self.page.update()
-        self.page.run_task(self._open_file_picker_async)
-
-    async def _open_file_picker_async(self):
-        await asyncio.sleep(0.05)
-        self.file_picker.pick_files(
-            allow_multiple=False,
-            file_type=ft.FilePickerFileType.VIDEO,
-        )
-
-    async def _open_macos_file_dialog(self):
-        path = await asyncio.to_thread(self._choose_file_macos)
-        if path:
-            self._apply_selected_file(path, os.path.basename(path))
-
-    def _choose_file_macos(self):
-        script = 'POSIX path of (choose file with prompt "Select a video file")'
-        try:
-            return subprocess.check_output(
-                ["osascript", "-e", script],
-                text=True,
-                stderr=subprocess.DEVNULL,
-            ).strip()
-        except subprocess.CalledProcessError:
-            return None
+    def apply_theme(self):
+        super().apply_theme()
+        self.process_btn.style.bgcolor[""] = theme.BUTTON_PRIMARY_BG
 
     async def process_video(self, e):
         if not self.selected_file:
             return
         self.process_btn.disabled = True
         self.progress_bar.visible = True
+        self.upload_progress.reset()
         self.status_text.value = "Detecting events..."
         self.results_container.visible = False
         self.update()
         try:
+            video_path = self.selected_file
+            self.stream_writer.reset()
             result_text, stats, elapsed = await self.agent_helper.analyze_video(
-                self.selected_file, "events"
-            )
-            self.result_markdown.value = result_text
-            self.results_container.visible = True
-            self.save_btn.visible = True
-            self.status_text.value = (
-                f"Completed in {elapsed:.1f}s | Cost: ${stats.estimated_cost:.4f}"
+                video_path,
+                self.task_type,
+                on_text=self._on_stream_text,
+                clip=self.clip_fields.clip(),
+                on_upload_progress=self.upload_progress,
             )
-            self.status_text.color = theme.SUCCESS
+            result = TaskResult(result_text, stats, elapsed)
+            self.session.record(video_path, self.task_type, result)
+            if video_path == self.selected_file:
+                self._show_result(result)
+            else:
+                # Another tab picked a new video while this one ran.
+                self._clear_result()
         except Exception as ex:
             self.status_text.value = f"Error: {str(ex)}"
             self.status_text.color = theme.DANGER
         self.process_btn.disabled = False
         self.progress_bar.visible = False
         self.update()
-
-    def on_save_result(self, e: ft.FilePickerResultEvent):
-        if e.path:
-            self._write_result(e.path)
-
-    def _write_result(self, path: str):
-        with open(path, "w") as f:
-            f.write(self.result_markdown.value or "")
-        self.status_text.value = f"Saved to {path}"
-        self.status_text.color = theme.SUCCESS
-        self.status_text.update()
-        self._show_snack(f"Saved to {path}")
-
-    def open_save_dialog(self, e=None):
-        if not self.page.web and self.page.platform == ft.PagePlatform.MACOS:
-            self.page.run_task(self._open_macos_save_dialog)
-            return
-        self._register_overlays()
-        self.page.update()
-        self.save_file_picker.save_file(file_name=self.save_default_name)
-
-    async def _open_macos_save_dialog(self):
-        path = await asyncio.to_thread(self._choose_save_macos, self.save_default_name)
-        if path:
-            self._write_result(path)
-
-    def _choose_save_macos(self, default_name: str):
-        safe_name = default_name.replace('"', '\\"')
-        script = f'POSIX path of (choose file name with prompt "Save results" default name "{safe_name}")'
-        try:
-            return subprocess.check_output(
-                ["osascript", "-e", script],
-                text=True,
-                stderr=subprocess.DEVNULL,
-            ).strip()
-        except subprocess.CalledProcessError:
-            return None
-
-    def _show_snack(self, message: str):
-        self.page.snack_bar = ft.SnackBar(
-            content=ft.Text(message, color=theme.TEXT_PRIMARY),
-            bgcolor=theme.CARD_BG_SOLID,
-        )
-        self.page.snack_bar.open = True
-        self.page.update()
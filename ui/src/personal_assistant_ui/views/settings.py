@@ -1,8 +1,7 @@
 import flet as ft
 
-from personal_assistant.config import load_config
 from personal_assistant_ui import theme
-from personal_assistant_ui.config import load_ui_config
+from personal_assistant_ui.session import video_session
 
 
 class SettingsView(ft.Column):
@@ -12,12 +11,10 @@ class SettingsView(ft.Column):
         self.spacing = 20
 
         self.theme_colors = theme.ACCENT_PRESETS
-        ui_config = load_ui_config()
-        core_config = load_config()
-        default_model = (
-            ui_config.get("model") or core_config.get("model") or "gemini-3-flash"
-        )
-        default_theme = ui_config.get("theme") or theme.CURRENT_ACCENT_NAME
+        # Configs were loaded once by the session's helper.
+        agent_helper = video_session(page).agent_helper
+        default_model = agent_helper.model_id
+        default_theme = agent_helper.ui_config.get("theme") or theme.CURRENT_ACCENT_NAME
 
         self.model_dropdown = ft.Dropdown(
             label="Gemini Model",
@@ -74,15 +71,20 @@ class SettingsView(ft.Column):
     def change_theme(self, e):
         color_name = self.theme_dropdown.value
         theme.apply_accent(color_name)
-        self.page.theme = ft.Theme(color_scheme_seed=theme.ACCENT)
-        if hasattr(self.page, "rebuild_app"):
-            selected_index = 4
-            if hasattr(self.page, "app_layout"):
-                selected_index = getattr(self.page.app_layout, "selected_index", 4)
-            self.page.rebuild_app(selected_index=selected_index)
+        if hasattr(self.page, "apply_theme"):
+            self.page.apply_theme()
         else:
+            self.page.theme = ft.Theme(color_scheme_seed=theme.ACCENT)
+            self.apply_theme()
             self.page.update()
 
+    def apply_theme(self):
+        self.model_dropdown.focused_border_color = theme.ACCENT
+        self.theme_dropdown.focused_border_color = theme.ACCENT
+
+    def on_show(self):
+        pass
+
     def save_settings(self, e):
         # TODO: Persist to config.yaml
         pass
@@ -1,27 +1,26 @@
 import flet as ft
-from personal_assistant_ui.agent_helper import AgentHelper
 from personal_assistant_ui import theme
-import asyncio
+from personal_assistant_ui.clip_fields import ClipRangeFields
+from personal_assistant_ui.session import TaskResult
+from personal_assistant_ui.streaming import (
+    MarkdownStreamWriter,
+    UploadProgressDisplay,
+)
+from personal_assistant_ui.views.task_view import TaskView
 import os
-import subprocess
 
 
-class SummarizeView(ft.Column):
+class SummarizeView(TaskView):
+    task_type = "summarize"
+    save_default_name = "summary.md"
+
     def __init__(self, page: ft.Page):
-        super().__init__()
-        self.page = page
-        self.expand = True
-        self.agent_helper = AgentHelper()
-        self.selected_file = None
+        super().__init__(page)
         self.selected_file_name = None
         self.selected_file_size = None
-        self.save_default_name = "summary.md"
         self._replace_pending = False
 
         # UI Components
-        self.file_picker = ft.FilePicker(on_result=self.on_file_picked)
-        self.save_file_picker = ft.FilePicker(on_result=self.on_save_result)
-
         self.upload_area = ft.Container(
             content=ft.Column(
                 [
@@ -158,10 +157,15 @@ class SummarizeView(ft.Column):
             visible=False,
         )
 
+        self.clip_fields = ClipRangeFields()
+
         self.progress_bar = ft.ProgressBar(
             width=400, color=theme.ACCENT, bgcolor=theme.BORDER_SOFT, visible=False
         )
         self.status_text = ft.Text("", color=theme.TEXT_MUTED)
+        self.upload_progress = UploadProgressDisplay(
+            self.progress_bar, self.status_text
+        )
 
         self.result_markdown = ft.Markdown(
             selectable=True,
@@ -169,6 +173,7 @@ class SummarizeView(ft.Column):
             md_style_sheet=theme.markdown_style(),
             on_tap_link=lambda e: self.page.launch_url(e.data),
         )
+        self.stream_writer = MarkdownStreamWriter(self.result_markdown)
 
         self.save_btn = ft.ElevatedButton(
             "Save Results",
@@ -234,105 +239,50 @@ class SummarizeView(ft.Column):
             ),
             self.pre_process_section,
             self.processed_section,
+            self.clip_fields,
             ft.Column(
                 [self.progress_bar, self.status_text],
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             ),
             self.results_container,
         ]
+        self._restore_session()
 
-    def on_file_picked(self, e: ft.FilePickerResultEvent):
-        if e.files:
-            self._apply_selected_file(e.files[0].path, e.files[0].name)
-            return
-        if self._replace_pending:
-            self._replace_pending = False
+    def _restore_session(self):
+        if not self.session.video_path:
+            return None
+        result = super()._restore_session()
+        if result is None:
+            self.processed_title.value = "Video selected"
+        self._toggle_sections(show_processed=True)
+        return result
 
-    def _apply_selected_file(self, path: str, name: str):
-        self.selected_file = path
+    def _on_pick_cancelled(self):
+        self._replace_pending = False
+
+    def _show_selected_file(self, path: str, name: str):
+        super()._show_selected_file(path, name)
         self.selected_file_name = name
         self.selected_file_size = self._get_file_size_label(path)
-        # Update upload area text (naive way roughly)
-        self.upload_area.content.controls[3].value = name
-        self.upload_area.content.controls[3].color = theme.SUCCESS
-        self.upload_area.update()
         self.processed_file_text.value = self._format_file_label(
             name, self.selected_file_size
         )
-        self.processed_file_text.update()
         self.process_btn.disabled = False
-        self.process_btn.update()
         self.processed_process_btn.disabled = False
-        self.processed_process_btn.update()
+
+    def _apply_selected_file(self, path: str, name: str):
+        super()._apply_selected_file(path, name)
         if self._replace_pending:
             self._replace_pending = False
             self._set_processed_title("Video selected")
-            self.results_container.visible = False
-            self.save_btn.visible = False
-            self.status_text.value = ""
-            self.status_text.color = theme.TEXT_MUTED
+            self._clear_result()
             self._toggle_sections(show_processed=True)
             self.update()
 
-    def _on_upload_hover(self, e):
-        self.upload_area.border = ft.border.all(
-            1, theme.TEXT_PRIMARY if e.data == "true" else theme.DROP_BORDER
-        )
-        self.upload_area.update()
-
-    def _register_overlays(self):
-        if self.file_picker not in self.page.overlay:
-            self.page.overlay.append(self.file_picker)
-        if self.save_file_picker not in self.page.overlay:
-            self.page.overlay.append(self.save_file_picker)
-
-    def _unregister_overlays(self):
-        if self.file_picker in self.page.overlay:
-            self.page.overlay.remove(self.file_picker)
-        if self.save_file_picker in self.page.overlay:
-            self.page.overlay.remove(self.save_file_picker)
-
-    def did_mount(self):
-        self._register_overlays()
-        self.page.update()
-
-    def will_unmount(self):
-        self._unregister_overlays()
-
-    def open_file_picker(self, e=None):
-        if not self.page.web and self.page.platform == ft.PagePlatform.MACOS:
-            self.page.run_task(self._open_macos_file_dialog)
-            return
-        self._register_overlays()
-        if os.getenv("UI_DEBUG"):
-            self._show_snack("Opening file picker...")
-        self.page.update()
-        self.page.run_task(self._open_file_picker_async)
-
-    async def _open_file_picker_async(self):
-        await asyncio.sleep(0.05)
-        self.file_picker.pick_files(
-            allow_multiple=False,
-            file_type=ft.FilePickerFileType.VIDEO,
-        )
-
-    async def _open_macos_file_dialog(self):
-        path = await asyncio.to_thread(self._choose_file_macos)
-        if path:
-            self._apply_selected_file(path, os.path.basename(path))
-        elif self._replace_pending:
-            self._replace_pending = False
-
-    def _choose_file_macos(self):
-        script = 'POSIX path of (choose file with prompt "Select a video file")'
-        try:
-            return subprocess.check_output(
-                ["osascript", "-e", script],
-                text=True,
-                stderr=subprocess.DEVNULL,
-            ).strip()
-        except subprocess.CalledProcessError:
-            return None
+    def apply_theme(self):
+        super().apply_theme()
+        for button in (self.process_btn, self.processed_process_btn):
+            button.style.bgcolor[""] = theme.BUTTON_PRIMARY_BG
 
     def _toggle_sections(self, show_processed: bool):
         self.pre_process_section.visible = not show_processed
@@ -365,6 +315,7 @@ class SummarizeView(ft.Column):
 
     def _on_replace_video(self, e=None):
         self._replace_pending = True
+        # The old video's unused uploads are dropped once a new one is picked.
         self.open_file_picker()
 
     async def process_video(self, e):
@@ -374,6 +325,7 @@ class SummarizeView(ft.Column):
         self.process_btn.disabled = True
         self.processed_process_btn.disabled = True
         self.progress_bar.visible = True
+        self.upload_progress.reset()
         self.status_text.value = (
             "Uploading and processing video... (this may take a minute)"
         )
@@ -383,19 +335,25 @@ class SummarizeView(ft.Column):
         self.update()
 
         try:
+            video_path = self.selected_file
+            self.stream_writer.reset()
             result_text, stats, elapsed = await self.agent_helper.analyze_video(
-                self.selected_file, "summarize"
+                video_path,
+                self.task_type,
+                on_text=self._on_stream_text,
+                clip=self.clip_fields.clip(),
+                on_upload_progress=self.upload_progress,
             )
 
-            self.result_markdown.value = result_text
-            self.results_container.visible = True
-            self.save_btn.visible = True
-            self._set_processed_title("Video processed")
-            self._toggle_sections(show_processed=True)
-            self.status_text.value = (
-                f"Completed in {elapsed:.1f}s | Cost: ${stats.estimated_cost:.4f}"
-            )
-            self.status_text.color = theme.SUCCESS
+            result = TaskResult(result_text, stats, elapsed)
+            self.session.record(video_path, self.task_type, result)
+            if video_path == self.selected_file:
+                self._show_result(result)
+                self._set_processed_title("Video processed")
+                self._toggle_sections(show_processed=True)
+            else:
+                # Another tab picked a new video while this one ran.
+                self._clear_result()
 
         except Exception as ex:
             self.status_text.value = f"Error: {str(ex)}"
@@ -405,48 +363,3 @@ class SummarizeView(ft.Column):
         self.processed_process_btn.disabled = False
         self.progress_bar.visible = False
         self.update()
-
-    def on_save_result(self, e: ft.FilePickerResultEvent):
-        if e.path:
-            self._write_result(e.path)
-
-    def _write_result(self, path: str):
-        with open(path, "w") as f:
-            f.write(self.result_markdown.value or "")
-        self.status_text.value = f"Saved to {path}"
-        self.status_text.color = theme.SUCCESS
-        self.status_text.update()
-        self._show_snack(f"Saved to {path}")
-
-    def open_save_dialog(self, e=None):
-        if not self.page.web and self.page.platform == ft.PagePlatform.MACOS:
-            self.page.run_task(self._open_macos_save_dialog)
-            return
-        self._register_overlays()
-        self.page.update()
-        self.save_file_picker.save_file(file_name=self.save_default_name)
-
-    async def _open_macos_save_dialog(self):
-        path = await asyncio.to_thread(self._choose_save_macos, self.save_default_name)
-        if path:
-            self._write_result(path)
-
-    def _choose_save_macos(self, default_name: str):
-        safe_name = default_name.replace('"', '\\"')
-        script = f'POSIX path of (choose file name with prompt "Save results" default name "{safe_name}")'
-        try:
-            return subprocess.check_output(
-                ["osascript", "-e", script],
-                text=True,
-                stderr=subprocess.DEVNULL,
-            ).strip()
-        except subprocess.CalledProcessError:
-            return None
-
-    def _show_snack(self, message: str):
-        self.page.snack_bar = ft.SnackBar(
-            content=ft.Text(message, color=theme.TEXT_PRIMARY),
-            bgcolor=theme.CARD_BG_SOLID,
-        )
-        self.page.snack_bar.open = True
-        self.page.update()
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import subprocess
+
+import flet as ft
+
+from personal_assistant_ui import theme
+from personal_assistant_ui.session import TaskResult, video_session
+from personal_assistant_ui.streaming import (
+    format_analyzed,
+    format_elapsed,
+    format_upload,
+)
+
+
+class TaskView(ft.Column):
+    """Base of the views that run one task on the shared video.
+
+    Subclasses set `task_type` and `save_default_name` and build the upload
+    area, clip fields, progress bar, status text, result markdown (with its
+    stream writer), results container and save button.
+    """
+
+    task_type: str
+    save_default_name = "result.md"
+
+    def __init__(self, page: ft.Page):
+        super().__init__()
+        self.page = page
+        self.expand = True
+        self.session = video_session(page)
+        self.agent_helper = self.session.agent_helper
+        self.selected_file = None
+
+        self.file_picker = ft.FilePicker(on_result=self.on_file_picked)
+        self.save_file_picker = ft.FilePicker(on_result=self.on_save_result)
+
+    def _restore_session(self) -> TaskResult | None:
+        # Pick up the video (and result) chosen before the last tab switch.
+        if not self.session.video_path:
+            return None
+        self._show_selected_file(self.session.video_path, self.session.video_name)
+        result = self.session.restore(self.page, self.task_type)
+        if result is not None:
+            self._show_result(result)
+        return result
+
+    def on_show(self):
+        """Called by the layout when this cached view is shown again."""
+        # Follow a video picked in another tab since this view was last shown.
+        if self.session.video_path in (None, self.selected_file):
+            return
+        self._clear_result()
+        self._restore_session()
+
+    def _clear_result(self):
+        self.results_container.visible = False
+        self.save_btn.visible = False
+        self.status_text.value = ""
+        self.status_text.color = theme.TEXT_MUTED
+
+    def on_file_picked(self, e: ft.FilePickerResultEvent):
+        if e.files:
+            self._apply_selected_file(e.files[0].path, e.files[0].name)
+            return
+        self._on_pick_cancelled()
+
+    def _on_pick_cancelled(self):
+        """Called when the file dialog closes without a choice."""
+
+    def _show_selected_file(self, path: str, name: str):
+        self.selected_file = path
+        self.upload_area.content.controls[3].value = name
+        self.upload_area.content.controls[3].color = theme.SUCCESS
+
+    def _apply_selected_file(self, path: str, name: str):
+        # Start uploading now, so the task only waits for what is left.
+        self.session.select_video(self.page, path, name, self.task_type)
+        self._show_selected_file(path, name)
+        self.update()
+
+    def _on_upload_hover(self, e):
+        self.upload_area.border = ft.border.all(
+            1, theme.TEXT_PRIMARY if e.data == "true" else theme.DROP_BORDER
+        )
+        self.upload_area.update()
+
+    def apply_theme(self):
+        # Called when Settings changes the accent; the view is kept, not rebuilt.
+        self.upload_area.content.controls[0].color = theme.ACCENT
+        self.upload_area.border = ft.border.all(1, theme.DROP_BORDER)
+        self.progress_bar.color = theme.ACCENT
+        self.result_markdown.md_style_sheet = theme.markdown_style()
+        self.clip_fields.apply_theme()
+
+    def _result_label(self, result: TaskResult) -> str:
+        return "Completed"
+
+    def _show_result(self, result: TaskResult):
+        stats = result.stats
+        self.result_markdown.value = result.text
+        self.results_container.visible = True
+        self.save_btn.visible = True
+        self.status_text.value = (
+            f"{self._result_label(result)} in {format_elapsed(result.elapsed, stats.time_to_first_token, stats.cache_hit)}"
+            f" | Cost: ${stats.estimated_cost:.4f}{format_analyzed(stats)}{format_upload(stats)}"
+        )
+        self.status_text.color = theme.SUCCESS
+
+    def _on_stream_text(self, text: str):
+        if not self.results_container.visible:
+            self.results_container.visible = True
+            self.update()
+        self.stream_writer(text)
+
+    def _register_overlays(self):
+        if self.file_picker not in self.page.overlay:
+            self.page.overlay.append(self.file_picker)
+        if self.save_file_picker not in self.page.overlay:
+            self.page.overlay.append(self.save_file_picker)
+
+    def _unregister_overlays(self):
+        if self.file_picker in self.page.overlay:
+            self.page.overlay.remove(self.file_picker)
+        if self.save_file_picker in self.page.overlay:
+            self.page.overlay.remove(self.save_file_picker)
+
+    def did_mount(self):
+        self._register_overlays()
+        self.page.update()
+
+    def will_unmount(self):
+        self._unregister_overlays()
+
+    def open_file_picker(self, e=None):
+        if not self.page.web and self.page.platform == ft.PagePlatform.MACOS:
+            self.page.run_task(self._open_macos_file_dialog)
+            return
+        self._register_overlays()
+        if os.getenv("UI_DEBUG"):
+            self._show_snack("Opening file picker...")
+        self.page.update()
+        self.page.run_task(self._open_file_picker_async)
+
+    async def _open_file_picker_async(self):
+        await asyncio.sleep(0.05)
+        self.file_picker.pick_files(
+            allow_multiple=False,
+            file_type=ft.FilePickerFileType.VIDEO,
+        )
+
+    async def _open_macos_file_dialog(self):
+        path = await asyncio.to_thread(self._choose_file_macos)
+        if path:
+            self._apply_selected_file(path, os.path.basename(path))
+        else:
+            self._on_pick_cancelled()
+
+    def _choose_file_macos(self):
+        script = 'POSIX path of (choose file with prompt "Select a video file")'
+        try:
+            return subprocess.check_output(
+                ["osascript", "-e", script],
+                text=True,
+                stderr=subprocess.DEVNULL,
+            ).strip()
+        except subprocess.CalledProcessError:
+            return None
+
+    def on_save_result(self, e: ft.FilePickerResultEvent):
+        if e.path:
+            self._write_result(e.path)
+
+    def _write_result(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.result_markdown.value or "")
+        self.status_text.value = f"Saved to {path}"
+        self.status_text.color = theme.SUCCESS
+        self.status_text.update()
+        self._show_snack(f"Saved to {path}")
+
+    def open_save_dialog(self, e=None):
+        if not self.page.web and self.page.platform == ft.PagePlatform.MACOS:
+            self.page.run_task(self._open_macos_save_dialog)
+            return
+        self._register_overlays()
+        self.page.update()
+        self.save_file_picker.save_file(file_name=self.save_default_name)
+
+    async def _open_macos_save_dialog(self):
+        path = await asyncio.to_thread(self._choose_save_macos, self.save_default_name)
+        if path:
+            self._write_result(path)
+
+    def _choose_save_macos(self, default_name: str):
+        safe_name = default_name.replace('"', '\\"')
+        script = f'POSIX path of (choose file name with prompt "Save results" default name "{safe_name}")'
+        try:
+            return subprocess.check_output(
+                ["osascript", "-e", script],
+                text=True,
+                stderr=subprocess.DEVNULL,
+            ).strip()
+        except subprocess.CalledProcessError:
+            return None
+
+    def _show_snack(self, message: str):
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Text(message, color=theme.TEXT_PRIMARY),
+            bgcolor=theme.CARD_BG_SOLID,
+        )
+        self.page.snack_bar.open = True
+        self.page.update()